@@ -1,8 +1,12 @@
 import os
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.read_preferences import Primary, PrimaryPreferred, Secondary, SecondaryPreferred, Nearest
 from dotenv import load_dotenv
 from pathlib import Path
 
+from utils.mongo_pool import pool_stats
+from utils.query_stats import query_stats
+
 ROOT_DIR = Path(__file__).resolve().parent
 load_dotenv(ROOT_DIR / ".env")
 
@@ -12,5 +16,48 @@ DB_NAME = os.getenv("DB_NAME", "sesi_database")
 if not MONGO_URL:
     raise ValueError("❌ MONGO_URL is missing in .env")
 
-client = AsyncIOMotorClient(MONGO_URL)
+# Connection pool settings; these override the same options given in MONGO_URL
+MONGO_POOL_OPTIONS = {
+    "maxPoolSize": int(os.getenv("MONGO_MAX_POOL_SIZE", "100")),
+    "minPoolSize": int(os.getenv("MONGO_MIN_POOL_SIZE", "10")),
+    "maxIdleTimeMS": int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "300000")),
+    "connectTimeoutMS": int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "10000")),
+    "serverSelectionTimeoutMS": int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "10000")),
+    "appname": os.getenv("MONGO_APPNAME", "sesi-backend"),
+}
+# e.g. "zstd,snappy"; compressors whose Python package isn't installed are skipped with a warning
+MONGO_COMPRESSORS = os.getenv("MONGO_COMPRESSORS", "")
+if MONGO_COMPRESSORS:
+    MONGO_POOL_OPTIONS["compressors"] = MONGO_COMPRESSORS
+
+# Connections opened at startup (defaults to the minimum pool size)
+MONGO_WARMUP_CONNECTIONS = int(os.getenv("MONGO_WARMUP_CONNECTIONS", MONGO_POOL_OPTIONS["minPoolSize"]))
+
+# Read preference for the public read-only routes, e.g. "secondaryPreferred" on a replica set.
+# Writes, admin pages and read-your-writes paths always use db (primary).
+PUBLIC_READ_PREFERENCE = os.getenv("PUBLIC_READ_PREFERENCE", "primary")
+# Skip secondaries lagging further behind than this (-1: no bound, otherwise at least 90)
+PUBLIC_MAX_STALENESS_SECONDS = int(os.getenv("PUBLIC_MAX_STALENESS_SECONDS", "-1"))
+
+READ_PREFERENCES = {
+    "primary": Primary,
+    "primaryPreferred": PrimaryPreferred,
+    "secondary": Secondary,
+    "secondaryPreferred": SecondaryPreferred,
+    "nearest": Nearest,
+}
+
+
+def make_read_preference(mode: str, max_staleness: int = -1):
+    if mode not in READ_PREFERENCES:
+        raise ValueError(f"❌ Unknown read preference {mode!r}, expected one of {', '.join(READ_PREFERENCES)}")
+    if mode == "primary":
+        return Primary()
+    return READ_PREFERENCES[mode](max_staleness=max_staleness)
+
+
+client = AsyncIOMotorClient(MONGO_URL, event_listeners=[pool_stats, query_stats], **MONGO_POOL_OPTIONS)
 db = client[DB_NAME]
+public_db = client.get_database(
+    DB_NAME, read_preference=make_read_preference(PUBLIC_READ_PREFERENCE, PUBLIC_MAX_STALENESS_SECONDS)
+)
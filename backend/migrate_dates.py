@@ -0,0 +1,116 @@
+"""
+Online migration of ISO-string dates to native BSON dates
+Walks each collection in _id order in small batches and rewrites the date
+fields listed in utils.dates.DATE_FIELDS. Progress is checkpointed in the
+`migrations` collection, so the script can be stopped and re-run at any
+time; every update is guarded by the original string value, so documents
+edited by the running app in the meantime are left alone.
+
+Usage:
+    python migrate_dates.py [--batch-size 500] [--pause 0.1] [--collection events] [--restart] [--dry-run]
+"""
+import asyncio
+import argparse
+from datetime import datetime
+
+from pymongo import UpdateOne
+
+from database import db, client
+from utils.dates import DATE_FIELDS, to_bson_date
+
+MIGRATION_ID = "bson_dates"
+
+
+def _string_dates_query(fields) -> dict:
+    return {"$or": [{field: {"$type": "string"}} for field in fields]}
+
+
+def _conversion(doc: dict, fields):
+    """The guarded update for one document, or None if nothing converts"""
+    guard = {"_id": doc["_id"]}
+    changes = {}
+    for field in fields:
+        value = doc.get(field)
+        if not isinstance(value, str):
+            continue
+        try:
+            changes[field] = to_bson_date(value)
+        except ValueError:
+            print(f"   ⚠️  {doc['_id']}: cannot parse {field}={value!r}, left as is")
+            continue
+        guard[field] = value
+    if not changes:
+        return None
+    return UpdateOne(guard, {"$set": changes})
+
+
+async def migrate_collection(name: str, fields, batch_size: int, pause: float, dry_run: bool):
+    progress = await db.migrations.find_one({"_id": MIGRATION_ID}) or {}
+    last_id = progress.get("last_ids", {}).get(name)
+    converted = skipped = 0
+
+    print(f"\n📅 {name} ({', '.join(fields)})" + (f", resuming after {last_id}" if last_id else ""))
+    while True:
+        query = _string_dates_query(fields)
+        if last_id is not None:
+            query = {"$and": [query, {"_id": {"$gt": last_id}}]}
+        docs = await db[name].find(query, {field: 1 for field in fields}) \
+            .sort("_id", 1).limit(batch_size).to_list(batch_size)
+        if not docs:
+            break
+
+        updates = [u for u in (_conversion(doc, fields) for doc in docs) if u is not None]
+        if updates and not dry_run:
+            result = await db[name].bulk_write(updates, ordered=False)
+            converted += result.modified_count
+            skipped += len(updates) - result.modified_count
+        elif dry_run:
+            converted += len(updates)
+
+        last_id = docs[-1]["_id"]
+        if not dry_run:
+            await db.migrations.update_one(
+                {"_id": MIGRATION_ID},
+                {"$set": {f"last_ids.{name}": last_id, "updated_at": datetime.utcnow()}},
+                upsert=True
+            )
+        if pause:
+            await asyncio.sleep(pause)
+
+    remaining = await db[name].count_documents(_string_dates_query(fields))
+    verb = "would convert" if dry_run else "converted"
+    print(f"   ✅ {verb} {converted} documents"
+          + (f", {skipped} changed concurrently" if skipped else "")
+          + (f", {remaining} still hold string dates" if remaining else ""))
+    return remaining
+
+
+async def migrate(args):
+    names = args.collection or list(DATE_FIELDS)
+    if args.restart and not args.dry_run:
+        await db.migrations.update_one(
+            {"_id": MIGRATION_ID},
+            {"$unset": {f"last_ids.{name}": "" for name in names}}
+        )
+
+    print("🚚 Migrating string dates to BSON dates" + (" (dry run)" if args.dry_run else ""))
+    remaining = 0
+    for name in names:
+        remaining += await migrate_collection(name, DATE_FIELDS[name], args.batch_size, args.pause, args.dry_run)
+
+    if remaining:
+        print(f"\n⚠️  {remaining} documents still hold string dates; fix them and re-run with --restart")
+    else:
+        print("\n✅ All date fields are BSON dates")
+    client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert ISO-string dates to BSON dates")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--pause", type=float, default=0.0, help="seconds to sleep between batches")
+    parser.add_argument("--collection", action="append", choices=sorted(DATE_FIELDS),
+                        help="limit to this collection (repeatable)")
+    parser.add_argument("--restart", action="store_true", help="ignore saved progress")
+    parser.add_argument("--dry-run", action="store_true")
+    asyncio.run(migrate(parser.parse_args()))
@@ -59,6 +59,20 @@ class MemberCreate(BaseModel):
     membership_type: str
     membership_number: Optional[str] = None
 
+# Member directory filter counts
+class FacetCount(BaseModel):
+    value: str
+    count: int
+
+class CityFacetCount(FacetCount):
+    state: Optional[str] = None
+
+class MemberFacets(BaseModel):
+    total: int
+    states: List[FacetCount]
+    cities: List[CityFacetCount]
+    membership_types: List[FacetCount]
+
 # Committee Models
 class CommitteeMember(BaseModel):
     model_config = ConfigDict(extra="ignore")
@@ -99,6 +113,7 @@ class Event(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     title: str
     description: str
+    excerpt: Optional[str] = None
     event_type: str  # Conference, Workshop, Course, Fellowship, CME
     start_date: datetime
     end_date: Optional[datetime] = None
@@ -112,6 +127,20 @@ class Event(BaseModel):
     seo_description: Optional[str] = None
     seo_keywords: Optional[str] = None
 
+class EventSummary(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str
+    title: str
+    excerpt: Optional[str] = None
+    event_type: str
+    start_date: datetime
+    end_date: Optional[datetime] = None
+    venue: Optional[str] = None
+    city: Optional[str] = None
+    registration_link: Optional[str] = None
+    banner_image: Optional[str] = None
+    status: str = "upcoming"
+
 class EventCreate(BaseModel):
     title: str
     description: str
@@ -141,6 +170,17 @@ class News(BaseModel):
     seo_keywords: Optional[str] = None
     link_url: Optional[str] = None
 
+class NewsSummary(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str
+    title: str
+    excerpt: Optional[str] = None
+    image: Optional[str] = None
+    published_date: datetime
+    author: Optional[str] = None
+    category: Optional[str] = None
+    link_url: Optional[str] = None
+
 class NewsCreate(BaseModel):
     title: str
     content: str
@@ -210,6 +250,14 @@ class PublicationCreate(BaseModel):
     published_date: datetime
     external_link: Optional[str] = None
 
+# Homepage Models
+class HomeBundle(BaseModel):
+    statistics: dict
+    events: List[EventSummary]
+    news: List[NewsSummary]
+    committee: List[CommitteeMember]
+    albums: List[dict]
+
 # State and District Models
 class State(BaseModel):
     model_config = ConfigDict(extra="ignore")
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form
+from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form, Query, Response, BackgroundTasks
 from motor.motor_asyncio import AsyncIOMotorClient
 import os
 from typing import List, Optional
@@ -15,73 +15,111 @@ from models.models import (
     PageSEO, PageSEOCreate
 )
 from routers.auth import get_current_user
-from utils.file_upload import save_upload_file, delete_file
-from utils.certificate import generate_membership_certificate, get_next_membership_number
-from utils.email import send_approval_email_with_certificate
-from pathlib import Path
+from utils.file_upload import save_upload_file, save_multiple_files, delete_file
+from utils.approvals import approve_application, run_approval_steps, certificate_url, ApprovalInProgress
+from utils.cache import invalidate, single_flight, response_cache
+from utils.page_seo import list_page_seo
+from utils.counters import (
+    get_counters, reconcile_counters, reconcile_photo_counts,
+    count_added, count_removed, count_status_change
+)
+from utils.dates import to_document, encode_dates
+from utils.summaries import make_excerpt, excerpt_fields, excerpt_update
+from utils.crud import find_one_and_update_or_404, update_and_return, literal
+from utils.member_search import with_search_fields
+from utils.pagination import paginated_response, ADMIN_PAGE_SIZE, ADMIN_MAX_PAGE_SIZE
+from pymongo import ReturnDocument, ASCENDING, DESCENDING
 
 router = APIRouter(prefix="/admin", tags=["Admin"], dependencies=[Depends(get_current_user)])
 
-from database import db
+from database import db, MONGO_POOL_OPTIONS
+from utils.mongo_pool import pool_stats
+from utils.query_stats import query_stats
 
 
 # ==================== DASHBOARD ====================
 @router.get("/dashboard/stats")
+@single_flight
 async def get_dashboard_stats():
     """Get dashboard statistics"""
-    total_members = await db.members.count_documents({})
-    active_members = await db.members.count_documents({"status": "active"})
-    total_events = await db.events.count_documents({})
-    upcoming_events = await db.events.count_documents({"status": "upcoming"})
-    total_news = await db.news.count_documents({})
-    pending_applications = await db.membership_applications.count_documents({"status": "submitted"})
-    total_applications = await db.membership_applications.count_documents({})
+    counters = await get_counters()
     
     return {
-        "total_members": total_members,
-        "active_members": active_members,
-        "total_events": total_events,
-        "upcoming_events": upcoming_events,
-        "total_news": total_news,
-        "pending_applications": pending_applications,
-        "total_applications": total_applications
+        "total_members": counters["members_total"],
+        "active_members": counters["members_active"],
+        "total_events": counters["events_total"],
+        "upcoming_events": counters["events_upcoming"],
+        "total_news": counters["news_total"],
+        "pending_applications": counters["applications_submitted"],
+        "total_applications": counters["applications_total"]
     }
 
+@router.post("/counters/reconcile")
+async def reconcile_dashboard_counters():
+    """Recompute the maintained statistics counters from the collections"""
+    counters, _ = await reconcile_counters()
+    albums_repaired = await reconcile_photo_counts()
+    await invalidate("members", "events", "publications", "gallery")
+    return {**counters, "albums_repaired": albums_repaired}
+
+@router.get("/cache/stats")
+async def get_cache_stats():
+    """Get public response cache statistics"""
+    return response_cache.stats()
+
+@router.get("/db/pool")
+async def get_db_pool_stats():
+    """Get MongoDB connection pool settings and live counters per server"""
+    return {"options": MONGO_POOL_OPTIONS, "servers": pool_stats.snapshot()}
+
+@router.get("/db/queries")
+async def get_db_query_stats():
+    """Get MongoDB query counts and time per route, busiest first"""
+    return query_stats.snapshot()
+
+@router.delete("/db/queries")
+async def reset_db_query_stats():
+    """Reset the per-route query statistics"""
+    query_stats.reset()
+    return {"success": True, "message": "Query statistics reset"}
+
 # ==================== MEMBERS MANAGEMENT ====================
 @router.get("/members", response_model=List[Member])
-async def get_all_members():
-    """Get all members"""
-    members = await db.members.find({}, {"_id": 0}).sort("full_name", 1).to_list(1000)
-    return members
+async def get_all_members(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(ADMIN_PAGE_SIZE, ge=1, le=ADMIN_MAX_PAGE_SIZE)
+):
+    """Get members, one page at a time"""
+    return await paginated_response(response, db.members, {}, "full_name", ASCENDING, cursor, limit)
 
 @router.post("/members", response_model=Member)
 async def create_member(member: MemberCreate):
     """Create new member"""
     member_dict = member.model_dump()
     member_obj = Member(**member_dict)
-    doc = member_obj.model_dump()
+    doc = with_search_fields(to_document("members", member_obj))
     await db.members.insert_one(doc)
+    await count_added("members", doc.get("status"))
+    await invalidate("members")
     return member_obj
 
 @router.put("/members/{member_id}", response_model=Member)
 async def update_member(member_id: str, member_update: MemberCreate):
     """Update member"""
-    existing = await db.members.find_one({"id": member_id})
-    if not existing:
-        raise HTTPException(status_code=404, detail="Member not found")
-    
-    update_data = member_update.model_dump()
-    await db.members.update_one({"id": member_id}, {"$set": update_data})
-    
-    updated = await db.members.find_one({"id": member_id}, {"_id": 0})
-    return Member(**updated)
+    update_data = with_search_fields(member_update.model_dump())
+    updated = await update_and_return(db.members, {"id": member_id}, update_data, Member, "Member not found")
+    await invalidate("members")
+    return updated
 
 @router.delete("/members/{member_id}")
 async def delete_member(member_id: str):
     """Delete member"""
-    result = await db.members.delete_one({"id": member_id})
-    if result.deleted_count == 0:
+    deleted = await db.members.find_one_and_delete({"id": member_id}, {"status": 1})
+    if not deleted:
         raise HTTPException(status_code=404, detail="Member not found")
+    await count_removed("members", deleted.get("status"))
+    await invalidate("members")
     return {"success": True, "message": "Member deleted"}
 
 # ==================== COMMITTEE MANAGEMENT ====================
@@ -96,22 +134,20 @@ async def create_committee_member(member: CommitteeMemberCreate):
     """Create committee member"""
     member_dict = member.model_dump()
     member_obj = CommitteeMember(**member_dict)
-    doc = member_obj.model_dump()
+    doc = to_document("committee_members", member_obj)
     await db.committee_members.insert_one(doc)
+    await invalidate("committee")
     return member_obj
 
 @router.put("/committee/{member_id}", response_model=CommitteeMember)
 async def update_committee_member(member_id: str, member_update: CommitteeMemberCreate):
     """Update committee member"""
-    existing = await db.committee_members.find_one({"id": member_id})
-    if not existing:
-        raise HTTPException(status_code=404, detail="Committee member not found")
-    
-    update_data = member_update.model_dump()
-    await db.committee_members.update_one({"id": member_id}, {"$set": update_data})
-    
-    updated = await db.committee_members.find_one({"id": member_id}, {"_id": 0})
-    return CommitteeMember(**updated)
+    updated = await update_and_return(
+        db.committee_members, {"id": member_id}, member_update.model_dump(),
+        CommitteeMember, "Committee member not found"
+    )
+    await invalidate("committee")
+    return updated
 
 @router.delete("/committee/{member_id}")
 async def delete_committee_member(member_id: str):
@@ -119,97 +155,100 @@ async def delete_committee_member(member_id: str):
     result = await db.committee_members.delete_one({"id": member_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Committee member not found")
+    await invalidate("committee")
     return {"success": True, "message": "Committee member deleted"}
 
 # ==================== EVENTS MANAGEMENT ====================
 @router.get("/events", response_model=List[Event])
-async def get_all_events():
-    """Get all events"""
-    events = await db.events.find({}, {"_id": 0}).sort("start_date", -1).to_list(1000)
-    return events
+async def get_all_events(
+    response: Response,
+    status: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(ADMIN_PAGE_SIZE, ge=1, le=ADMIN_MAX_PAGE_SIZE)
+):
+    """Get events, one page at a time"""
+    query = {}
+    if status:
+        query["status"] = status
+    
+    return await paginated_response(response, db.events, query, "start_date", DESCENDING, cursor, limit)
 
 @router.post("/events", response_model=Event)
 async def create_event(event: EventCreate):
     """Create event"""
     event_dict = event.model_dump()
     event_obj = Event(**event_dict)
-    doc = event_obj.model_dump()
-    # Convert datetime to ISO string for MongoDB
-    doc['start_date'] = doc['start_date'].isoformat()
-    if doc.get('end_date'):
-        doc['end_date'] = doc['end_date'].isoformat()
-    doc['created_at'] = doc['created_at'].isoformat()
+    event_obj.excerpt = make_excerpt(event_obj.description)
+    doc = to_document("events", event_obj)
     await db.events.insert_one(doc)
+    await count_added("events", doc.get("status"))
+    await invalidate("events")
     return event_obj
 
 @router.put("/events/{event_id}", response_model=Event)
 async def update_event(event_id: str, event_update: EventCreate):
     """Update event"""
-    existing = await db.events.find_one({"id": event_id})
-    if not existing:
-        raise HTTPException(status_code=404, detail="Event not found")
+    update_data = encode_dates("events", event_update.model_dump())
+    update_data["excerpt"] = make_excerpt(update_data["description"])
     
-    update_data = event_update.model_dump()
-    # Convert datetime to ISO string
-    update_data['start_date'] = update_data['start_date'].isoformat()
-    if update_data.get('end_date'):
-        update_data['end_date'] = update_data['end_date'].isoformat()
-    
-    await db.events.update_one({"id": event_id}, {"$set": update_data})
-    
-    updated = await db.events.find_one({"id": event_id}, {"_id": 0})
-    # Convert ISO strings back to datetime for response
-    if isinstance(updated['start_date'], str):
-        updated['start_date'] = datetime.fromisoformat(updated['start_date'])
-    if updated.get('end_date') and isinstance(updated['end_date'], str):
-        updated['end_date'] = datetime.fromisoformat(updated['end_date'])
-    if isinstance(updated['created_at'], str):
-        updated['created_at'] = datetime.fromisoformat(updated['created_at'])
-    
-    return Event(**updated)
+    # The previous status is needed for the counters; the result is previous + update
+    previous = await find_one_and_update_or_404(
+        db.events, {"id": event_id}, {"$set": update_data}, "Event not found",
+        return_document=ReturnDocument.BEFORE
+    )
+    await count_status_change("events", previous.get("status"), update_data.get("status"))
+    await invalidate("events")
+    return Event(**{**previous, **update_data})
 
 @router.delete("/events/{event_id}")
 async def delete_event(event_id: str):
     """Delete event"""
-    result = await db.events.delete_one({"id": event_id})
-    if result.deleted_count == 0:
+    deleted = await db.events.find_one_and_delete({"id": event_id}, {"status": 1})
+    if not deleted:
         raise HTTPException(status_code=404, detail="Event not found")
+    await count_removed("events", deleted.get("status"))
+    await invalidate("events")
     return {"success": True, "message": "Event deleted"}
 
 # ==================== NEWS MANAGEMENT ====================
 @router.get("/news", response_model=List[News])
-async def get_all_news():
-    """Get all news"""
-    news = await db.news.find({}, {"_id": 0}).sort("published_date", -1).to_list(1000)
-    return news
+async def get_all_news(
+    response: Response,
+    is_published: Optional[bool] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(ADMIN_PAGE_SIZE, ge=1, le=ADMIN_MAX_PAGE_SIZE)
+):
+    """Get news, one page at a time"""
+    query = {}
+    if is_published is not None:
+        query["is_published"] = is_published
+    
+    return await paginated_response(response, db.news, query, "published_date", DESCENDING, cursor, limit)
 
 @router.post("/news", response_model=News)
 async def create_news(news_item: NewsCreate):
     """Create news"""
     news_dict = news_item.model_dump()
     news_obj = News(**news_dict)
-    doc = news_obj.model_dump()
-    doc['published_date'] = doc['published_date'].isoformat()
-    doc['created_at'] = doc['created_at'].isoformat()
+    excerpt = excerpt_fields(news_obj.excerpt, news_obj.content)
+    news_obj.excerpt = excerpt["excerpt"]
+    doc = {**to_document("news", news_obj), **excerpt}
     await db.news.insert_one(doc)
+    await count_added("news")
+    await invalidate("news")
     return news_obj
 
 @router.put("/news/{news_id}", response_model=News)
 async def update_news(news_id: str, news_update: NewsCreate):
     """Update news"""
-    existing = await db.news.find_one({"id": news_id})
-    if not existing:
-        raise HTTPException(status_code=404, detail="News not found")
-    
     update_data = news_update.model_dump()
-    await db.news.update_one({"id": news_id}, {"$set": update_data})
-    
-    updated = await db.news.find_one({"id": news_id}, {"_id": 0})
-    if isinstance(updated['published_date'], str):
-        updated['published_date'] = datetime.fromisoformat(updated['published_date'])
-    if isinstance(updated['created_at'], str):
-        updated['created_at'] = datetime.fromisoformat(updated['created_at'])
-    
+    excerpt = update_data.pop("excerpt")
+    updated = await find_one_and_update_or_404(
+        db.news, {"id": news_id},
+        [{"$set": {**literal(update_data), **excerpt_update(excerpt, update_data["content"])}}],
+        "News not found"
+    )
+    await invalidate("news")
     return News(**updated)
 
 @router.delete("/news/{news_id}")
@@ -218,6 +257,8 @@ async def delete_news(news_id: str):
     result = await db.news.delete_one({"id": news_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="News not found")
+    await count_removed("news")
+    await invalidate("news")
     return {"success": True, "message": "News deleted"}
 
 # ==================== GALLERY ALBUM MANAGEMENT ====================
@@ -225,9 +266,6 @@ async def delete_news(news_id: str):
 async def get_all_albums():
     """Get all gallery albums"""
     albums = await db.gallery_albums.find({}, {"_id": 0}).sort("created_at", -1).to_list(1000)
-    # Add photo count to each album
-    for album in albums:
-        album['photo_count'] = await db.gallery.count_documents({"album_id": album['id']})
     return albums
 
 @router.post("/gallery/albums")
@@ -240,21 +278,19 @@ async def create_album(album: GalleryAlbumCreate):
         location=album.location,
         category=album.category
     )
-    doc = album_obj.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
+    doc = to_document("gallery_albums", album_obj)
     await db.gallery_albums.insert_one(doc)
+    await invalidate("gallery")
     return album_obj
 
 @router.put("/gallery/albums/{album_id}")
 async def update_album(album_id: str, album: GalleryAlbumCreate):
     """Update an album"""
     update_data = album.model_dump(exclude_unset=True)
-    result = await db.gallery_albums.update_one(
-        {"id": album_id},
-        {"$set": update_data}
+    await find_one_and_update_or_404(
+        db.gallery_albums, {"id": album_id}, {"$set": update_data}, "Album not found"
     )
-    if result.matched_count == 0:
-        raise HTTPException(status_code=404, detail="Album not found")
+    await invalidate("gallery")
     return {"success": True, "message": "Album updated"}
 
 @router.delete("/gallery/albums/{album_id}")
@@ -277,6 +313,7 @@ async def delete_album(album_id: str):
     
     # Delete album
     await db.gallery_albums.delete_one({"id": album_id})
+    await invalidate("gallery")
     return {"success": True, "message": "Album and all photos deleted"}
 
 @router.get("/gallery/albums/{album_id}/photos")
@@ -285,6 +322,48 @@ async def get_album_photos(album_id: str):
     photos = await db.gallery.find({"album_id": album_id}, {"_id": 0}).sort("display_order", 1).to_list(1000)
     return photos
 
+async def reserve_album_photos(album: dict, image_paths: List[str]) -> Optional[int]:
+    """
+    Count new photos on their album and reserve their display orders in one atomic update
+    Display orders come from next_display_order, which deletes never lower,
+    so a new photo never reuses the order of a remaining one. The album cover
+    becomes the first new photo if the album had no photos or no cover.
+    Returns the first display order reserved for the photos, or None if the
+    album no longer exists.
+    """
+    album_id = album["id"]
+    seed = 0
+    if "next_display_order" not in album:
+        # Albums from before next_display_order continue after their highest photo
+        last = await db.gallery.find_one(
+            {"album_id": album_id}, {"_id": 0, "display_order": 1}, sort=[("display_order", DESCENDING)]
+        )
+        if last and isinstance(last.get("display_order"), int):
+            seed = last["display_order"] + 1
+    
+    previous_count = {"$ifNull": ["$photo_count", 0]}
+    next_order = {"$ifNull": ["$next_display_order", seed]}
+    previous = await db.gallery_albums.find_one_and_update(
+        {"id": album_id},
+        [{"$set": {
+            "cover_image": {"$cond": [
+                {"$or": [
+                    {"$eq": [previous_count, 0]},
+                    {"$in": [{"$ifNull": ["$cover_image", None]}, [None, ""]]}
+                ]},
+                image_paths[0],
+                "$cover_image"
+            ]},
+            "photo_count": {"$add": [previous_count, len(image_paths)]},
+            "next_display_order": {"$add": [next_order, len(image_paths)]}
+        }}],
+        projection={"_id": 0, "next_display_order": 1},
+        return_document=ReturnDocument.BEFORE
+    )
+    if previous is None:
+        return None
+    return previous.get("next_display_order", seed)
+
 @router.post("/gallery/albums/{album_id}/photos")
 async def upload_album_photo(
     album_id: str,
@@ -301,8 +380,10 @@ async def upload_album_photo(
     # Save image file
     image_path = await save_upload_file(image, "gallery")
     
-    # Get current photo count for display order
-    photo_count = await db.gallery.count_documents({"album_id": album_id})
+    display_order = await reserve_album_photos(album, [image_path])
+    if display_order is None:
+        delete_file(image_path)
+        raise HTTPException(status_code=404, detail="Album not found")
     
     # Create gallery entry
     gallery_obj = GalleryImage(
@@ -311,24 +392,11 @@ async def upload_album_photo(
         image_url=image_path,
         category=album.get('category'),
         album_id=album_id,
-        display_order=photo_count
+        display_order=display_order
     )
-    doc = gallery_obj.model_dump()
-    doc['upload_date'] = doc['upload_date'].isoformat()
+    doc = to_document("gallery", gallery_obj)
     await db.gallery.insert_one(doc)
-    
-    # Update album cover if it's the first photo
-    if photo_count == 0:
-        await db.gallery_albums.update_one(
-            {"id": album_id},
-            {"$set": {"cover_image": image_path}}
-        )
-    
-    # Update photo count
-    await db.gallery_albums.update_one(
-        {"id": album_id},
-        {"$set": {"photo_count": photo_count + 1}}
-    )
+    await invalidate("gallery")
     
     return gallery_obj
 
@@ -343,52 +411,41 @@ async def upload_album_photos_bulk(
     if not album:
         raise HTTPException(status_code=404, detail="Album not found")
     
-    # Get current photo count for display order
-    photo_count = await db.gallery.count_documents({"album_id": album_id})
-    uploaded = []
-    first_image_path = None
+    image_paths = await save_multiple_files(images, "gallery")
+    if not image_paths:
+        return {"success": True, "uploaded_count": 0}
     
-    for idx, image in enumerate(images):
-        # Save image file
-        image_path = await save_upload_file(image, "gallery")
-        if idx == 0 and photo_count == 0:
-            first_image_path = image_path
-        
-        # Create gallery entry
-        gallery_obj = GalleryImage(
+    first_order = await reserve_album_photos(album, image_paths)
+    if first_order is None:
+        for image_path in image_paths:
+            delete_file(image_path)
+        raise HTTPException(status_code=404, detail="Album not found")
+    
+    docs = [
+        to_document("gallery", GalleryImage(
             title=album['title'],
             description=None,
             image_url=image_path,
             category=album.get('category'),
             album_id=album_id,
-            display_order=photo_count + idx
-        )
-        doc = gallery_obj.model_dump()
-        doc['upload_date'] = doc['upload_date'].isoformat()
-        await db.gallery.insert_one(doc)
-        uploaded.append(gallery_obj)
+            display_order=first_order + idx
+        ))
+        for idx, image_path in enumerate(image_paths)
+    ]
+    await db.gallery.insert_many(docs)
+    await invalidate("gallery")
     
-    # Update album cover if this was the first batch
-    if first_image_path:
-        await db.gallery_albums.update_one(
-            {"id": album_id},
-            {"$set": {"cover_image": first_image_path}}
-        )
-    
-    # Update photo count
-    await db.gallery_albums.update_one(
-        {"id": album_id},
-        {"$set": {"photo_count": photo_count + len(images)}}
-    )
-    
-    return {"success": True, "uploaded_count": len(uploaded)}
+    return {"success": True, "uploaded_count": len(docs)}
 
 # ==================== GALLERY MANAGEMENT ====================
 @router.get("/gallery", response_model=List[GalleryImage])
-async def get_all_gallery():
-    """Get all gallery images"""
-    images = await db.gallery.find({}, {"_id": 0}).sort("upload_date", -1).to_list(1000)
-    return images
+async def get_all_gallery(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(ADMIN_PAGE_SIZE, ge=1, le=ADMIN_MAX_PAGE_SIZE)
+):
+    """Get gallery images, one page at a time"""
+    return await paginated_response(response, db.gallery, {}, "upload_date", DESCENDING, cursor, limit)
 
 @router.post("/gallery/upload")
 async def upload_gallery_image(
@@ -408,9 +465,9 @@ async def upload_gallery_image(
         image_url=image_path,
         category=category
     )
-    doc = gallery_obj.model_dump()
-    doc['upload_date'] = doc['upload_date'].isoformat()
+    doc = to_document("gallery", gallery_obj)
     await db.gallery.insert_one(doc)
+    await invalidate("gallery")
     
     return gallery_obj
 
@@ -426,24 +483,33 @@ async def delete_gallery_image(image_id: str):
     
     # Delete from database
     await db.gallery.delete_one({"id": image_id})
+    if image.get('album_id'):
+        await db.gallery_albums.update_one(
+            {"id": image['album_id']},
+            {"$inc": {"photo_count": -1}}
+        )
+    await invalidate("gallery")
     return {"success": True, "message": "Image deleted"}
 
 # ==================== PUBLICATIONS MANAGEMENT ====================
 @router.get("/publications", response_model=List[Publication])
-async def get_all_publications():
-    """Get all publications"""
-    pubs = await db.publications.find({}, {"_id": 0}).sort("published_date", -1).to_list(1000)
-    return pubs
+async def get_all_publications(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(ADMIN_PAGE_SIZE, ge=1, le=ADMIN_MAX_PAGE_SIZE)
+):
+    """Get publications, one page at a time"""
+    return await paginated_response(response, db.publications, {}, "published_date", DESCENDING, cursor, limit)
 
 @router.post("/publications", response_model=Publication)
 async def create_publication(publication: PublicationCreate):
     """Create publication"""
     pub_dict = publication.model_dump()
     pub_obj = Publication(**pub_dict)
-    doc = pub_obj.model_dump()
-    doc['published_date'] = doc['published_date'].isoformat()
-    doc['created_at'] = doc['created_at'].isoformat()
+    doc = to_document("publications", pub_obj)
     await db.publications.insert_one(doc)
+    await count_added("publications")
+    await invalidate("publications")
     return pub_obj
 
 @router.delete("/publications/{pub_id}")
@@ -452,18 +518,24 @@ async def delete_publication(pub_id: str):
     result = await db.publications.delete_one({"id": pub_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Publication not found")
+    await count_removed("publications")
+    await invalidate("publications")
     return {"success": True, "message": "Publication deleted"}
 
 # ==================== MEMBERSHIP APPLICATIONS ====================
 @router.get("/applications")
-async def get_all_applications(status: Optional[str] = None):
-    """Get all membership applications"""
+async def get_all_applications(
+    response: Response,
+    status: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(ADMIN_PAGE_SIZE, ge=1, le=ADMIN_MAX_PAGE_SIZE)
+):
+    """Get membership applications, one page at a time"""
     query = {}
     if status:
         query["status"] = status
     
-    applications = await db.membership_applications.find(query, {"_id": 0}).sort("submitted_at", -1).to_list(1000)
-    return applications
+    return await paginated_response(response, db.membership_applications, query, "submitted_at", DESCENDING, cursor, limit)
 
 @router.get("/applications/{application_id}")
 async def get_application_detail(application_id: str):
@@ -477,152 +549,78 @@ async def get_application_detail(application_id: str):
 async def update_application_status(
     application_id: str,
     status: str,
+    background_tasks: BackgroundTasks,
     admin_notes: Optional[str] = None,
     current_user: dict = Depends(get_current_user)
 ):
-    """Update application status and generate certificate if approved"""
+    """Update application status; approval creates the member, certificate and email"""
     if status not in ["submitted", "under_review", "approved", "rejected"]:
         raise HTTPException(status_code=400, detail="Invalid status")
     
-    # Get the application first
-    application = await db.membership_applications.find_one({"id": application_id})
-    if not application:
-        raise HTTPException(status_code=404, detail="Application not found")
-    
     update_data = {
         "status": status,
-        "reviewed_at": datetime.utcnow().isoformat(),
+        "reviewed_at": datetime.utcnow(),
         "reviewed_by": current_user.get("email")
     }
     
     if admin_notes:
         update_data["admin_notes"] = admin_notes
     
-    # If approved, generate membership number and certificate
-    if status == "approved" and application.get("status") != "approved":
-        # Generate unique membership number
-        membership_number = await get_next_membership_number()
-        update_data["membership_number"] = membership_number
-        update_data["approved_date"] = datetime.utcnow().isoformat()
-        
-        # Update application with membership number first
-        await db.membership_applications.update_one(
-            {"id": application_id},
-            {"$set": update_data}
-        )
-        
-        # Get updated application
-        updated_app = await db.membership_applications.find_one({"id": application_id}, {"_id": 0})
-        
-        # Generate certificate
-        certificate_data = {
-            "full_name": updated_app.get("full_name"),
-            "qualification": updated_app.get("qualification"),
-            "work_hospital": updated_app.get("work_hospital"),
-            "membership_type": updated_app.get("membership_type"),
-            "membership_number": membership_number,
-            "approved_date": datetime.fromisoformat(update_data["approved_date"]).strftime('%B %d, %Y')
-        }
-        
-        certificate_buffer = generate_membership_certificate(certificate_data)
-        
-        # Save certificate to file system
-        cert_folder = Path("/app/backend/uploads/certificates")
-        cert_folder.mkdir(exist_ok=True, parents=True)
-        cert_filename = f"SESI_Certificate_{membership_number}.pdf"
-        cert_path = cert_folder / cert_filename
-        
-        with open(cert_path, "wb") as f:
-            f.write(certificate_buffer.getvalue())
-        
-        # Update application with certificate path
-        certificate_url = f"/uploads/certificates/{cert_filename}"
-        await db.membership_applications.update_one(
-            {"id": application_id},
-            {"$set": {"certificate_path": certificate_url}}
-        )
-        
-        # Create member profile automatically
-        member_id = str(uuid.uuid4())
-        member_data = {
-            "id": member_id,
-            "full_name": updated_app.get("full_name"),
-            "email": updated_app.get("email"),
-            "mobile": updated_app.get("mobile"),
-            "qualification": updated_app.get("qualification"),
-            "specialization": updated_app.get("specialised_practice"),
-            "hospital": updated_app.get("work_hospital"),
-            "city": updated_app.get("work_district_name"),
-            "state": updated_app.get("work_state_name"),
-            "membership_type": updated_app.get("membership_type"),
-            "membership_number": membership_number,
-            "joined_date": datetime.utcnow().isoformat(),
-            "status": "active",
-            "certificate_path": certificate_url,
-            "application_id": application_id,
-            "years_experience": updated_app.get("years_experience"),
-            "medical_council_reg_no": updated_app.get("medical_council_reg_no"),
-            "created_at": datetime.utcnow().isoformat()
-        }
-        
-        # Insert member into members collection
-        await db.members.insert_one(member_data)
+    if status == "approved":
+        try:
+            application, lease = await approve_application(application_id, update_data)
+        except LookupError:
+            raise HTTPException(status_code=404, detail="Application not found")
+        except ApprovalInProgress:
+            raise HTTPException(status_code=409, detail="Application is already being approved")
         
-        # Send approval email with certificate
-        certificate_buffer.seek(0)
-        send_approval_email_with_certificate(updated_app, certificate_buffer, certificate_url)
+        # Certificate and email run after the response, only under this request's lease;
+        # interrupted or failed steps are retried periodically
+        if lease and application.get("approval_pending"):
+            background_tasks.add_task(run_approval_steps, application, lease)
         
+        membership_number = application["membership_number"]
         return {
             "success": True,
             "message": f"Application approved! Membership number {membership_number} generated. Member profile created.",
             "membership_number": membership_number,
-            "certificate_path": certificate_url,
-            "member_id": member_id
+            "certificate_path": application.get("certificate_path") or certificate_url(membership_number),
+            "member_id": application.get("member_id")
         }
-    else:
-        # For other status updates
-        result = await db.membership_applications.update_one(
-            {"id": application_id},
-            {"$set": update_data}
-        )
-        
-        if result.matched_count == 0:
-            raise HTTPException(status_code=404, detail="Application not found")
-        
-        return {"success": True, "message": f"Application status updated to {status}"}
+    
+    # For other status updates
+    previous = await find_one_and_update_or_404(
+        db.membership_applications, {"id": application_id}, {"$set": update_data},
+        "Application not found", return_document=ReturnDocument.BEFORE
+    )
+    await count_status_change("membership_applications", previous.get("status"), status)
+    
+    return {"success": True, "message": f"Application status updated to {status}"}
 
 # ==================== SEO MANAGEMENT ====================
 @router.get("/seo")
 async def get_all_seo():
     """Get all SEO data"""
-    seo_data = await db.page_seo.find({}, {"_id": 0}).to_list(100)
-    return seo_data
+    return await list_page_seo()
 
 @router.post("/seo", response_model=PageSEO)
 async def create_or_update_seo(seo_data: PageSEOCreate):
     """Create or update SEO data for a page"""
-    # Check if exists
-    existing = await db.page_seo.find_one({"page_name": seo_data.page_name})
-    
     seo_dict = seo_data.model_dump()
     
-    if existing:
-        # Update
-        await db.page_seo.update_one(
-            {"page_name": seo_data.page_name},
-            {"$set": seo_dict}
-        )
-        updated = await db.page_seo.find_one({"page_name": seo_data.page_name}, {"_id": 0})
-        if isinstance(updated['updated_at'], str):
-            updated['updated_at'] = datetime.fromisoformat(updated['updated_at'])
-        return PageSEO(**updated)
-    else:
-        # Create
-        seo_obj = PageSEO(**seo_dict)
-        doc = seo_obj.model_dump()
-        doc['updated_at'] = doc['updated_at'].isoformat()
-        await db.page_seo.insert_one(doc)
-        return seo_obj
+    # Upsert by page name
+    updated = await find_one_and_update_or_404(
+        db.page_seo,
+        {"page_name": seo_data.page_name},
+        {
+            "$set": {**seo_dict, "updated_at": datetime.utcnow()},
+            "$setOnInsert": {"id": str(uuid.uuid4())}
+        },
+        "SEO page not found",
+        upsert=True
+    )
+    await invalidate("seo")
+    return PageSEO(**updated)
 
 # ==================== FILE UPLOAD ====================
 @router.post("/upload")
@@ -5,6 +5,8 @@ from typing import List, Optional
 from models.models import MembershipApplication, MembershipApplicationCreate
 from utils.email import send_membership_application_email
 from utils.file_upload import save_upload_file
+from utils.geography import get_geography
+from utils.counters import count_added
 from datetime import datetime
 import uuid
 
@@ -86,10 +88,7 @@ async def submit_membership_application(
             documents.append({"type": "specialisation_certificate", "path": spec_path})
         
         # Get state and district names for reference
-        state_comm = await db.states.find_one({"id": comm_state_id}, {"_id": 0})
-        district_comm = await db.districts.find_one({"id": comm_district_id}, {"_id": 0})
-        state_work = await db.states.find_one({"id": work_state_id}, {"_id": 0})
-        district_work = await db.districts.find_one({"id": work_district_id}, {"_id": 0})
+        geography = await get_geography()
         
         # Create application document
         application = {
@@ -114,21 +113,21 @@ async def submit_membership_application(
             "comm_address": comm_address,
             "comm_country": "India",
             "comm_state_id": comm_state_id,
-            "comm_state_name": state_comm.get("name") if state_comm else "",
+            "comm_state_name": geography.state_name(comm_state_id),
             "comm_district_id": comm_district_id,
-            "comm_district_name": district_comm.get("name") if district_comm else "",
+            "comm_district_name": geography.district_name(comm_district_id),
             "comm_pincode": comm_pincode,
             "work_address": work_address,
             "work_country": "India",
             "work_state_id": work_state_id,
-            "work_state_name": state_work.get("name") if state_work else "",
+            "work_state_name": geography.state_name(work_state_id),
             "work_district_id": work_district_id,
-            "work_district_name": district_work.get("name") if district_work else "",
+            "work_district_name": geography.district_name(work_district_id),
             "work_pincode": work_pincode,
             "work_hospital": work_hospital,
             "documents": documents,
             "status": "submitted",
-            "submitted_at": datetime.utcnow().isoformat(),
+            "submitted_at": datetime.utcnow(),
             "admin_notes": None,
             "reviewed_at": None,
             "reviewed_by": None
@@ -136,6 +135,7 @@ async def submit_membership_application(
         
         # Save to database
         await db.membership_applications.insert_one(application)
+        await count_added("membership_applications", application["status"])
         
         # Send email notifications
         send_membership_application_email(application)
@@ -1,22 +1,34 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response, Query
 from motor.motor_asyncio import AsyncIOMotorClient
 import os
+import asyncio
+from datetime import datetime
 from typing import List, Optional
 from models.models import (
-    CommitteeMember, Event, News, GalleryImage, 
-    Publication, Member, State, District
+    CommitteeMember, Event, EventSummary, News, NewsSummary, GalleryImage, 
+    Publication, Member, State, District, HomeBundle, MemberFacets
 )
 
 router = APIRouter(prefix="/public", tags=["Public"])
 
 # Database connection
 from database import db
+from utils.cache import cached, conditional, reads_for
+from utils.geography import get_geography
+from utils.page_seo import find_page_seo
+from utils.counters import get_counters
+from utils.dates import to_bson_date
+from utils.summaries import summary_projection
+from utils.member_search import (
+    search_match, relevance, DIRECTORY_PAGE_SIZE, DIRECTORY_MAX_PAGE_SIZE, TOTAL_COUNT_HEADER
+)
 
+EVENT_SUMMARY_PROJECTION = summary_projection(EventSummary, "description")
+NEWS_SUMMARY_PROJECTION = summary_projection(NewsSummary, "content")
 
-# Committee Members
-@router.get("/committee", response_model=List[CommitteeMember])
-async def get_committee_members(year: Optional[int] = None, is_current: Optional[bool] = None):
-    """Get committee members"""
+
+# Queries shared by the list endpoints and the homepage bundle
+async def load_committee_members(year: Optional[int] = None, is_current: Optional[bool] = None):
     query = {}
     if year:
         query["year"] = year
@@ -26,53 +38,142 @@ async def get_committee_members(year: Optional[int] = None, is_current: Optional
         # Default: show current members if no filter specified
         query["is_current"] = True
     
-    members = await db.committee_members.find(query, {"_id": 0}).sort("display_order", 1).to_list(100)
-    return members
+    return await reads_for("committee").committee_members.find(query, {"_id": 0}).sort("display_order", 1).to_list(100)
+
+async def load_events(
+    status: Optional[str] = None,
+    event_type: Optional[str] = None,
+    limit: int = 10,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None
+):
+    query = {}
+    if status:
+        query["status"] = status
+    if event_type:
+        query["event_type"] = event_type
+    if date_from or date_to:
+        query["start_date"] = {}
+        if date_from:
+            query["start_date"]["$gte"] = to_bson_date(date_from)
+        if date_to:
+            query["start_date"]["$lt"] = to_bson_date(date_to)
+    
+    return await reads_for("events").events.find(query, EVENT_SUMMARY_PROJECTION).sort("start_date", -1).limit(limit).to_list(limit)
+
+async def load_news(limit: int = 10, category: Optional[str] = None):
+    query = {"is_published": True}
+    if category:
+        query["category"] = category
+    
+    return await reads_for("news").news.find(query, NEWS_SUMMARY_PROJECTION).sort("published_date", -1).limit(limit).to_list(limit)
+
+async def load_albums(category: Optional[str] = None, limit: int = 100):
+    query = {"is_published": True}
+    if category:
+        query["category"] = category
+    
+    return await reads_for("gallery").gallery_albums.find(query, {"_id": 0}).sort("created_at", -1).to_list(limit)
+
+async def load_publications(publication_type: Optional[str] = None, limit: int = 20):
+    query = {}
+    if publication_type:
+        query["publication_type"] = publication_type
+    
+    return await reads_for("publications").publications.find(query, {"_id": 0}).sort("published_date", -1).limit(limit).to_list(limit)
+
+async def load_statistics():
+    counters = await get_counters()
+    
+    return {
+        "total_members": counters["members_active"],
+        "total_events": counters["events_total"],
+        "upcoming_events": counters["events_upcoming"],
+        "total_publications": counters["publications_total"],
+        "cme_credits": "1,000+",
+        "endorsed_legislation": 39
+    }
+
+# Homepage
+@router.get("/home", response_model=HomeBundle)
+@conditional("members", "events", "news", "committee", "gallery", "publications")
+@cached("members", "events", "news", "committee", "gallery", "publications", ttl=30, stale_ttl=600)
+async def get_home_bundle(
+    committee_year: Optional[int] = None,
+    events_status: Optional[str] = "upcoming",
+    events_limit: int = 6,
+    news_limit: int = 4,
+    albums_limit: int = 4
+):
+    """Get everything the landing page needs in one response"""
+    statistics, events, news, committee, albums = await asyncio.gather(
+        load_statistics(),
+        load_events(status=events_status, limit=events_limit),
+        load_news(limit=news_limit),
+        load_committee_members(year=committee_year),
+        load_albums(limit=albums_limit),
+    )
+    
+    return {
+        "statistics": statistics,
+        "events": events,
+        "news": news,
+        "committee": committee,
+        "albums": albums
+    }
+
+# Committee Members
+@router.get("/committee", response_model=List[CommitteeMember])
+@conditional("committee")
+@cached("committee")
+async def get_committee_members(year: Optional[int] = None, is_current: Optional[bool] = None):
+    """Get committee members"""
+    return await load_committee_members(year=year, is_current=is_current)
 
 @router.get("/committee/{slug}")
 async def get_committee_member_by_slug(slug: str):
     """Get committee member by slug"""
-    member = await db.committee_members.find_one({"slug": slug}, {"_id": 0})
+    member = await reads_for("committee").committee_members.find_one({"slug": slug}, {"_id": 0})
     if not member:
         raise HTTPException(status_code=404, detail="Committee member not found")
     return member
 
 # Events
-@router.get("/events", response_model=List[Event])
-async def get_events(status: Optional[str] = None, event_type: Optional[str] = None, limit: int = 10):
-    """Get events"""
-    query = {}
-    if status:
-        query["status"] = status
-    if event_type:
-        query["event_type"] = event_type
-    
-    events = await db.events.find(query, {"_id": 0}).sort("start_date", -1).limit(limit).to_list(limit)
-    return events
+@router.get("/events", response_model=List[EventSummary])
+@conditional("events")
+@cached("events", ttl=30, stale_ttl=600)
+async def get_events(
+    status: Optional[str] = None,
+    event_type: Optional[str] = None,
+    limit: int = 10,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None
+):
+    """Get events, optionally those starting in [date_from, date_to)"""
+    return await load_events(
+        status=status, event_type=event_type, limit=limit, date_from=date_from, date_to=date_to
+    )
 
 @router.get("/events/{event_id}", response_model=Event)
 async def get_event_by_id(event_id: str):
     """Get event by ID"""
-    event = await db.events.find_one({"id": event_id}, {"_id": 0})
+    event = await reads_for("events").events.find_one({"id": event_id}, {"_id": 0})
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     return event
 
 # News
-@router.get("/news", response_model=List[News])
+@router.get("/news", response_model=List[NewsSummary])
+@conditional("news")
+@cached("news", ttl=30, stale_ttl=600)
 async def get_news(limit: int = 10, category: Optional[str] = None):
     """Get news articles"""
-    query = {"is_published": True}
-    if category:
-        query["category"] = category
-    
-    news = await db.news.find(query, {"_id": 0}).sort("published_date", -1).limit(limit).to_list(limit)
-    return news
+    return await load_news(limit=limit, category=category)
 
 @router.get("/news/{news_id}", response_model=News)
 async def get_news_by_id(news_id: str):
     """Get news by ID"""
-    news = await db.news.find_one({"id": news_id, "is_published": True}, {"_id": 0})
+    news = await reads_for("news").news.find_one({"id": news_id, "is_published": True}, {"_id": 0})
     if not news:
         raise HTTPException(status_code=404, detail="News not found")
     return news
@@ -85,132 +186,180 @@ async def get_gallery_images(category: Optional[str] = None, limit: int = 50):
     if category:
         query["category"] = category
     
-    images = await db.gallery.find(query, {"_id": 0}).sort("upload_date", -1).limit(limit).to_list(limit)
+    images = await reads_for("gallery").gallery.find(query, {"_id": 0}).sort("upload_date", -1).limit(limit).to_list(limit)
     return images
 
 # Gallery Albums
 @router.get("/gallery/albums")
+@cached("gallery")
 async def get_public_albums(category: Optional[str] = None):
     """Get published gallery albums"""
-    query = {"is_published": True}
-    if category:
-        query["category"] = category
-    
-    albums = await db.gallery_albums.find(query, {"_id": 0}).sort("created_at", -1).to_list(100)
-    # Add photo count
-    for album in albums:
-        album['photo_count'] = await db.gallery.count_documents({"album_id": album['id']})
-    return albums
+    return await load_albums(category=category)
 
 @router.get("/gallery/albums/{album_id}")
+@conditional("gallery")
 async def get_album_with_photos(album_id: str):
     """Get a specific album with all its photos"""
-    album = await db.gallery_albums.find_one({"id": album_id, "is_published": True}, {"_id": 0})
+    database = reads_for("gallery")
+    album = await database.gallery_albums.find_one({"id": album_id, "is_published": True}, {"_id": 0})
     if not album:
         raise HTTPException(status_code=404, detail="Album not found")
     
-    photos = await db.gallery.find({"album_id": album_id}, {"_id": 0}).sort("display_order", 1).to_list(1000)
+    photos = await database.gallery.find({"album_id": album_id}, {"_id": 0}).sort("display_order", 1).to_list(1000)
     album['photos'] = photos
     album['photo_count'] = len(photos)
     return album
 
 # Publications
 @router.get("/publications", response_model=List[Publication])
+@cached("publications")
 async def get_publications(publication_type: Optional[str] = None, limit: int = 20):
     """Get publications"""
-    query = {}
-    if publication_type:
-        query["publication_type"] = publication_type
-    
-    publications = await db.publications.find(query, {"_id": 0}).sort("published_date", -1).limit(limit).to_list(limit)
-    return publications
+    return await load_publications(publication_type=publication_type, limit=limit)
 
 # Members Directory
-@router.get("/members")
-async def get_members(state: Optional[str] = None, city: Optional[str] = None, search: Optional[str] = None):
-    """Get members directory (public view)"""
+MEMBER_DIRECTORY_PROJECTION = {
+    "_id": 0,
+    "id": 1,
+    "full_name": 1,
+    "qualification": 1,
+    "specialization": 1,
+    "city": 1,
+    "state": 1,
+    "hospital": 1,
+    "membership_number": 1,
+    "membership_type": 1,
+    "joined_date": 1,
+    "certificate_path": 1,
+    "years_experience": 1
+}
+
+async def query_member_directory(
+    state: Optional[str] = None,
+    city: Optional[str] = None,
+    search: Optional[str] = None,
+    offset: int = 0,
+    limit: int = DIRECTORY_PAGE_SIZE
+):
     query = {"status": "active"}
     if state:
         query["state"] = state
     if city:
         query["city"] = city
+    match = search_match(search) if search else {}
+    query.update(match)
+    database = reads_for("members")
+    
+    if match:
+        # Best matches first, then alphabetical
+        cursor = database.members.aggregate([
+            {"$match": query},
+            {"$addFields": {"score": relevance(search)}},
+            {"$sort": {"score": -1, "full_name": 1, "id": 1}},
+            {"$skip": offset},
+            {"$limit": limit},
+            {"$project": MEMBER_DIRECTORY_PROJECTION}
+        ])
+    else:
+        cursor = database.members.find(query, MEMBER_DIRECTORY_PROJECTION) \
+            .sort([("full_name", 1), ("id", 1)]).skip(offset).limit(limit)
     
-    # Return public information including membership details
-    members = await db.members.find(
-        query,
-        {
-            "_id": 0,
-            "id": 1,
-            "full_name": 1,
-            "qualification": 1,
-            "specialization": 1,
-            "city": 1,
-            "state": 1,
-            "hospital": 1,
-            "membership_number": 1,
-            "membership_type": 1,
-            "joined_date": 1,
-            "certificate_path": 1,
-            "years_experience": 1
-        }
-    ).sort("full_name", 1).to_list(1000)
-    
-    # Filter by search term if provided
+    members, total = await asyncio.gather(cursor.to_list(limit), database.members.count_documents(query))
+    return {"members": members, "total": total}
+
+# Browsing by state/city is cached; free-text searches are too varied and would
+# push hot entries (/home, /events, /statistics) out of the shared response cache
+browse_member_directory = cached("members")(query_member_directory)
+
+@router.get("/members")
+async def get_members(
+    response: Response,
+    state: Optional[str] = None,
+    city: Optional[str] = None,
+    search: Optional[str] = None,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(DIRECTORY_PAGE_SIZE, ge=1, le=DIRECTORY_MAX_PAGE_SIZE)
+):
+    """Get one page of the members directory (public view), best matches first when searching"""
     if search:
-        search_lower = search.lower()
-        members = [m for m in members if 
-            search_lower in m.get('full_name', '').lower() or
-            search_lower in m.get('city', '').lower() or
-            search_lower in m.get('state', '').lower() or
-            search_lower in m.get('hospital', '').lower() or
-            search_lower in m.get('membership_number', '').lower()
-        ]
+        page = await query_member_directory(state=state, city=city, search=search, offset=offset, limit=limit)
+    else:
+        page = await browse_member_directory(state=state, city=city, offset=offset, limit=limit)
+    response.headers[TOTAL_COUNT_HEADER] = str(page["total"])
+    return page["members"]
+
+def _facet_counts(*fields: str) -> list:
+    """$facet branch counting active members per value of fields, alphabetical, blanks skipped"""
+    return [
+        {"$match": {field: {"$nin": [None, ""]} for field in fields}},
+        {"$group": {"_id": {field: f"${field}" for field in fields}, "count": {"$sum": 1}}},
+        {"$sort": {f"_id.{field}": 1 for field in fields}},
+    ]
+
+def member_facets_pipeline(state: Optional[str] = None) -> list:
+    """One pass over the active members for every filter list; cities only within state, if given"""
+    cities = _facet_counts("state", "city")
+    if state:
+        cities.insert(0, {"$match": {"state": state}})
     
-    return members
+    return [
+        {"$match": {"status": "active"}},
+        {"$project": {"_id": 0, "state": 1, "city": 1, "membership_type": 1}},
+        {"$facet": {
+            "total": [{"$count": "count"}],
+            "states": _facet_counts("state"),
+            "cities": cities,
+            "membership_types": _facet_counts("membership_type")
+        }}
+    ]
+
+@cached("members")
+async def load_member_facets(state: Optional[str] = None):
+    cursor = reads_for("members").members.aggregate(member_facets_pipeline(state))
+    facets = (await cursor.to_list(1))[0]
+    return {
+        "total": facets["total"][0]["count"] if facets["total"] else 0,
+        "states": [{"value": f["_id"]["state"], "count": f["count"]} for f in facets["states"]],
+        "cities": [
+            {"value": f["_id"]["city"], "state": f["_id"]["state"], "count": f["count"]}
+            for f in facets["cities"]
+        ],
+        "membership_types": [
+            {"value": f["_id"]["membership_type"], "count": f["count"]} for f in facets["membership_types"]
+        ]
+    }
+
+@router.get("/members/facets", response_model=MemberFacets)
+@conditional("members")
+async def get_member_facets(state: Optional[str] = None):
+    """Active member counts per state, city (within state, if given) and membership type"""
+    return await load_member_facets(state=state)
 
 # States and Districts
 @router.get("/states", response_model=List[State])
-async def get_states():
+async def get_states(request: Request):
     """Get all states"""
-    states = await db.states.find({}, {"_id": 0}).sort("name", 1).to_list(100)
-    return states
+    geography = await get_geography()
+    return geography.response(request, geography.states_body, "states")
 
 @router.get("/districts/{state_id}", response_model=List[District])
-async def get_districts_by_state(state_id: str):
+async def get_districts_by_state(state_id: str, request: Request):
     """Get districts by state ID"""
-    districts = await db.districts.find({"state_id": state_id}, {"_id": 0}).sort("name", 1).to_list(1000)
-    return districts
+    geography = await get_geography()
+    return geography.response(request, geography.districts_body(state_id), f"districts-{state_id}")
 
 # SEO Data
 @router.get("/seo/{page_name}")
 async def get_page_seo(page_name: str):
     """Get SEO data for a page"""
-    seo = await db.page_seo.find_one({"page_name": page_name}, {"_id": 0})
-    if not seo:
-        return {
-            "title": "Shoulder & Elbow Society of India",
-            "description": "Official website of SESI",
-            "keywords": "SESI, shoulder, elbow, orthopaedic"
-        }
-    return seo
+    return await find_page_seo(page_name)
 
 # Statistics
 @router.get("/statistics")
+@cached("members", "events", "publications", ttl=30, stale_ttl=600)
 async def get_statistics():
     """Get website statistics"""
-    total_members = await db.members.count_documents({"status": "active"})
-    total_events = await db.events.count_documents({})
-    upcoming_events = await db.events.count_documents({"status": "upcoming"})
-    total_publications = await db.publications.count_documents({})
-    
-    return {
-        "total_members": total_members,
-        "total_events": total_events,
-        "upcoming_events": upcoming_events,
-        "total_publications": total_publications,
-        "cme_credits": "1,000+",
-        "endorsed_legislation": 39
-    }
+    return await load_statistics()
 
 
 
@@ -218,7 +367,6 @@ async def get_statistics():
 @router.post("/contact")
 async def submit_contact_form(data: dict):
     """Submit contact form"""
-    from datetime import datetime
     import uuid
     
     contact = {
@@ -229,7 +377,7 @@ async def submit_contact_form(data: dict):
         "subject": data.get("subject"),
         "message": data.get("message"),
         "status": "new",
-        "created_at": datetime.utcnow().isoformat()
+        "created_at": datetime.utcnow()
     }
     
     await db.contact_submissions.insert_one(contact)
@@ -73,12 +73,13 @@
 #     client.close()
 
 
-from fastapi import FastAPI, APIRouter
+from fastapi import FastAPI, APIRouter, Request
 from fastapi.staticfiles import StaticFiles
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
 import os
+import asyncio
 import logging
 from pathlib import Path
 from pydantic import BaseModel, Field, ConfigDict
@@ -91,7 +92,18 @@ from routers import auth, public, membership, admin
 ROOT_DIR = Path(__file__).resolve().parent
 load_dotenv(ROOT_DIR / '.env')
 
-from database import client
+from database import client, db, MONGO_WARMUP_CONNECTIONS
+from utils.cache import apply_remote_invalidation, reset_local, add_invalidation_hook, add_reloader
+from utils import cache_bus
+from utils.geography import load_geography
+from utils.indexes import ensure_indexes
+from utils.mongo_pool import warm_pool
+from utils.query_stats import query_stats
+from utils.counters import reconcile_periodically
+from utils.approvals import resume_periodically
+from utils.page_seo import load_page_seo
+from utils.member_search import backfill_search_fields, TOTAL_COUNT_HEADER
+from utils.snapshots import SNAPSHOTS_ENABLED, SNAPSHOT_DIR, SnapshotFiles, publish_snapshots, publish_all_snapshots
 
 
 
@@ -129,20 +141,75 @@ uploads_dir.mkdir(parents=True, exist_ok=True)
 
 app.mount("/api/uploads", StaticFiles(directory=str(uploads_dir)), name="uploads")
 
+# Pre-serialized public data, regenerated on every admin write
+if SNAPSHOTS_ENABLED:
+    SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+    app.mount("/api/snapshots", SnapshotFiles(directory=str(SNAPSHOT_DIR)), name="snapshots")
+    add_invalidation_hook(publish_snapshots)
+
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
     allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", TOTAL_COUNT_HEADER],
 )
 
+@app.middleware("http")
+async def track_queries(request: Request, call_next):
+    """Attribute the MongoDB commands a request issues to its route"""
+    token = query_stats.begin_request()
+    try:
+        return await call_next(request)
+    finally:
+        route = request.scope.get("route")
+        query_stats.end_request(token, f"{request.method} {route.path if route else '(no route)'}")
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def warm_mongo_pool():
+    await warm_pool(db, MONGO_WARMUP_CONNECTIONS)
+
+@app.on_event("startup")
+async def create_indexes():
+    await ensure_indexes()
+
+@app.on_event("startup")
+async def prepare_member_search():
+    await backfill_search_fields()
+
+@app.on_event("startup")
+async def load_reference_data():
+    await load_geography()
+    await load_page_seo()
+    add_reloader("seo", load_page_seo)
+
+@app.on_event("startup")
+async def start_counter_reconciliation():
+    app.state.counter_reconciler = asyncio.ensure_future(reconcile_periodically())
+
+@app.on_event("startup")
+async def resume_approvals():
+    app.state.approval_resumer = asyncio.ensure_future(resume_periodically())
+
+@app.on_event("startup")
+async def start_cache_bus():
+    cache_bus.start_subscriber(apply_remote_invalidation, reset_local)
+
+@app.on_event("startup")
+async def build_snapshots():
+    if SNAPSHOTS_ENABLED:
+        await publish_all_snapshots()
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    await cache_bus.stop_subscriber()
+    app.state.counter_reconciler.cancel()
+    app.state.approval_resumer.cancel()
     client.close()
\ No newline at end of file
@@ -0,0 +1,62 @@
+#!/bin/bash
+# Start (or stop) a local three-node MongoDB replica set from mongod binaries
+# for trying out PUBLIC_READ_PREFERENCE and running tests/test_read_preference.py.
+#
+# Usage:
+#   ./start_replica_set.sh          # start rs0 on ports 27101-27103
+#   ./start_replica_set.sh stop     # shut it down
+#
+# Environment: REPLICA_SET (rs0), BASE_PORT (27101), DATA_DIR (/tmp/sesi-rs), MONGOD (mongod), MONGOSH (mongosh)
+
+set -e
+
+REPLICA_SET=${REPLICA_SET:-rs0}
+BASE_PORT=${BASE_PORT:-27101}
+DATA_DIR=${DATA_DIR:-/tmp/sesi-rs}
+MONGOD=${MONGOD:-mongod}
+MONGOSH=${MONGOSH:-mongosh}
+PORTS="$BASE_PORT $((BASE_PORT + 1)) $((BASE_PORT + 2))"
+
+GREEN='\033[0;32m'
+BLUE='\033[0;34m'
+NC='\033[0m' # No Color
+
+if [ "$1" = "stop" ]; then
+    for port in $PORTS; do
+        $MONGOSH --quiet --port "$port" --eval "db.adminCommand({shutdown: 1, force: true})" >/dev/null 2>&1 || true
+    done
+    echo -e "${GREEN}Replica set $REPLICA_SET stopped${NC}"
+    exit 0
+fi
+
+echo -e "${BLUE}Starting mongod nodes for $REPLICA_SET on ports $PORTS${NC}"
+for port in $PORTS; do
+    mkdir -p "$DATA_DIR/$port"
+    $MONGOD --replSet "$REPLICA_SET" --port "$port" --bind_ip localhost \
+        --dbpath "$DATA_DIR/$port" --logpath "$DATA_DIR/$port/mongod.log" --fork >/dev/null
+done
+
+MEMBERS=""
+i=0
+for port in $PORTS; do
+    MEMBERS="$MEMBERS{_id: $i, host: 'localhost:$port'},"
+    i=$((i + 1))
+done
+
+echo -e "${BLUE}Initiating replica set${NC}"
+$MONGOSH --quiet --port "$BASE_PORT" --eval "
+    try {
+        rs.status();
+    } catch (e) {
+        rs.initiate({_id: '$REPLICA_SET', members: [$MEMBERS]});
+    }
+    while (!db.hello().isWritablePrimary) { sleep(500); }
+    while (rs.status().members.filter(m => m.stateStr === 'SECONDARY').length < 2) { sleep(500); }
+"
+
+HOSTS=$(echo $PORTS | sed 's/\([0-9]*\)/localhost:\1/g; s/ /,/g')
+echo -e "${GREEN}Replica set $REPLICA_SET is up${NC}"
+echo ""
+echo "MONGO_URL=mongodb://$HOSTS/?replicaSet=$REPLICA_SET"
+echo "PUBLIC_READ_PREFERENCE=secondaryPreferred"
+echo "PUBLIC_MAX_STALENESS_SECONDS=90"
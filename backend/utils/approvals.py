@@ -0,0 +1,326 @@
+"""
+Crash-safe membership application approval
+Approval is one multi-document transaction: the membership number counter
+is bumped, the application moves to approved and the member profile is
+inserted together, so a crash can never leave a half-approved member.
+Rendering the certificate and sending the approval email follow as
+separate steps listed in the application's `approval_pending` field; each
+step is removed from the list once it has completed and anything left over
+is picked up again by resume_pending_approvals(), at startup and then
+every APPROVAL_RETRY_INTERVAL seconds. Steps only run under a lease
+(approval_claimed_until / approval_claimed_by), so a second request or
+worker never renders or emails the same approval twice.
+
+Without transaction support (a standalone mongod) the application is
+claimed before a number is taken, the same writes run in order and
+creating the member profile becomes the first follow-up step; the member
+is upserted by application_id so a retry never duplicates it.
+The email is sent at least once: a crash right after sending it resends it.
+"""
+import io
+import os
+import uuid
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional, Tuple
+
+from pymongo import ReturnDocument
+
+from database import client, db
+from utils.cache import invalidate
+from utils.certificate import generate_membership_certificate
+from utils.counters import count_added, count_status_change
+from utils.email import send_approval_email_with_certificate
+from utils.member_search import with_search_fields
+from utils.membership_numbers import next_membership_number
+
+logger = logging.getLogger(__name__)
+
+CERTIFICATE_DIR = Path("/app/backend/uploads/certificates")
+# How long a worker owns an application's follow-up steps before another may take over
+APPROVAL_STEP_LEASE_SECONDS = int(os.environ.get('APPROVAL_STEP_LEASE_SECONDS', '300'))
+# How often failed or interrupted follow-up steps are retried
+APPROVAL_RETRY_INTERVAL = float(os.environ.get('APPROVAL_RETRY_INTERVAL', '300'))
+
+MEMBER_STEP = "member"
+CERTIFICATE_STEP = "certificate"
+EMAIL_STEP = "email"
+FOLLOW_UP_STEPS = [CERTIFICATE_STEP, EMAIL_STEP]
+# Applications with follow-up steps left to run (served by the approval_pending index)
+PENDING_STEPS_QUERY = {"approval_pending": {"$in": [MEMBER_STEP, *FOLLOW_UP_STEPS]}}
+
+_transactions_supported: Optional[bool] = None
+
+
+class AlreadyApproved(Exception):
+    """The application was approved (or claimed for approval) before this request got to it"""
+
+
+class ApprovalInProgress(Exception):
+    """Another request is approving the application right now"""
+
+
+async def transactions_supported() -> bool:
+    """Multi-document transactions need a replica set or a sharded cluster"""
+    global _transactions_supported
+    if _transactions_supported is None:
+        hello = await db.command("hello")
+        _transactions_supported = bool(hello.get("setName")) or hello.get("msg") == "isdbgrid"
+        if not _transactions_supported:
+            logger.warning("MongoDB does not support transactions; approvals run without one")
+    return _transactions_supported
+
+
+def certificate_url(membership_number: str) -> str:
+    return f"/uploads/certificates/SESI_Certificate_{membership_number}.pdf"
+
+
+def member_query(application_id: str) -> dict:
+    """The member created from an application; $type lets the planner use the partial application_id index"""
+    return {"application_id": {"$type": "string", "$eq": application_id}}
+
+
+def _lease() -> datetime:
+    return datetime.utcnow() + timedelta(seconds=APPROVAL_STEP_LEASE_SECONDS)
+
+
+def _unclaimed() -> dict:
+    return {"$or": [
+        {"approval_claimed_until": {"$exists": False}},
+        {"approval_claimed_until": {"$lt": datetime.utcnow()}}
+    ]}
+
+
+def member_document(application: dict) -> dict:
+    """Member profile for an approved application"""
+    now = datetime.utcnow()
+    return with_search_fields({
+        "id": application["member_id"],
+        "full_name": application.get("full_name"),
+        "email": application.get("email"),
+        "mobile": application.get("mobile"),
+        "qualification": application.get("qualification"),
+        "specialization": application.get("specialised_practice"),
+        "hospital": application.get("work_hospital"),
+        "city": application.get("work_district_name"),
+        "state": application.get("work_state_name"),
+        "membership_type": application.get("membership_type"),
+        "membership_number": application["membership_number"],
+        "joined_date": now,
+        "status": "active",
+        "application_id": application["id"],
+        "years_experience": application.get("years_experience"),
+        "medical_council_reg_no": application.get("medical_council_reg_no"),
+        "created_at": now
+    })
+
+
+async def create_member(application: dict, session=None):
+    """Insert the member profile for an approved application unless it already exists"""
+    member = member_document(application)
+    result = await db.members.update_one(
+        member_query(application["id"]),
+        {"$setOnInsert": member},
+        upsert=True,
+        session=session
+    )
+    if result.upserted_id is not None:
+        await count_added("members", member["status"], session=session)
+
+
+async def _approve(application_id: str, review: dict, session=None) -> dict:
+    """Approval writes; inside a transaction when session is given"""
+    token = str(uuid.uuid4())
+    if session is None:
+        # Without a transaction to roll it back, only take a number once the application is ours
+        claimed = await db.membership_applications.find_one_and_update(
+            {"id": application_id, "status": {"$ne": "approved"}, **_unclaimed()},
+            {"$set": {"approval_claimed_until": _lease(), "approval_claimed_by": token}},
+            projection={"_id": 0, "id": 1}
+        )
+        if claimed is None:
+            raise AlreadyApproved(application_id)
+        query = {"id": application_id, "approval_claimed_by": token}
+    else:
+        query = {"id": application_id, "status": {"$ne": "approved"}}
+    
+    membership_number = await next_membership_number(session=session)
+    pending = FOLLOW_UP_STEPS if session is not None else [MEMBER_STEP, *FOLLOW_UP_STEPS]
+    approval = {
+        **review,
+        "status": "approved",
+        "membership_number": membership_number,
+        "approved_date": datetime.utcnow(),
+        "member_id": str(uuid.uuid4()),
+        "approval_pending": pending,
+        "approval_claimed_until": _lease(),
+        "approval_claimed_by": token
+    }
+    previous = await db.membership_applications.find_one_and_update(
+        query,
+        {"$set": approval},
+        projection={"_id": 0},
+        return_document=ReturnDocument.BEFORE,
+        session=session
+    )
+    if previous is None:
+        # Aborts the transaction, which also gives the number back
+        raise AlreadyApproved(application_id)
+
+    application = {**previous, **approval}
+    if session is not None:
+        await create_member(application, session=session)
+    await count_status_change("membership_applications", previous.get("status"), "approved", session=session)
+    return application
+
+
+async def approve_application(application_id: str, review: dict) -> Tuple[dict, Optional[str]]:
+    """
+    Approve an application, or return it as is if it is already approved
+
+    Args:
+        application_id: application to approve
+        review: reviewed_at / reviewed_by / admin_notes fields to store with it
+
+    Returns:
+        (the approved application, lease token or None). With a token this
+        caller holds the lease on the approval_pending steps and should run
+        them with run_approval_steps(); without one someone else does.
+
+    Raises:
+        LookupError: if there is no such application
+        ApprovalInProgress: if another request is approving it right now
+    """
+    try:
+        if await transactions_supported():
+            async with await client.start_session() as session:
+                application = await session.with_transaction(
+                    lambda s: _approve(application_id, review, session=s)
+                )
+        else:
+            application = await _approve(application_id, review)
+    except AlreadyApproved:
+        application = await db.membership_applications.find_one({"id": application_id}, {"_id": 0})
+        if application is None:
+            raise LookupError(application_id)
+        if application.get("status") != "approved":
+            raise ApprovalInProgress(application_id)
+        # Steps left over from an earlier approval run here only if nobody holds them
+        claimed = await claim_approval_steps(application_id)
+        if claimed is not None:
+            return claimed, claimed["approval_claimed_by"]
+        return application, None
+
+    await invalidate("members")
+    logger.info(f"Application {application_id} approved as {application['membership_number']}")
+    return application, application["approval_claimed_by"]
+
+
+async def _write_certificate(application: dict) -> dict:
+    membership_number = application["membership_number"]
+    certificate_data = {
+        "full_name": application.get("full_name"),
+        "qualification": application.get("qualification"),
+        "work_hospital": application.get("work_hospital"),
+        "membership_type": application.get("membership_type"),
+        "membership_number": membership_number,
+        "approved_date": application["approved_date"].strftime('%B %d, %Y')
+    }
+    buffer = await asyncio.to_thread(generate_membership_certificate, certificate_data)
+
+    CERTIFICATE_DIR.mkdir(exist_ok=True, parents=True)
+    cert_path = CERTIFICATE_DIR / Path(certificate_url(membership_number)).name
+    await asyncio.to_thread(cert_path.write_bytes, buffer.getvalue())
+
+    url = certificate_url(membership_number)
+    await db.members.update_one(member_query(application["id"]), {"$set": {"certificate_path": url}})
+    await invalidate("members")
+    return {"certificate_path": url}
+
+
+async def _send_email(application: dict) -> dict:
+    url = application.get("certificate_path") or certificate_url(application["membership_number"])
+    cert_path = CERTIFICATE_DIR / Path(url).name
+    buffer = io.BytesIO(await asyncio.to_thread(cert_path.read_bytes))
+    await asyncio.to_thread(send_approval_email_with_certificate, application, buffer, url)
+    return {}
+
+
+async def _create_member_step(application: dict) -> dict:
+    await create_member(application)
+    await invalidate("members")
+    return {}
+
+
+_STEPS = {
+    MEMBER_STEP: _create_member_step,
+    CERTIFICATE_STEP: _write_certificate,
+    EMAIL_STEP: _send_email,
+}
+
+
+async def run_approval_steps(application: dict, token: str):
+    """
+    Run the application's pending follow-up steps in order, holding the lease token
+
+    Each completed step is removed from approval_pending together with the
+    fields it produced. The run stops if the lease has passed to someone
+    else. A failing step stops the run and is retried by
+    resume_pending_approvals() once the lease has expired.
+    """
+    application_id = application["id"]
+    held = {"id": application_id, "approval_claimed_by": token}
+    for step in list(application.get("approval_pending") or []):
+        try:
+            fields = await _STEPS[step](application)
+        except Exception as e:
+            logger.error(f"Approval step {step} failed for application {application_id}: {str(e)}")
+            return
+        update = {"$pull": {"approval_pending": step}}
+        if fields:
+            update["$set"] = fields
+            application.update(fields)
+        result = await db.membership_applications.update_one(held, update)
+        if result.matched_count == 0:
+            logger.warning(f"Lost the approval lease on application {application_id} after step {step}")
+            return
+
+    await db.membership_applications.update_one(
+        held, {"$unset": {"approval_claimed_until": "", "approval_claimed_by": ""}}
+    )
+
+
+async def claim_approval_steps(application_id: str) -> Optional[dict]:
+    """Take over an application's pending steps unless another worker holds them"""
+    return await db.membership_applications.find_one_and_update(
+        {"id": application_id, **PENDING_STEPS_QUERY, **_unclaimed()},
+        {"$set": {"approval_claimed_until": _lease(), "approval_claimed_by": str(uuid.uuid4())}},
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER
+    )
+
+
+async def resume_pending_approvals() -> int:
+    """Finish follow-up steps of approvals interrupted by a crash or restart"""
+    cursor = db.membership_applications.find(PENDING_STEPS_QUERY, {"_id": 0, "id": 1})
+    resumed = 0
+    async for doc in cursor:
+        application = await claim_approval_steps(doc["id"])
+        if application is None:
+            continue
+        await run_approval_steps(application, application["approval_claimed_by"])
+        resumed += 1
+    if resumed:
+        logger.info(f"Resumed pending steps for {resumed} approved applications")
+    return resumed
+
+
+async def resume_periodically():
+    while True:
+        try:
+            await resume_pending_approvals()
+        except Exception as e:
+            logger.error(f"Resuming approval steps failed: {e}")
+        await asyncio.sleep(APPROVAL_RETRY_INTERVAL)
@@ -0,0 +1,471 @@
+"""
+In-process response cache for read-mostly public endpoints
+Entries are keyed on handler + path/query params and tagged by collection
+so that admin writes can evict everything derived from that collection.
+Each tag also carries a version stamp in MongoDB which backs the ETag /
+Last-Modified headers of conditional GETs; a cached entry keeps the stamps
+it was filled under so the headers always describe the body served. Invalidations are broadcast to
+the other workers through utils.cache_bus. Right after a tag changes,
+reads_for() keeps public reads of it on the primary so refills don't
+pick up a lagging secondary's copy.
+"""
+import os
+import time
+import asyncio
+import hashlib
+import inspect
+import logging
+import functools
+from contextvars import ContextVar
+from collections import OrderedDict
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from fastapi import Request, Response
+
+from database import db, public_db
+from utils.cache_bus import publish
+
+PUBLIC_CACHE_TTL = float(os.environ.get('PUBLIC_CACHE_TTL', '60'))
+PUBLIC_CACHE_MAX_ENTRIES = int(os.environ.get('PUBLIC_CACHE_MAX_ENTRIES', '1024'))
+# Extra seconds a response may be served stale while it is refreshed in the background
+PUBLIC_CACHE_STALE_TTL = float(os.environ.get('PUBLIC_CACHE_STALE_TTL', '0'))
+# How long a worker trusts its copy of the collection version stamps
+CACHE_VERSION_TTL = float(os.environ.get('CACHE_VERSION_TTL', '5'))
+# Seconds after a change during which public reads of that tag stay on the primary
+PUBLIC_PRIMARY_WINDOW = float(os.environ.get('PUBLIC_PRIMARY_WINDOW', '120'))
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class ResponseCache:
+    """
+    TTL + LRU cache with tag based invalidation
+    An entry is fresh for `ttl` seconds, then stale (still servable) for
+    another `stale_ttl` seconds before it hard-expires.
+    """
+
+    def __init__(self, max_entries: int = PUBLIC_CACHE_MAX_ENTRIES, default_ttl: float = PUBLIC_CACHE_TTL):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        # key -> (fresh_until, expires_at, value, tags)
+        self._entries: "OrderedDict[str, Tuple[float, float, Any, Tuple[str, ...]]]" = OrderedDict()
+        self._tag_index: Dict[str, Set[str]] = {}
+        self._generations: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.stale_serves = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+
+    def lookup(self, key: str) -> Tuple[Any, bool]:
+        """Return (value, is_stale), value is _MISSING when absent or hard-expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return _MISSING, False
+
+        fresh_until, expires_at, value, _ = entry
+        now = time.monotonic()
+        if expires_at <= now:
+            self._remove(key)
+            self.misses += 1
+            return _MISSING, False
+
+        self._entries.move_to_end(key)
+        if fresh_until <= now:
+            self.stale_serves += 1
+            return value, True
+        self.hits += 1
+        return value, False
+
+    def get(self, key: str, default=None):
+        value, _ = self.lookup(key)
+        return default if value is _MISSING else value
+
+    def set(self, key: str, value: Any, tags: Iterable[str] = (), ttl: Optional[float] = None,
+            stale_ttl: float = 0):
+        if key in self._entries:
+            self._remove(key)
+
+        ttl = self.default_ttl if ttl is None else ttl
+        tags = tuple(tags)
+        fresh_until = time.monotonic() + ttl
+        self._entries[key] = (fresh_until, fresh_until + stale_ttl, value, tags)
+        for tag in tags:
+            self._tag_index.setdefault(tag, set()).add(key)
+
+        while len(self._entries) > self.max_entries:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions += 1
+
+    def invalidate_tags(self, *tags: str) -> int:
+        """Drop every entry carrying any of the given tags"""
+        removed = 0
+        for tag in tags:
+            self._generations[tag] = self._generations.get(tag, 0) + 1
+            for key in list(self._tag_index.get(tag, ())):
+                self._remove(key)
+                removed += 1
+        return removed
+
+    def generation(self, tags: Iterable[str]) -> Tuple[int, ...]:
+        """Snapshot of the invalidation counters of the given tags"""
+        return tuple(self._generations.get(tag, 0) for tag in tags)
+
+    def tags(self) -> Tuple[str, ...]:
+        return tuple(self._tag_index)
+
+    def clear(self):
+        self._entries.clear()
+        self._tag_index.clear()
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "stale_serves": self.stale_serves,
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+        }
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[3]:
+            keys = self._tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_index[tag]
+
+
+response_cache = ResponseCache()
+
+
+def make_cache_key(name: str, params: Dict[str, Any]) -> str:
+    """Build a cache key from the handler name and its path/query params"""
+    parts = [f"{k}={params[k]!r}" for k in sorted(params)]
+    return f"{name}?{'&'.join(parts)}"
+
+
+# ==================== SINGLE FLIGHT ====================
+_in_flight: Dict[str, "asyncio.Future"] = {}
+
+
+def _forget_in_flight(key: str, future: "asyncio.Future"):
+    if _in_flight.get(key) is future:
+        del _in_flight[key]
+    if not future.cancelled():
+        # Mark the exception as retrieved even if every caller went away
+        future.exception()
+
+
+async def run_single_flight(key: str, loader: Callable):
+    """
+    Run loader() once for all concurrent callers sharing the same key
+    The shared coroutine keeps running if the caller that started it is
+    cancelled, so the remaining waiters still get the result.
+    """
+    future = _in_flight.get(key)
+    if future is None:
+        future = asyncio.ensure_future(loader())
+        _in_flight[key] = future
+        future.add_done_callback(functools.partial(_forget_in_flight, key))
+    return await asyncio.shield(future)
+
+
+_refresh_tasks: Set["asyncio.Task"] = set()
+
+
+def _refresh_done(task: "asyncio.Task"):
+    _refresh_tasks.discard(task)
+    if task.cancelled():
+        return
+    if task.exception() is not None:
+        response_cache.refresh_errors += 1
+        logger.warning("Background cache refresh failed: %r", task.exception())
+    else:
+        response_cache.refreshes += 1
+
+
+def schedule_refresh(key: str, loader: Callable):
+    """Refresh a stale entry in the background unless a load is already running"""
+    if key in _in_flight:
+        return
+    task = asyncio.ensure_future(run_single_flight(key, loader))
+    _refresh_tasks.add(task)
+    task.add_done_callback(_refresh_done)
+
+
+def single_flight(func: Callable):
+    """Coalesce concurrent identical calls of an async route handler"""
+    @functools.wraps(func)
+    async def wrapper(**kwargs):
+        key = make_cache_key(func.__qualname__, kwargs)
+        return await run_single_flight(key, functools.partial(func, **kwargs))
+    return wrapper
+
+
+def cached(*tags: str, ttl: Optional[float] = None, stale_ttl: Optional[float] = None):
+    """
+    Cache the return value of an async route handler
+    Concurrent misses for the same key share a single call to the handler.
+    Within the stale window the last good value is returned immediately and
+    refreshed in the background; a failed refresh keeps serving it until
+    the hard expiry (ttl + stale_ttl).
+
+    The entry stores the tags' version stamps read before the handler ran,
+    which @conditional uses for the ETag / Last-Modified of a cached body.
+
+    Args:
+        tags: collection tags used for invalidation (e.g. "events")
+        ttl: seconds the entry is fresh (default: PUBLIC_CACHE_TTL)
+        stale_ttl: seconds it may be served stale afterwards (default: PUBLIC_CACHE_STALE_TTL)
+    """
+    stale_ttl = PUBLIC_CACHE_STALE_TTL if stale_ttl is None else stale_ttl
+
+    def decorator(func: Callable):
+        async def load(key: str, kwargs: dict, generation: Tuple[int, ...]):
+            # Read first: the data is then at least as new as the stamps stored with it
+            versions = await get_versions(tags)
+            value = await func(**kwargs)
+            # Don't store a result that an admin write invalidated mid-flight
+            if response_cache.generation(tags) == generation:
+                response_cache.set(key, (versions, value), tags=tags, ttl=ttl, stale_ttl=stale_ttl)
+            return versions, value
+
+        @functools.wraps(func)
+        async def wrapper(**kwargs):
+            key = make_cache_key(func.__qualname__, kwargs)
+            # Taken before the load is scheduled so a write landing before it starts also counts
+            loader = functools.partial(load, key, kwargs, response_cache.generation(tags))
+            entry, is_stale = response_cache.lookup(key)
+            if entry is _MISSING:
+                entry = await run_single_flight(key, loader)
+            elif is_stale:
+                schedule_refresh(key, loader)
+            versions, value = entry
+            _record_served(versions)
+            return value
+        return wrapper
+    return decorator
+
+
+# ==================== VERSION STAMPS ====================
+# tag -> (fetched_at, version, updated_at)
+_versions: Dict[str, Tuple[float, int, Optional[datetime]]] = {}
+# tag -> (version, updated_at) of the cached data served while a @conditional handler runs
+_served_versions: ContextVar[Optional[Dict[str, Tuple[int, Optional[datetime]]]]] = \
+    ContextVar("served_versions", default=None)
+
+
+def _record_served(versions: Dict[str, Tuple[int, Optional[datetime]]]):
+    """Note the stamps of a cached value served to the running @conditional handler (oldest wins)"""
+    served = _served_versions.get()
+    if served is None:
+        return
+    for tag, stamp in versions.items():
+        if tag not in served or stamp[0] < served[tag][0]:
+            served[tag] = stamp
+
+
+async def get_versions(tags: Iterable[str]) -> Dict[str, Tuple[int, Optional[datetime]]]:
+    """Get the (version, updated_at) stamp of each tag"""
+    now = time.monotonic()
+    result = {}
+    stale = []
+    for tag in tags:
+        entry = _versions.get(tag)
+        if entry and now - entry[0] < CACHE_VERSION_TTL:
+            result[tag] = (entry[1], entry[2])
+        else:
+            stale.append(tag)
+
+    if stale:
+        docs = await db.cache_versions.find({"_id": {"$in": stale}}).to_list(len(stale))
+        found = {doc["_id"]: doc for doc in docs}
+        for tag in stale:
+            doc = found.get(tag, {})
+            stamp = (doc.get("version", 0), doc.get("updated_at"))
+            _versions[tag] = (now, *stamp)
+            result[tag] = stamp
+    return result
+
+
+async def bump_versions(*tags: str):
+    """Advance the version stamp of each tag"""
+    now = datetime.utcnow()
+    for tag in tags:
+        await db.cache_versions.update_one(
+            {"_id": tag},
+            {"$inc": {"version": 1}, "$set": {"updated_at": now}},
+            upsert=True
+        )
+        _versions.pop(tag, None)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    candidates = [c.strip() for c in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+def _validators(key: str, tags: Tuple[str, ...], versions: Dict[str, Tuple[int, Optional[datetime]]]):
+    """(etag, last_modified, headers) for a response built from data at the given stamps"""
+    stamp = "|".join(f"{tag}:{versions[tag][0]}" for tag in tags)
+    digest = hashlib.sha1(f"{key}#{stamp}".encode()).hexdigest()
+    etag = f'"{digest}"'
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=0, must-revalidate"}
+
+    updated = [versions[tag][1] for tag in tags if versions[tag][1] is not None]
+    last_modified = max(updated).replace(microsecond=0) if updated else None
+    if last_modified:
+        headers["Last-Modified"] = last_modified.strftime("%a, %d %b %Y %H:%M:%S GMT")
+    return etag, last_modified, headers
+
+
+def _not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+    if last_modified and request.headers.get("if-modified-since"):
+        try:
+            since = parsedate_to_datetime(request.headers["if-modified-since"]).replace(tzinfo=None)
+        except (TypeError, ValueError):
+            return False
+        return last_modified <= since
+    return False
+
+
+def conditional(*tags: str):
+    """
+    Add ETag / Last-Modified headers to an async route handler and answer
+    matching If-None-Match / If-Modified-Since requests with 304
+
+    A client already holding the current stamps gets its 304 without the
+    handler being called. Otherwise the headers are derived from the stamps
+    of the @cached data the handler served, which can be older than the
+    current ones until this worker hears of the change.
+    """
+    def decorator(func: Callable):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(request: Request, response: Response, **kwargs):
+            key = make_cache_key(func.__qualname__, kwargs)
+            current = await get_versions(tags)
+            etag, last_modified, headers = _validators(key, tags, current)
+            if _not_modified(request, etag, last_modified):
+                return Response(status_code=304, headers=headers)
+
+            token = _served_versions.set({})
+            try:
+                body = await func(**kwargs)
+                served = _served_versions.get()
+            finally:
+                _served_versions.reset(token)
+
+            if served:
+                etag, last_modified, headers = _validators(key, tags, {**current, **served})
+                if _not_modified(request, etag, last_modified):
+                    return Response(status_code=304, headers=headers)
+            response.headers.update(headers)
+            return body
+
+        wrapper.__signature__ = signature.replace(parameters=[
+            *signature.parameters.values(),
+            inspect.Parameter("request", inspect.Parameter.KEYWORD_ONLY, annotation=Request),
+            inspect.Parameter("response", inspect.Parameter.KEYWORD_ONLY, annotation=Response),
+        ])
+        return wrapper
+    return decorator
+
+
+# Coroutines run on the worker that performed the write, e.g. snapshot publishing
+_invalidation_hooks: List[Callable] = []
+# tag -> coroutines rebuilding in-memory data derived from that tag, run on every worker
+_reloaders: Dict[str, List[Callable]] = {}
+
+
+def add_invalidation_hook(hook: Callable):
+    """Register `async hook(*tags)` to run after every admin invalidation"""
+    _invalidation_hooks.append(hook)
+
+
+def add_reloader(tag: str, reloader: Callable):
+    """Register `async reloader()` to rebuild in-memory data when `tag` changes"""
+    _reloaders.setdefault(tag, []).append(reloader)
+
+
+async def reload(*tags: str):
+    for tag in tags:
+        for reloader in _reloaders.get(tag, ()):
+            try:
+                await reloader()
+            except Exception as e:
+                logger.error(f"Reloading {tag} with {reloader.__qualname__} failed: {e}")
+
+
+# tag -> when this worker last saw it change (monotonic); "*" for every tag
+_changed_at: Dict[str, float] = {}
+
+
+def invalidate_local(*tags: str):
+    """Evict this worker's cached responses and version stamps for the given tags"""
+    response_cache.invalidate_tags(*tags)
+    now = time.monotonic()
+    for tag in tags:
+        _versions.pop(tag, None)
+        _changed_at[tag] = now
+
+
+def apply_remote_invalidation(*tags: str):
+    """Apply an invalidation published by another worker"""
+    invalidate_local(*tags)
+    if any(tag in _reloaders for tag in tags):
+        asyncio.ensure_future(reload(*tags))
+
+
+def reset_local():
+    """Drop everything this worker has cached"""
+    response_cache.invalidate_tags(*response_cache.tags())
+    _versions.clear()
+    _changed_at["*"] = time.monotonic()
+    if _reloaders:
+        asyncio.ensure_future(reload(*_reloaders))
+
+
+async def invalidate(*tags: str):
+    """Evict cached responses and bump version stamps after an admin write"""
+    invalidate_local(*tags)
+    await reload(*tags)
+    await bump_versions(*tags)
+    await publish(tags)
+    for hook in _invalidation_hooks:
+        try:
+            await hook(*tags)
+        except Exception as e:
+            logger.error(f"Invalidation hook {hook.__qualname__} failed for {tags}: {e}")
+
+
+def reads_for(*tags: str):
+    """
+    Database handle for public reads of the tagged collections
+    This is public_db (which may read from secondaries) except within
+    PUBLIC_PRIMARY_WINDOW of a change to any of the tags, when reads go to
+    the primary so caches and snapshots are rebuilt from the new data.
+    """
+    now = time.monotonic()
+    for tag in (*tags, "*"):
+        if now - _changed_at.get(tag, float("-inf")) < PUBLIC_PRIMARY_WINDOW:
+            return db
+    return public_db
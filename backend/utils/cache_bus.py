@@ -0,0 +1,114 @@
+"""
+Cross-worker cache invalidation bus
+Admin writes publish their cache tags into a capped MongoDB collection and
+every uvicorn worker tails it so its in-process cache is evicted too.
+Only needs the existing MongoDB deployment (no Redis).
+"""
+import os
+import uuid
+import socket
+import asyncio
+import logging
+from datetime import datetime
+from typing import Callable, Iterable, Optional
+
+from pymongo import CursorType, DESCENDING
+from pymongo.errors import CollectionInvalid, PyMongoError
+
+from database import db
+
+logger = logging.getLogger(__name__)
+
+CACHE_BUS_ENABLED = os.environ.get('CACHE_BUS_ENABLED', 'true').lower() == 'true'
+CACHE_BUS_COLLECTION = os.environ.get('CACHE_BUS_COLLECTION', 'cache_invalidations')
+CACHE_BUS_SIZE_BYTES = int(os.environ.get('CACHE_BUS_SIZE_BYTES', str(1024 * 1024)))
+CACHE_BUS_RETRY_SECONDS = 1.0
+
+# Identifies messages published by this process so they are not applied twice
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+_subscriber: Optional["asyncio.Task"] = None
+
+
+async def ensure_bus_collection():
+    """Create the capped collection used by the bus if it is missing"""
+    if CACHE_BUS_COLLECTION not in await db.list_collection_names():
+        try:
+            await db.create_collection(CACHE_BUS_COLLECTION, capped=True, size=CACHE_BUS_SIZE_BYTES)
+        except CollectionInvalid:
+            pass  # created concurrently by another worker
+
+    collection = db[CACHE_BUS_COLLECTION]
+    # A tailable cursor on an empty capped collection dies immediately
+    if await collection.find_one({}, {"_id": 1}) is None:
+        await collection.insert_one({"tags": [], "origin": WORKER_ID, "ts": datetime.utcnow()})
+
+
+async def publish(tags: Iterable[str]):
+    """Broadcast invalidated tags to the other workers"""
+    if not CACHE_BUS_ENABLED:
+        return
+    try:
+        await db[CACHE_BUS_COLLECTION].insert_one({
+            "tags": list(tags),
+            "origin": WORKER_ID,
+            "ts": datetime.utcnow()
+        })
+    except PyMongoError as e:
+        # Other workers still converge once their cache entries expire
+        logger.warning(f"Cache bus publish failed for {list(tags)}: {e}")
+
+
+async def _subscribe(on_invalidate: Callable, on_reset: Callable):
+    collection = db[CACHE_BUS_COLLECTION]
+    resumed = False
+    while True:
+        try:
+            await ensure_bus_collection()
+            latest = await collection.find_one({}, {"_id": 1}, sort=[("$natural", DESCENDING)])
+            if resumed:
+                # Messages may have been missed while the cursor was down
+                on_reset()
+            resumed = True
+
+            cursor = collection.find(
+                {"_id": {"$gt": latest["_id"]}},
+                cursor_type=CursorType.TAILABLE_AWAIT
+            )
+            while cursor.alive:
+                async for message in cursor:
+                    if message.get("origin") != WORKER_ID and message.get("tags"):
+                        on_invalidate(*message["tags"])
+                await asyncio.sleep(CACHE_BUS_RETRY_SECONDS)
+        except asyncio.CancelledError:
+            raise
+        except PyMongoError as e:
+            logger.warning(f"Cache bus cursor lost, retrying: {e}")
+        await asyncio.sleep(CACHE_BUS_RETRY_SECONDS)
+
+
+def start_subscriber(on_invalidate: Callable, on_reset: Callable):
+    """
+    Start tailing the bus in the background
+
+    Args:
+        on_invalidate: called with the tags of every message from another worker
+        on_reset: called when messages may have been missed (cursor restarted)
+    """
+    global _subscriber
+    if not CACHE_BUS_ENABLED or _subscriber is not None:
+        return
+    _subscriber = asyncio.ensure_future(_subscribe(on_invalidate, on_reset))
+    logger.info(f"Cache invalidation bus subscribed as {WORKER_ID}")
+
+
+async def stop_subscriber():
+    global _subscriber
+    if _subscriber is None:
+        return
+    _subscriber.cancel()
+    try:
+        await _subscriber
+    except asyncio.CancelledError:
+        pass
+    _subscriber = None
@@ -160,52 +160,3 @@ def generate_membership_number(year=None):
     # For now, returns a placeholder format
     # In actual implementation, this will query database for last number
     return f"SESI-{year}-0001"
-
-async def get_next_membership_number():
-    """
-    Get next available membership number from database
-    Format: SESI-YYYY-XXXX where XXXX is sequential
-    """
-    from motor.motor_asyncio import AsyncIOMotorClient
-    import os
-    
-    from database import db
-
-    
-    current_year = datetime.now().year
-    
-    # Find the highest membership number for current year
-    pipeline = [
-        {
-            "$match": {
-                "membership_number": {"$regex": f"^SESI-{current_year}-"}
-            }
-        },
-        {
-            "$project": {
-                "number_part": {
-                    "$toInt": {
-                        "$substr": ["$membership_number", 10, 4]
-                    }
-                }
-            }
-        },
-        {
-            "$sort": {"number_part": -1}
-        },
-        {
-            "$limit": 1
-        }
-    ]
-    
-    result = await db.membership_applications.aggregate(pipeline).to_list(1)
-    
-    if result:
-        next_number = result[0]['number_part'] + 1
-    else:
-        next_number = 1
-    
-    membership_number = f"SESI-{current_year}-{str(next_number).zfill(4)}"
-    client.close()
-    
-    return membership_number
@@ -0,0 +1,206 @@
+"""
+Maintained document counters for the dashboard and public statistics
+Write paths keep a single `counters` document up to date with $inc so both
+stats endpoints are one _id lookup; reconcile_counters() recomputes it
+from the collections with a single $facet aggregation to repair drift.
+Album photo_count fields are maintained the same way and repaired by
+reconcile_photo_counts().
+"""
+import os
+import asyncio
+import logging
+from datetime import datetime
+from typing import Dict, Tuple
+
+from pymongo import UpdateOne
+from pymongo.errors import DuplicateKeyError
+
+from database import db
+from utils.cache import invalidate
+
+logger = logging.getLogger(__name__)
+
+STATS_ID = "stats"
+COUNTERS_RECONCILE_INTERVAL = float(os.environ.get('COUNTERS_RECONCILE_INTERVAL', '3600'))
+# Recounts discarded because counters moved while counting, before giving up until the next run
+COUNTERS_RECONCILE_ATTEMPTS = 3
+
+# counter -> (collection, status it is restricted to or None)
+COUNTERS = {
+    "members_total": ("members", None),
+    "members_active": ("members", "active"),
+    "events_total": ("events", None),
+    "events_upcoming": ("events", "upcoming"),
+    "news_total": ("news", None),
+    "publications_total": ("publications", None),
+    "applications_total": ("membership_applications", None),
+    "applications_submitted": ("membership_applications", "submitted"),
+}
+
+
+def deltas_for(collection: str, status=None, sign: int = 1) -> dict:
+    """Counter increments for adding (sign=1) or removing (sign=-1) one document"""
+    return {
+        name: sign
+        for name, (coll, counted_status) in COUNTERS.items()
+        if coll == collection and (counted_status is None or counted_status == status)
+    }
+
+
+def status_change_deltas(collection: str, old_status, new_status) -> dict:
+    """Counter increments for a document moving from old_status to new_status"""
+    deltas = deltas_for(collection, old_status, -1)
+    for name, value in deltas_for(collection, new_status, 1).items():
+        deltas[name] = deltas.get(name, 0) + value
+    return {name: value for name, value in deltas.items() if value}
+
+
+async def increment(deltas: dict, session=None):
+    if not deltas:
+        return
+    await db.counters.update_one(
+        {"_id": STATS_ID},
+        {"$inc": {**deltas, "version": 1}, "$set": {"updated_at": datetime.utcnow()}},
+        upsert=True,
+        session=session
+    )
+
+
+async def count_added(collection: str, status=None, session=None):
+    await increment(deltas_for(collection, status, 1), session=session)
+
+
+async def count_removed(collection: str, status=None, session=None):
+    await increment(deltas_for(collection, status, -1), session=session)
+
+
+async def count_status_change(collection: str, old_status, new_status, session=None):
+    await increment(status_change_deltas(collection, old_status, new_status), session=session)
+
+
+def _reconcile_pipeline() -> list:
+    collections = list(dict.fromkeys(coll for coll, _ in COUNTERS.values()))
+    first, rest = collections[0], collections[1:]
+
+    def tag(coll):
+        return {"$project": {"_id": 0, "c": {"$literal": coll}, "s": "$status"}}
+
+    facets = {}
+    for name, (coll, status) in COUNTERS.items():
+        match = {"c": coll}
+        if status is not None:
+            match["s"] = status
+        facets[name] = [{"$match": match}, {"$count": "n"}]
+
+    return [
+        tag(first),
+        *[{"$unionWith": {"coll": coll, "pipeline": [tag(coll)]}} for coll in rest],
+        {"$facet": facets},
+    ]
+
+
+async def _count_all() -> dict:
+    first_collection = next(iter(COUNTERS.values()))[0]
+    result = await db[first_collection].aggregate(_reconcile_pipeline()).to_list(1)
+    facets = result[0] if result else {}
+    return {name: (facets.get(name) or [{"n": 0}])[0]["n"] for name in COUNTERS}
+
+
+async def reconcile_counters() -> Tuple[dict, Dict[str, int]]:
+    """
+    Recompute every counter from the source collections
+
+    The counts are only written if no increment landed while counting:
+    every increment bumps `version`, and the replace is guarded on the
+    version read before the aggregation. Otherwise the count is retried.
+
+    Returns:
+        (the counters, counter -> correction for every counter that had drifted)
+    """
+    for _ in range(COUNTERS_RECONCILE_ATTEMPTS):
+        before = await db.counters.find_one({"_id": STATS_ID}, {"version": 1})
+        version = (before or {}).get("version")
+        counts = await _count_all()
+        try:
+            previous = await db.counters.find_one_and_replace(
+                {"_id": STATS_ID, "version": version},
+                {
+                    **counts,
+                    "version": (version or 0) + 1,
+                    "updated_at": datetime.utcnow(),
+                    "reconciled_at": datetime.utcnow()
+                },
+                upsert=True
+            )
+        except DuplicateKeyError:
+            # The guard missed because the counters changed; the upsert then collided on _id
+            continue
+        break
+    else:
+        logger.warning("Counters kept changing during reconciliation; leaving them for the next run")
+        return counts, {}
+
+    drift = {
+        name: counts[name] - (previous or {}).get(name, 0)
+        for name in COUNTERS
+        if previous and previous.get(name, 0) != counts[name]
+    }
+    if drift:
+        logger.warning(f"Counter drift repaired: {drift}")
+    return counts, drift
+
+
+async def get_counters() -> dict:
+    """Current counters, computing them on first use"""
+    doc = await db.counters.find_one({"_id": STATS_ID})
+    if doc is None:
+        counts, _ = await reconcile_counters()
+        return counts
+    return {name: doc.get(name, 0) for name in COUNTERS}
+
+
+async def reconcile_photo_counts() -> int:
+    """
+    Fix every album whose photo_count differs from its number of photos
+
+    Each repair is guarded on the photo_count read before counting, so an
+    upload or delete that moved it meanwhile is not overwritten; that album
+    is left for the next run.
+    """
+    albums = await db.gallery_albums.find({}, {"_id": 0, "id": 1, "photo_count": 1}).to_list(None)
+    rows = await db.gallery.aggregate([
+        {"$match": {"album_id": {"$type": "string"}}},
+        {"$group": {"_id": "$album_id", "n": {"$sum": 1}}}
+    ]).to_list(None)
+    counts = {row["_id"]: row["n"] for row in rows}
+
+    repairs = [
+        UpdateOne(
+            {"id": album["id"], "photo_count": album.get("photo_count")},
+            {"$set": {"photo_count": counts.get(album["id"], 0)}}
+        )
+        for album in albums
+        if album.get("photo_count") != counts.get(album["id"], 0)
+    ]
+    if not repairs:
+        return 0
+    result = await db.gallery_albums.bulk_write(repairs, ordered=False)
+    skipped = len(repairs) - result.matched_count
+    if result.modified_count:
+        logger.warning(f"Repaired photo_count drift on {result.modified_count} albums")
+    if skipped:
+        logger.info(f"Skipped photo_count repair on {skipped} albums changed while counting")
+    return result.modified_count
+
+
+async def reconcile_periodically():
+    while True:
+        try:
+            _, drift = await reconcile_counters()
+            if drift:
+                await invalidate("members", "events", "publications")
+            if await reconcile_photo_counts():
+                await invalidate("gallery")
+        except Exception as e:
+            logger.error(f"Counter reconciliation failed: {e}")
+        await asyncio.sleep(COUNTERS_RECONCILE_INTERVAL)
@@ -0,0 +1,43 @@
+"""
+Single-round-trip updates for admin handlers
+Each edit is one find_one_and_update that applies the change and returns
+the document, instead of find_one (exists?) + update_one + find_one.
+"""
+from typing import Type
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+from pymongo import ReturnDocument
+
+
+async def find_one_and_update_or_404(
+    collection,
+    query: dict,
+    update,
+    detail: str,
+    return_document: bool = ReturnDocument.AFTER,
+    **kwargs
+) -> dict:
+    """
+    Update the matching document and return it (after the update by default)
+
+    Raises:
+        HTTPException: 404 with `detail` if nothing matches
+    """
+    doc = await collection.find_one_and_update(
+        query, update, projection={"_id": 0}, return_document=return_document, **kwargs
+    )
+    if doc is None:
+        raise HTTPException(status_code=404, detail=detail)
+    return doc
+
+
+async def update_and_return(collection, query: dict, fields: dict, model: Type[BaseModel], detail: str):
+    """$set fields on the matching document and return it as model (BSON dates decode to datetimes)"""
+    doc = await find_one_and_update_or_404(collection, query, {"$set": fields}, detail)
+    return model(**doc)
+
+
+def literal(fields: dict) -> dict:
+    """$set body for a pipeline update that stores the values as given"""
+    return {name: {"$literal": value} for name, value in fields.items()}
@@ -0,0 +1,56 @@
+"""
+Date codec between the Pydantic models and MongoDB
+Every date field is stored as a native BSON date (naive UTC, which is what
+Motor hands back) rather than an ISO string, so range queries, sorting and
+date-bucketed aggregations use the indexes. Reads need no decoding: the
+models accept datetimes, and until migrate_dates.py has run they still
+parse the old ISO strings.
+"""
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+from pydantic import BaseModel
+
+# collection -> fields holding dates
+DATE_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "members": ("joined_date", "created_at"),
+    "committee_members": ("created_at",),
+    "events": ("start_date", "end_date", "created_at"),
+    "news": ("published_date", "created_at"),
+    "gallery": ("upload_date",),
+    "gallery_albums": ("created_at",),
+    "publications": ("published_date", "created_at"),
+    "membership_applications": ("submitted_at", "reviewed_at", "approved_date"),
+    "page_seo": ("updated_at",),
+    "contact_submissions": ("created_at",),
+    "users": ("created_at",),
+}
+
+
+def to_bson_date(value) -> Optional[datetime]:
+    """
+    Normalize a datetime or ISO string to a naive UTC datetime
+
+    Raises:
+        ValueError: if a string is not an ISO 8601 date
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def encode_dates(collection: str, doc: dict) -> dict:
+    """Convert the collection's date fields in doc to BSON dates"""
+    for field in DATE_FIELDS.get(collection, ()):
+        if doc.get(field) is not None:
+            doc[field] = to_bson_date(doc[field])
+    return doc
+
+
+def to_document(collection: str, obj: BaseModel) -> dict:
+    """Dump a model into the document stored in the collection"""
+    return encode_dates(collection, obj.model_dump())
@@ -68,6 +68,7 @@
 
 import os
 import uuid
+import asyncio
 from pathlib import Path
 from fastapi import UploadFile, HTTPException
 from typing import List
@@ -75,6 +76,9 @@ from typing import List
 ALLOWED_EXTENSIONS = {'.pdf', '.jpg', '.jpeg', '.png', '.doc', '.docx'}
 MAX_FILE_SIZE = 5 * 1024 * 1024
 
+# Files written at once by save_multiple_files
+UPLOAD_CONCURRENCY = int(os.environ.get('UPLOAD_CONCURRENCY', '8'))
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 UPLOAD_DIR = BASE_DIR / "uploads"
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
@@ -106,8 +110,8 @@ async def save_upload_file(file: UploadFile, subfolder: str = "general") -> str:
             detail=f"File too large. Maximum size: {MAX_FILE_SIZE / (1024*1024)}MB"
         )
     
-    with open(file_path, "wb") as f:
-        f.write(contents)
+    # Keep the event loop free while the file hits the disk
+    await asyncio.to_thread(file_path.write_bytes, contents)
     
     return f"/uploads/{subfolder}/{unique_filename}"
 
@@ -115,12 +119,29 @@ async def save_multiple_files(
     files: List[UploadFile],
     subfolder: str = "general"
 ) -> List[str]:
-    file_paths = []
+    """
+    Save files concurrently (at most UPLOAD_CONCURRENCY at a time)
+    Paths are returned in the order of files; if any file is rejected,
+    the ones already written are deleted and the error is raised.
+    """
+    files = [file for file in files if file.filename]
     for file in files:
-        if file.filename:
-            file_path = await save_upload_file(file, subfolder)
-            file_paths.append(file_path)
-    return file_paths
+        validate_file(file)
+    
+    semaphore = asyncio.Semaphore(UPLOAD_CONCURRENCY)
+    
+    async def save(file: UploadFile) -> str:
+        async with semaphore:
+            return await save_upload_file(file, subfolder)
+    
+    results = await asyncio.gather(*(save(file) for file in files), return_exceptions=True)
+    errors = [r for r in results if isinstance(r, BaseException)]
+    if errors:
+        for path in results:
+            if isinstance(path, str):
+                delete_file(path)
+        raise errors[0]
+    return results
 
 def delete_file(file_path: str) -> bool:
     try:
@@ -0,0 +1,87 @@
+"""
+Immutable in-memory index of Indian states and districts
+The data is seeded once from seed_data/indian_states_districts.py and never
+changes at runtime, so it is loaded at startup and served from memory with
+pre-serialized bodies and a versioned ETag.
+"""
+import json
+import hashlib
+import logging
+from typing import Dict, List, Optional
+
+from fastapi import Request, Response
+
+from database import db
+from models.models import State, District
+
+logger = logging.getLogger(__name__)
+
+GEOGRAPHY_MAX_AGE = 24 * 60 * 60
+
+
+def _dump(items: List[dict]) -> bytes:
+    return json.dumps(items, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+class GeographyIndex:
+    def __init__(self, states: List[dict], districts: List[dict]):
+        states = [State(**s).model_dump() for s in states]
+        districts = [District(**d).model_dump() for d in districts]
+
+        self.states: List[dict] = sorted(states, key=lambda s: s["name"])
+        self.states_by_id: Dict[str, dict] = {s["id"]: s for s in self.states}
+        self.districts_by_id: Dict[str, dict] = {d["id"]: d for d in districts}
+        self.districts_by_state: Dict[str, List[dict]] = {}
+        for district in sorted(districts, key=lambda d: d["name"]):
+            self.districts_by_state.setdefault(district["state_id"], []).append(district)
+
+        self.states_body = _dump(self.states)
+        self.district_bodies: Dict[str, bytes] = {
+            state_id: _dump(items) for state_id, items in self.districts_by_state.items()
+        }
+        self.empty_body = _dump([])
+        self.version = hashlib.sha1(
+            self.states_body + b"".join(self.district_bodies[k] for k in sorted(self.district_bodies))
+        ).hexdigest()[:16]
+
+    def state_name(self, state_id: str) -> str:
+        state = self.states_by_id.get(state_id)
+        return state["name"] if state else ""
+
+    def district_name(self, district_id: str) -> str:
+        district = self.districts_by_id.get(district_id)
+        return district["name"] if district else ""
+
+    def districts_body(self, state_id: str) -> bytes:
+        return self.district_bodies.get(state_id, self.empty_body)
+
+    def response(self, request: Request, body: bytes, name: str) -> Response:
+        """JSON response with long-lived caching headers, or 304 if the client has it"""
+        etag = f'"geo-{self.version}-{name}"'
+        headers = {
+            "ETag": etag,
+            "Cache-Control": f"public, max-age={GEOGRAPHY_MAX_AGE}"
+        }
+        if_none_match = request.headers.get("if-none-match", "")
+        if etag in [c.strip() for c in if_none_match.split(",")]:
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+
+_index: Optional[GeographyIndex] = None
+
+
+async def load_geography() -> GeographyIndex:
+    """(Re)build the index from the states and districts collections"""
+    global _index
+    states = await db.states.find({}, {"_id": 0}).to_list(None)
+    districts = await db.districts.find({}, {"_id": 0}).to_list(None)
+    _index = GeographyIndex(states, districts)
+    logger.info(f"Geography index loaded: {len(states)} states, {len(districts)} districts (v{_index.version})")
+    return _index
+
+
+async def get_geography() -> GeographyIndex:
+    if _index is None:
+        return await load_geography()
+    return _index
@@ -0,0 +1,159 @@
+"""
+MongoDB index declarations for every query pattern used by the routers
+ensure_indexes() runs at startup: it creates missing indexes and logs any
+drift between what is declared here and what exists in the database.
+"""
+import time
+import logging
+from typing import Dict, List
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+from database import db
+
+logger = logging.getLogger(__name__)
+
+# Only documents that actually carry a membership number take part in uniqueness
+_HAS_MEMBERSHIP_NUMBER = {"membership_number": {"$type": "string"}}
+
+
+def _id_index() -> IndexModel:
+    return IndexModel([("id", ASCENDING)], name="id_unique", unique=True)
+
+
+INDEXES: Dict[str, List[IndexModel]] = {
+    "members": [
+        _id_index(),
+        IndexModel([("membership_number", ASCENDING)], name="membership_number_unique",
+                   unique=True, partialFilterExpression=_HAS_MEMBERSHIP_NUMBER),
+        IndexModel([("full_name", ASCENDING), ("id", ASCENDING)], name="full_name_id"),
+        IndexModel([("status", ASCENDING), ("full_name", ASCENDING), ("id", ASCENDING)], name="status_full_name_id"),
+        IndexModel([("status", ASCENDING), ("search_keys", ASCENDING)], name="status_search_keys"),
+        IndexModel([("application_id", ASCENDING)], name="application_id_unique",
+                   unique=True, partialFilterExpression={"application_id": {"$type": "string"}}),
+        IndexModel([("status", ASCENDING), ("state", ASCENDING), ("full_name", ASCENDING), ("id", ASCENDING)],
+                   name="status_state_full_name_id"),
+        IndexModel([("status", ASCENDING), ("state", ASCENDING), ("city", ASCENDING), ("full_name", ASCENDING),
+                    ("id", ASCENDING)], name="status_state_city_full_name_id"),
+    ],
+    "committee_members": [
+        _id_index(),
+        IndexModel([("slug", ASCENDING)], name="slug"),
+        IndexModel([("display_order", ASCENDING)], name="display_order"),
+        IndexModel([("is_current", ASCENDING), ("display_order", ASCENDING)], name="is_current_display_order"),
+        IndexModel([("year", ASCENDING), ("display_order", ASCENDING)], name="year_display_order"),
+    ],
+    "events": [
+        _id_index(),
+        IndexModel([("start_date", DESCENDING), ("id", DESCENDING)], name="start_date_id"),
+        IndexModel([("status", ASCENDING), ("start_date", DESCENDING), ("id", DESCENDING)], name="status_start_date_id"),
+        IndexModel([("event_type", ASCENDING), ("start_date", DESCENDING)], name="event_type_start_date"),
+        IndexModel([("status", ASCENDING), ("event_type", ASCENDING), ("start_date", DESCENDING)],
+                   name="status_event_type_start_date"),
+    ],
+    "news": [
+        _id_index(),
+        IndexModel([("published_date", DESCENDING), ("id", DESCENDING)], name="published_date_id"),
+        IndexModel([("is_published", ASCENDING), ("published_date", DESCENDING), ("id", DESCENDING)],
+                   name="is_published_published_date_id"),
+        IndexModel([("is_published", ASCENDING), ("category", ASCENDING), ("published_date", DESCENDING)],
+                   name="is_published_category_published_date"),
+    ],
+    "gallery": [
+        _id_index(),
+        IndexModel([("album_id", ASCENDING), ("display_order", ASCENDING)], name="album_id_display_order"),
+        IndexModel([("upload_date", DESCENDING), ("id", DESCENDING)], name="upload_date_id"),
+        IndexModel([("category", ASCENDING), ("upload_date", DESCENDING)], name="category_upload_date"),
+    ],
+    "gallery_albums": [
+        _id_index(),
+        IndexModel([("created_at", DESCENDING)], name="created_at"),
+        IndexModel([("is_published", ASCENDING), ("created_at", DESCENDING)], name="is_published_created_at"),
+        IndexModel([("is_published", ASCENDING), ("category", ASCENDING), ("created_at", DESCENDING)],
+                   name="is_published_category_created_at"),
+    ],
+    "publications": [
+        _id_index(),
+        IndexModel([("published_date", DESCENDING), ("id", DESCENDING)], name="published_date_id"),
+        IndexModel([("publication_type", ASCENDING), ("published_date", DESCENDING)],
+                   name="publication_type_published_date"),
+    ],
+    "membership_applications": [
+        _id_index(),
+        IndexModel([("membership_number", ASCENDING)], name="membership_number_unique",
+                   unique=True, partialFilterExpression=_HAS_MEMBERSHIP_NUMBER),
+        IndexModel([("submitted_at", DESCENDING), ("id", DESCENDING)], name="submitted_at_id"),
+        IndexModel([("status", ASCENDING), ("submitted_at", DESCENDING), ("id", DESCENDING)],
+                   name="status_submitted_at_id"),
+        IndexModel([("approval_pending", ASCENDING)], name="approval_pending"),
+    ],
+    "states": [
+        _id_index(),
+        IndexModel([("name", ASCENDING)], name="name"),
+    ],
+    "districts": [
+        _id_index(),
+        IndexModel([("state_id", ASCENDING), ("name", ASCENDING)], name="state_id_name"),
+    ],
+    "page_seo": [
+        IndexModel([("page_name", ASCENDING)], name="page_name_unique", unique=True),
+    ],
+    "users": [
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+    ],
+    "contact_submissions": [
+        IndexModel([("created_at", DESCENDING)], name="created_at"),
+    ],
+}
+
+# Options compared when checking an existing index against its declaration
+_COMPARED_OPTIONS = ("unique", "partialFilterExpression", "sparse")
+
+
+def _describe(spec: dict) -> dict:
+    key = spec["key"].items() if isinstance(spec["key"], dict) else spec["key"]
+    return {
+        "key": [(field, int(d) if isinstance(d, (int, float)) else d) for field, d in key],
+        **{opt: spec[opt] for opt in _COMPARED_OPTIONS if spec.get(opt)}
+    }
+
+
+async def ensure_indexes():
+    """Create every declared index that is missing and log drift"""
+    started = time.monotonic()
+    created = 0
+    for collection_name, models in INDEXES.items():
+        collection = db[collection_name]
+        existing = {name: _describe(info) for name, info in (await collection.index_information()).items()}
+
+        for model in models:
+            document = model.document
+            name = document["name"]
+            declared = _describe(document)
+
+            if name in existing:
+                if existing[name] != declared:
+                    logger.warning(
+                        f"Index drift on {collection_name}.{name}: "
+                        f"declared {declared}, found {existing[name]} (drop it to rebuild)"
+                    )
+                continue
+
+            index_started = time.monotonic()
+            logger.info(f"Building index {collection_name}.{name} {declared}")
+            try:
+                await collection.create_indexes([model])
+            except OperationFailure as e:
+                # e.g. duplicate values blocking a unique index, or same keys under another name
+                logger.error(f"Failed to build index {collection_name}.{name}: {e}")
+                continue
+            created += 1
+            logger.info(f"Built index {collection_name}.{name} in {time.monotonic() - index_started:.2f}s")
+
+        declared_names = {model.document["name"] for model in models}
+        for name in existing:
+            if name != "_id_" and name not in declared_names:
+                logger.warning(f"Index drift on {collection_name}: undeclared index {name} {existing[name]}")
+
+    logger.info(f"Indexes ensured ({created} created) in {time.monotonic() - started:.2f}s")
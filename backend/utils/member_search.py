@@ -0,0 +1,91 @@
+"""
+Indexed search for the public members directory
+Every member document carries `search_keys`, the normalized (lowercased,
+accent-stripped) word tokens of its searchable fields, and `search_name`,
+the normalized full name. A search matches members having a key that
+starts with each word of the query, which is an anchored regex on a
+multikey index; results are ranked by exact word matches and a leading
+name match before falling back to name order.
+"""
+import os
+import re
+import logging
+import unicodedata
+from typing import List
+
+from pymongo import UpdateOne
+
+from database import db
+
+logger = logging.getLogger(__name__)
+
+SEARCH_FIELDS = ("full_name", "city", "state", "hospital", "membership_number")
+
+DIRECTORY_PAGE_SIZE = int(os.environ.get('DIRECTORY_PAGE_SIZE', '50'))
+DIRECTORY_MAX_PAGE_SIZE = int(os.environ.get('DIRECTORY_MAX_PAGE_SIZE', '500'))
+
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+_NON_WORD = re.compile(r"[^0-9a-z]+")
+
+
+def normalize(text) -> str:
+    """Lowercase, strip accents and reduce punctuation to single spaces"""
+    text = unicodedata.normalize("NFKD", str(text or "")).encode("ascii", "ignore").decode("ascii")
+    return _NON_WORD.sub(" ", text.lower()).strip()
+
+
+def tokenize(text) -> List[str]:
+    return normalize(text).split()
+
+
+def search_fields(doc: dict) -> dict:
+    """The search_keys/search_name fields for a member document"""
+    keys = []
+    for field in SEARCH_FIELDS:
+        keys.extend(tokenize(doc.get(field)))
+        # Membership numbers are also searchable as typed, e.g. "sesi-lm-2025-001"
+        if field == "membership_number" and doc.get(field):
+            keys.append(normalize(doc[field]).replace(" ", ""))
+    return {
+        "search_keys": list(dict.fromkeys(keys)),
+        "search_name": normalize(doc.get("full_name")),
+    }
+
+
+def with_search_fields(doc: dict) -> dict:
+    doc.update(search_fields(doc))
+    return doc
+
+
+def search_match(search: str) -> dict:
+    """Query requiring every word of search to prefix some key"""
+    tokens = tokenize(search)
+    return {"$and": [{"search_keys": {"$regex": f"^{re.escape(token)}"}} for token in tokens]} if tokens else {}
+
+
+def relevance(search: str) -> dict:
+    """$addFields expression scoring a member against search"""
+    tokens = tokenize(search)
+    phrase = " ".join(tokens)
+    return {"$add": [
+        # an exact word beats a prefix of a longer word
+        *[{"$cond": [{"$in": [token, "$search_keys"]}, 2, 1]} for token in tokens],
+        # the name starting with the whole query beats a match elsewhere
+        {"$cond": [{"$eq": [{"$indexOfCP": [{"$ifNull": ["$search_name", ""]}, phrase]}, 0]}, 3, 0]},
+    ]}
+
+
+async def backfill_search_fields() -> int:
+    """Add search fields to members written before they existed"""
+    members = await db.members.find(
+        {"search_keys": {"$exists": False}},
+        {"_id": 1, **{field: 1 for field in SEARCH_FIELDS}}
+    ).to_list(None)
+    if members:
+        await db.members.bulk_write(
+            [UpdateOne({"_id": m["_id"]}, {"$set": search_fields(m)}) for m in members],
+            ordered=False
+        )
+        logger.info(f"Backfilled search fields on {len(members)} members")
+    return len(members)
@@ -0,0 +1,109 @@
+"""
+Atomic membership number allocation
+Numbers have the form SESI-YYYY-XXXX with a sequence that restarts every
+year. Each year has a counter document in the `counters` collection that
+is advanced with a single find_one_and_update($inc), so allocation is O(1)
+and no two approvals - on any worker - can receive the same number. The
+counter is seeded from the highest number already issued the first time
+a year is used, which makes switching over from the old scan safe.
+"""
+import re
+import logging
+from datetime import datetime
+from typing import List, Optional
+
+from pymongo import ReturnDocument
+
+from database import db
+
+logger = logging.getLogger(__name__)
+
+MEMBERSHIP_NUMBER_FORMAT = "SESI-{year}-{seq:04d}"
+
+# Collections whose documents carry issued membership numbers
+_ISSUED_IN = ("membership_applications", "members")
+
+_seeded_years = set()
+
+
+def _counter_id(year: int) -> str:
+    return f"membership_number-{year}"
+
+
+def format_membership_number(year: int, seq: int) -> str:
+    return MEMBERSHIP_NUMBER_FORMAT.format(year=year, seq=seq)
+
+
+def issued_numbers_query(year: int) -> dict:
+    """
+    Documents holding a number issued in year
+    The $type clause lets the planner use the partial membership_number_unique index.
+    """
+    return {"membership_number": {"$type": "string", "$regex": f"^SESI-{year}-"}}
+
+
+async def _highest_issued(year: int) -> int:
+    pattern = re.compile(rf"^SESI-{year}-(\d+)$")
+    highest = 0
+    for collection in _ISSUED_IN:
+        cursor = db[collection].find(issued_numbers_query(year), {"_id": 0, "membership_number": 1})
+        async for doc in cursor:
+            match = pattern.match(doc["membership_number"])
+            if match:
+                highest = max(highest, int(match.group(1)))
+    return highest
+
+
+async def _ensure_seeded(year: int):
+    """
+    Make sure the year's counter starts above every number already issued
+
+    Runs outside any caller's transaction: the seed is idempotent and must
+    not be rolled back together with an aborted approval.
+    """
+    if year in _seeded_years:
+        return
+    counter_id = _counter_id(year)
+    if await db.counters.find_one({"_id": counter_id}, {"_id": 1}) is None:
+        highest = await _highest_issued(year)
+        # $max keeps this safe when several workers seed at once
+        await db.counters.update_one(
+            {"_id": counter_id},
+            {"$max": {"last": highest}, "$setOnInsert": {"year": year}},
+            upsert=True
+        )
+        logger.info(f"Membership numbers for {year} seeded from {highest}")
+    _seeded_years.add(year)
+
+
+async def allocate_membership_numbers(count: int, year: Optional[int] = None, session=None) -> List[str]:
+    """
+    Reserve a block of consecutive membership numbers
+
+    Args:
+        count: how many numbers to reserve (e.g. one per application in a bulk approval)
+        year: membership year (default: current year)
+        session: client session, to allocate inside a transaction
+
+    Returns:
+        The reserved numbers in order
+    """
+    if count < 1:
+        return []
+    year = year or datetime.now().year
+    await _ensure_seeded(year)
+
+    counter = await db.counters.find_one_and_update(
+        {"_id": _counter_id(year)},
+        {"$inc": {"last": count}, "$set": {"updated_at": datetime.utcnow()}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+        session=session
+    )
+    last = counter["last"]
+    return [format_membership_number(year, seq) for seq in range(last - count + 1, last + 1)]
+
+
+async def next_membership_number(year: Optional[int] = None, session=None) -> str:
+    """Reserve the next membership number"""
+    return (await allocate_membership_numbers(1, year=year, session=session))[0]
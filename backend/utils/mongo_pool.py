@@ -0,0 +1,93 @@
+"""
+MongoDB connection pool metrics and warmup
+PoolStats is a CMAP (connection monitoring and pooling) listener registered
+on the client in database.py; it keeps live per-server counters of open,
+checked-out and waiting connections. warm_pool() opens connections at
+startup so the first requests don't pay for connection setup.
+"""
+import asyncio
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import Dict
+
+from pymongo import monitoring
+
+logger = logging.getLogger(__name__)
+
+
+class PoolStats(monitoring.ConnectionPoolListener):
+    """
+    Connection pool counters per server address
+    open, checked_out and waiting are gauges; the other counters only go up.
+    """
+
+    def __init__(self):
+        # pymongo may call listeners from its background threads
+        self._lock = threading.Lock()
+        self._servers: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    def _add(self, event, **deltas):
+        address = "%s:%s" % event.address
+        with self._lock:
+            server = self._servers[address]
+            for name, delta in deltas.items():
+                server[name] += delta
+            server["max_waiting"] = max(server["max_waiting"], server["waiting"])
+
+    def pool_created(self, event):
+        self._add(event, pools_created=1)
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self._add(event, pools_cleared=1)
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self._add(event, created=1, open=1)
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._add(event, closed=1, open=-1)
+
+    def connection_check_out_started(self, event):
+        self._add(event, waiting=1)
+
+    def connection_check_out_failed(self, event):
+        self._add(event, waiting=-1, check_out_failures=1)
+
+    def connection_checked_out(self, event):
+        self._add(event, waiting=-1, checked_out=1, check_outs=1)
+
+    def connection_checked_in(self, event):
+        self._add(event, checked_out=-1)
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {address: dict(counters) for address, counters in self._servers.items()}
+
+
+pool_stats = PoolStats()
+
+
+async def warm_pool(database, connections: int):
+    """Open up to `connections` pooled connections by running concurrent pings"""
+    if connections < 1:
+        return
+    started = time.monotonic()
+    try:
+        await asyncio.gather(*(database.command("ping") for _ in range(connections)))
+    except Exception as e:
+        logger.error(f"MongoDB pool warmup failed: {e}")
+        return
+    open_connections = sum(server.get("open", 0) for server in pool_stats.snapshot().values())
+    logger.info(
+        f"MongoDB pool warmed: {open_connections} connections open in {time.monotonic() - started:.2f}s"
+    )
@@ -0,0 +1,44 @@
+"""
+In-memory copy of the page_seo collection
+The whole collection is tiny and read on every SPA page render, so it is
+loaded at startup and swapped atomically whenever an admin changes it.
+"""
+import logging
+from typing import Dict, List, Optional
+
+from database import db
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_SEO = {
+    "title": "Shoulder & Elbow Society of India",
+    "description": "Official website of SESI",
+    "keywords": "SESI, shoulder, elbow, orthopaedic"
+}
+
+_pages: Optional[Dict[str, dict]] = None
+
+
+async def load_page_seo() -> Dict[str, dict]:
+    """Reload every page's SEO data and swap it in as a whole"""
+    global _pages
+    docs = await db.page_seo.find({}, {"_id": 0}).to_list(None)
+    _pages = {doc["page_name"]: doc for doc in docs}
+    logger.info(f"Page SEO loaded for {len(_pages)} pages")
+    return _pages
+
+
+async def get_pages() -> Dict[str, dict]:
+    if _pages is None:
+        return await load_page_seo()
+    return _pages
+
+
+async def find_page_seo(page_name: str) -> dict:
+    pages = await get_pages()
+    return pages.get(page_name, DEFAULT_PAGE_SEO)
+
+
+async def list_page_seo() -> List[dict]:
+    pages = await get_pages()
+    return list(pages.values())
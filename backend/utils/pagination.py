@@ -0,0 +1,144 @@
+"""
+Keyset (cursor) pagination for admin list endpoints
+Pages are ordered by (sort_field, id) and the opaque cursor carries the
+last (sort value, id) pair, so every page is one bounded index range scan
+no matter how deep the client pages. The first page also reports how many
+documents the whole listing holds.
+Sort fields may mix types (ISO-string dates left over from before
+migrate_dates.py, missing values); MongoDB sorts those by type bracket and
+$lt / $gt never cross brackets, so the cursor query also takes in every
+bracket that sorts after the cursor's.
+"""
+import os
+import re
+import asyncio
+import base64
+import binascii
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from bson import json_util, Decimal128, ObjectId, Regex, Timestamp
+from fastapi import HTTPException, Response
+from pymongo import ASCENDING
+
+from utils.member_search import TOTAL_COUNT_HEADER
+
+ADMIN_PAGE_SIZE = int(os.environ.get('ADMIN_PAGE_SIZE', '500'))
+ADMIN_MAX_PAGE_SIZE = int(os.environ.get('ADMIN_MAX_PAGE_SIZE', '1000'))
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(sort_value, last_id: str) -> str:
+    raw = json_util.dumps([sort_value, last_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[object, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_value, last_id = json_util.loads(raw)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return sort_value, last_id
+
+
+# MongoDB's sort order type brackets, lowest first: ($type aliases, Python types decoded into them)
+_TYPE_BRACKETS = [
+    (["null"], (type(None),)),
+    (["number"], (int, float, Decimal128)),
+    (["string", "symbol"], (str,)),
+    (["object"], (dict,)),
+    (["array"], (list,)),
+    (["binData"], (bytes,)),
+    (["objectId"], (ObjectId,)),
+    (["bool"], (bool,)),
+    (["date"], (datetime,)),
+    (["timestamp"], (Timestamp,)),
+    (["regex"], (Regex, re.Pattern)),
+]
+_BOOL_BRACKET = [aliases for aliases, _ in _TYPE_BRACKETS].index(["bool"])
+
+
+def _type_bracket(value) -> int:
+    # bool is checked first as it is also an int in Python
+    if isinstance(value, bool):
+        return _BOOL_BRACKET
+    for bracket, (_, types) in enumerate(_TYPE_BRACKETS):
+        if isinstance(value, types):
+            return bracket
+    raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _in_brackets(sort_field: str, brackets) -> List[dict]:
+    """Clauses matching sort_field values in any of the brackets; null also matches missing fields"""
+    aliases = [alias for bracket, _ in brackets for alias in bracket if alias != "null"]
+    clauses = [{sort_field: {"$type": aliases}}] if aliases else []
+    if brackets and brackets[0][0] == ["null"]:
+        clauses.append({sort_field: None})
+    return clauses
+
+
+def keyset_query(query: dict, sort_field: str, direction: int, sort_value, last_id: str) -> dict:
+    """query restricted to the documents after (sort_value, last_id) in page order"""
+    op = "$gt" if direction == ASCENDING else "$lt"
+    bracket = _type_bracket(sort_value)
+    later = _TYPE_BRACKETS[bracket + 1:] if direction == ASCENDING else _TYPE_BRACKETS[:bracket]
+    after = {"$or": [
+        {sort_field: {op: sort_value}},
+        {sort_field: sort_value, "id": {op: last_id}},
+        *_in_brackets(sort_field, later)
+    ]}
+    return {"$and": [query, after]} if query else after
+
+
+async def paginate(
+    collection,
+    query: dict,
+    sort_field: str,
+    direction: int = ASCENDING,
+    cursor: Optional[str] = None,
+    limit: int = ADMIN_PAGE_SIZE,
+    projection: Optional[dict] = None
+) -> Tuple[List[dict], Optional[str]]:
+    """
+    Fetch one page of documents
+
+    Returns:
+        (documents, cursor for the next page or None on the last page)
+    """
+    if cursor:
+        sort_value, last_id = decode_cursor(cursor)
+        query = keyset_query(query, sort_field, direction, sort_value, last_id)
+
+    docs = await collection.find(query, projection or {"_id": 0}) \
+        .sort([(sort_field, direction), ("id", direction)]) \
+        .limit(limit + 1) \
+        .to_list(limit + 1)
+
+    if len(docs) > limit:
+        docs = docs[:limit]
+        last = docs[-1]
+        return docs, encode_cursor(last.get(sort_field), last["id"])
+    return docs, None
+
+
+async def paginated_response(response: Response, collection, query: dict, sort_field: str,
+                             direction: int = ASCENDING, cursor: Optional[str] = None,
+                             limit: int = ADMIN_PAGE_SIZE, projection: Optional[dict] = None) -> List[dict]:
+    """
+    Fetch one page for a list endpoint
+    The next page's cursor goes in the X-Next-Cursor header and, on the
+    first page, the number of matching documents in X-Total-Count.
+    """
+    page = paginate(collection, query, sort_field, direction, cursor, limit, projection)
+    if cursor:
+        docs, next_cursor = await page
+    else:
+        # An unfiltered listing is counted from the collection metadata instead of a scan
+        count = collection.count_documents(query) if query else collection.estimated_document_count()
+        (docs, next_cursor), total = await asyncio.gather(page, count)
+        response.headers[TOTAL_COUNT_HEADER] = str(total)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return docs
@@ -0,0 +1,198 @@
+"""
+MongoDB command monitoring with per-route query statistics
+QueryStats is a pymongo CommandListener registered on the client in
+database.py. The track_queries middleware gives every request a
+RequestQueries collector through a context variable (Motor carries
+context variables into its executor threads), so each command is
+attributed to the route that issued it. Slow commands are logged with
+their filter shape - field names and operators with every value replaced
+by "?" - and a request that repeats the same query shape many times is
+logged as a likely N+1 pattern.
+"""
+import os
+import logging
+import threading
+from collections import Counter, defaultdict
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from pymongo import monitoring
+
+logger = logging.getLogger(__name__)
+
+SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', '100'))
+N_PLUS_ONE_THRESHOLD = int(os.environ.get('N_PLUS_ONE_THRESHOLD', '10'))
+
+BACKGROUND_ROUTE = "background"
+
+# Where each command keeps the filter worth showing
+_FILTER_FIELDS = {
+    "find": "filter",
+    "count": "query",
+    "distinct": "query",
+    "findAndModify": "query",
+}
+_STATEMENT_FIELDS = {
+    "update": ("updates", "q"),
+    "delete": ("deletes", "q"),
+}
+# Handshake, auth and session housekeeping aren't interesting queries
+_IGNORED_COMMANDS = {
+    "hello", "ismaster", "isMaster", "ping", "saslStart", "saslContinue",
+    "endSessions", "buildInfo", "getLastError", "killCursors",
+}
+
+
+def shape(value):
+    """Sanitize a filter: keep keys and operators, replace values with "?" """
+    if isinstance(value, dict):
+        return {key: shape(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        # Lists of conditions ($and/$or) keep their structure, lists of values collapse
+        if value and all(isinstance(item, dict) for item in value):
+            return [shape(item) for item in value]
+        return ["?"]
+    return "?"
+
+
+def command_collection(command_name: str, command: dict) -> Optional[str]:
+    if command_name == "getMore":
+        return command.get("collection")
+    target = command.get(command_name)
+    return target if isinstance(target, str) else None
+
+
+def command_shape(command_name: str, command: dict):
+    if command_name in _FILTER_FIELDS:
+        return shape(command.get(_FILTER_FIELDS[command_name]) or {})
+    if command_name in _STATEMENT_FIELDS:
+        field, key = _STATEMENT_FIELDS[command_name]
+        statements = command.get(field) or [{}]
+        return shape(statements[0].get(key) or {})
+    if command_name == "aggregate":
+        return [
+            {name: shape(body) if name == "$match" else "..." for name, body in stage.items()}
+            for stage in command.get("pipeline") or []
+        ]
+    return None
+
+
+class RequestQueries:
+    """Commands issued while handling one request"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.count = 0
+        self.db_ms = 0.0
+        self.repeats: Counter = Counter()
+
+    def add(self, key: Tuple[str, Optional[str], str], duration_ms: float):
+        with self.lock:
+            self.count += 1
+            self.db_ms += duration_ms
+            self.repeats[key] += 1
+
+
+_request_queries: ContextVar[Optional[RequestQueries]] = ContextVar("request_queries", default=None)
+
+
+class QueryStats(monitoring.CommandListener):
+    """Per-route query counts and DB time"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._started: Dict[Tuple, Tuple[Optional[RequestQueries], str, Optional[str], str]] = {}
+        self._routes: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+
+    # ---------- command events (called from the driver's threads) ----------
+
+    def started(self, event):
+        if event.command_name in _IGNORED_COMMANDS:
+            return
+        collection = command_collection(event.command_name, event.command)
+        described = repr(command_shape(event.command_name, event.command))
+        with self._lock:
+            self._started[(event.connection_id, event.request_id)] = (
+                _request_queries.get(), event.command_name, collection, described
+            )
+
+    def _finished(self, event, failed: bool):
+        with self._lock:
+            started = self._started.pop((event.connection_id, event.request_id), None)
+        if started is None:
+            return
+        queries, command_name, collection, described = started
+        duration_ms = event.duration_micros / 1000
+
+        if queries is not None:
+            queries.add((command_name, collection, described), duration_ms)
+        else:
+            self._record(BACKGROUND_ROUTE, 1, duration_ms)
+
+        if duration_ms >= SLOW_QUERY_MS:
+            logger.warning(
+                f"Slow query {duration_ms:.1f}ms: {command_name} {collection} {described}"
+                + (" (failed)" if failed else "")
+            )
+
+    def succeeded(self, event):
+        self._finished(event, failed=False)
+
+    def failed(self, event):
+        self._finished(event, failed=True)
+
+    # ---------- request attribution ----------
+
+    def begin_request(self):
+        return _request_queries.set(RequestQueries())
+
+    def end_request(self, token, route: str):
+        queries = _request_queries.get()
+        _request_queries.reset(token)
+        if queries is None:
+            return
+        n_plus_one = 0
+        for (command_name, collection, described), repeats in queries.repeats.items():
+            if repeats >= N_PLUS_ONE_THRESHOLD:
+                n_plus_one += 1
+                logger.warning(
+                    f"Possible N+1 in {route}: {repeats}x {command_name} {collection} {described}"
+                )
+        self._record(route, queries.count, queries.db_ms, requests=1, n_plus_one=n_plus_one)
+
+    def _record(self, route: str, queries: int, db_ms: float, requests: int = 0, n_plus_one: int = 0):
+        with self._lock:
+            stats = self._routes[route]
+            stats["requests"] += requests
+            stats["queries"] += queries
+            stats["db_ms"] += db_ms
+            stats["max_queries"] = max(stats["max_queries"], queries)
+            stats["n_plus_one"] += n_plus_one
+
+    def snapshot(self) -> List[dict]:
+        """Routes by total DB time, busiest first"""
+        with self._lock:
+            routes = {route: dict(stats) for route, stats in self._routes.items()}
+        return sorted(
+            (
+                {
+                    "route": route,
+                    "requests": int(stats["requests"]),
+                    "queries": int(stats["queries"]),
+                    "queries_per_request": round(stats["queries"] / stats["requests"], 2) if stats["requests"] else None,
+                    "max_queries": int(stats["max_queries"]),
+                    "db_ms": round(stats["db_ms"], 1),
+                    "n_plus_one_warnings": int(stats["n_plus_one"]),
+                }
+                for route, stats in routes.items()
+            ),
+            key=lambda row: row["db_ms"],
+            reverse=True
+        )
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+
+
+query_stats = QueryStats()
@@ -0,0 +1,117 @@
+"""
+Static JSON snapshots of read-mostly public data
+When enabled, every admin write regenerates the affected snapshot files
+(plain and pre-gzipped) so they can be served straight from disk by the
+/api/snapshots static mount without touching Python handlers or MongoDB.
+The frontend reads unfiltered lists from these files when built with
+REACT_APP_SNAPSHOTS_ENABLED=true (and falls back to the routes otherwise).
+"""
+import os
+import gzip
+import json
+import asyncio
+import logging
+import tempfile
+from pathlib import Path
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.staticfiles import StaticFiles
+from pydantic import TypeAdapter
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+
+from models.models import CommitteeMember, EventSummary, NewsSummary, Publication
+from routers.public import (
+    load_albums, load_committee_members, load_events, load_news, load_publications
+)
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOTS_ENABLED = os.environ.get('SNAPSHOTS_ENABLED', 'false').lower() == 'true'
+SNAPSHOT_DIR = Path(os.environ.get('SNAPSHOT_DIR', Path(__file__).resolve().parent.parent / "snapshots"))
+SNAPSHOT_LIMIT = int(os.environ.get('SNAPSHOT_LIMIT', '100'))
+
+# name -> (cache tag, loader, response model)
+SNAPSHOTS = {
+    "events": ("events", lambda: load_events(limit=SNAPSHOT_LIMIT), List[EventSummary]),
+    "events-upcoming": ("events", lambda: load_events(status="upcoming", limit=SNAPSHOT_LIMIT), List[EventSummary]),
+    "news": ("news", lambda: load_news(limit=SNAPSHOT_LIMIT), List[NewsSummary]),
+    "committee": ("committee", lambda: load_committee_members(), List[CommitteeMember]),
+    "publications": ("publications", lambda: load_publications(limit=SNAPSHOT_LIMIT), List[Publication]),
+    "gallery-albums": ("gallery", lambda: load_albums(), None),
+}
+
+
+def serialize(docs, model) -> bytes:
+    """Serialize documents the same way the matching public route would"""
+    if model is not None:
+        adapter = TypeAdapter(model)
+        data = adapter.dump_python(adapter.validate_python(docs), mode="json")
+    else:
+        data = jsonable_encoder(docs)
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def write_atomic(path: Path, content: bytes):
+    """Write to a temp file in the same directory, then rename over the target"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def write_snapshot(name: str, body: bytes):
+    # The .gz is written first so it is never older than the plain file
+    write_atomic(SNAPSHOT_DIR / f"{name}.json.gz", gzip.compress(body, compresslevel=9))
+    write_atomic(SNAPSHOT_DIR / f"{name}.json", body)
+
+
+async def publish_snapshot(name: str):
+    _, loader, model = SNAPSHOTS[name]
+    body = serialize(await loader(), model)
+    await asyncio.to_thread(write_snapshot, name, body)
+
+
+async def publish_snapshots(*tags: str):
+    """Regenerate every snapshot derived from the given cache tags"""
+    if not SNAPSHOTS_ENABLED:
+        return
+    for name, (tag, _, _) in SNAPSHOTS.items():
+        if tag in tags:
+            try:
+                await publish_snapshot(name)
+            except Exception as e:
+                logger.error(f"Failed to publish snapshot {name}: {e}")
+
+
+async def publish_all_snapshots():
+    await publish_snapshots(*{tag for tag, _, _ in SNAPSHOTS.values()})
+
+
+class SnapshotFiles(StaticFiles):
+    """StaticFiles that serves the pre-gzipped variant to clients accepting gzip"""
+
+    async def get_response(self, path: str, scope):
+        if path.endswith(".json") and "gzip" in Headers(scope=scope).get("accept-encoding", ""):
+            try:
+                response = await super().get_response(f"{path}.gz", scope)
+            except HTTPException:
+                response = None
+            if response is not None and response.status_code in (200, 304):
+                response.headers["Content-Type"] = "application/json"
+                response.headers["Content-Encoding"] = "gzip"
+                response.headers["Vary"] = "Accept-Encoding"
+                return response
+
+        response = await super().get_response(path, scope)
+        response.headers["Vary"] = "Accept-Encoding"
+        return response
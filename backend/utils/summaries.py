@@ -0,0 +1,63 @@
+"""
+Excerpts and summary projections for public list endpoints
+List views only need a title, a short excerpt, an image and dates, so the
+list routes project just the summary model's fields instead of shipping
+full bodies and SEO fields. The excerpt is computed once on write;
+documents written before that fall back to a server-side $substrCP.
+"""
+import os
+import re
+from typing import Type
+
+from pydantic import BaseModel
+
+EXCERPT_LENGTH = int(os.environ.get('EXCERPT_LENGTH', '200'))
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def make_excerpt(text: str, length: int = EXCERPT_LENGTH) -> str:
+    """Collapse whitespace and cut text at the last word boundary before length"""
+    text = _WHITESPACE.sub(" ", text or "").strip()
+    if len(text) <= length:
+        return text
+    cut = text[:length]
+    if " " in cut:
+        cut = cut.rsplit(" ", 1)[0]
+    return cut.rstrip(" ,;:.-")
+
+
+def excerpt_fields(excerpt, text: str) -> dict:
+    """excerpt and excerpt_auto for a new document: the given excerpt, or one derived from text"""
+    if excerpt:
+        return {"excerpt": excerpt, "excerpt_auto": False}
+    return {"excerpt": make_excerpt(text), "excerpt_auto": True}
+
+
+def excerpt_update(excerpt, text: str) -> dict:
+    """
+    Pipeline-update $set expressions for excerpt and excerpt_auto
+
+    A derived excerpt that comes back unchanged from the edit form follows
+    the new text; an excerpt the editor actually wrote is kept.
+    """
+    derived = make_excerpt(text)
+    if not excerpt:
+        return {"excerpt": {"$literal": derived}, "excerpt_auto": True}
+    unchanged_auto = {"$and": [
+        {"$eq": ["$excerpt_auto", True]},
+        {"$eq": ["$excerpt", {"$literal": excerpt}]}
+    ]}
+    return {
+        "excerpt": {"$cond": [unchanged_auto, {"$literal": derived}, {"$literal": excerpt}]},
+        "excerpt_auto": unchanged_auto
+    }
+
+
+def summary_projection(model: Type[BaseModel], source_field: str) -> dict:
+    """find() projection for the model's fields, with a fallback excerpt"""
+    projection = {"_id": 0, **{field: 1 for field in model.model_fields if field != "excerpt"}}
+    projection["excerpt"] = {
+        "$ifNull": ["$excerpt", {"$substrCP": [f"${source_field}", 0, EXCERPT_LENGTH]}]
+    }
+    return projection
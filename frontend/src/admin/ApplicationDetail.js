@@ -47,7 +47,7 @@ const ApplicationDetail = () => {
       const response = await adminAPI.updateApplicationStatus(id, newStatus, adminNotes);
       
       if (newStatus === 'approved' && response.data.membership_number) {
-        alert(`✅ Application Approved!\n\nMembership Number: ${response.data.membership_number}\n\nCertificate generated and sent to member via email.`);
+        alert(`✅ Application Approved!\n\nMembership Number: ${response.data.membership_number}\n\nThe certificate is being generated and will be emailed to the member.`);
       } else {
         alert(`Application ${newStatus} successfully!`);
       }
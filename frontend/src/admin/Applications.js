@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { Link, useNavigate } from 'react-router-dom';
-import { adminAPI } from '../utils/api';
+import { adminAPI, readPage, countRows, ADMIN_PAGE_SIZE } from '../utils/api';
 import AdminLayout from './AdminLayout';
 
 const Applications = () => {
@@ -8,6 +8,9 @@ const Applications = () => {
   const [applications, setApplications] = useState([]);
   const [filteredApps, setFilteredApps] = useState([]);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [stats, setStats] = useState({});
   const [statusFilter, setStatusFilter] = useState('all');
   const [searchTerm, setSearchTerm] = useState('');
 
@@ -18,16 +21,26 @@ const Applications = () => {
       return;
     }
     fetchApplications();
-  }, [navigate]);
+  }, [navigate, statusFilter]);
 
   useEffect(() => {
     filterApplications();
-  }, [applications, statusFilter, searchTerm]);
+  }, [applications, searchTerm]);
 
+  const statusParams = (status) => (status === 'all' ? {} : { status });
+
+  // The status filter runs on the server; the counts come from the first page of each status
   const fetchApplications = async () => {
     try {
-      const response = await adminAPI.getApplications();
-      setApplications(response.data);
+      const statuses = ['all', 'submitted', 'under_review', 'approved', 'rejected'];
+      const [response, ...totals] = await Promise.all([
+        adminAPI.getApplications({ ...statusParams(statusFilter), limit: ADMIN_PAGE_SIZE }),
+        ...statuses.map(status => countRows(adminAPI.getApplications, statusParams(status))),
+      ]);
+      const page = readPage(response);
+      setApplications(page.items);
+      setNextCursor(page.cursor);
+      setStats(Object.fromEntries(statuses.map((status, i) => [status, totals[i]])));
     } catch (error) {
       console.error('Error fetching applications:', error);
       if (error.response?.status === 401) {
@@ -39,13 +52,25 @@ const Applications = () => {
     }
   };
 
+  const loadMore = async () => {
+    setLoadingMore(true);
+    try {
+      const page = readPage(await adminAPI.getApplications({
+        ...statusParams(statusFilter), limit: ADMIN_PAGE_SIZE, cursor: nextCursor
+      }));
+      setApplications([...applications, ...page.items]);
+      setNextCursor(page.cursor);
+    } catch (error) {
+      console.error('Error fetching applications:', error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  // Search runs over the applications loaded so far
   const filterApplications = () => {
     let filtered = applications;
 
-    if (statusFilter !== 'all') {
-      filtered = filtered.filter(app => app.status === statusFilter);
-    }
-
     if (searchTerm) {
       filtered = filtered.filter(app =>
         app.full_name.toLowerCase().includes(searchTerm.toLowerCase()) ||
@@ -67,14 +92,6 @@ const Applications = () => {
     return badges[status] || badges.submitted;
   };
 
-  const stats = {
-    total: applications.length,
-    submitted: applications.filter(a => a.status === 'submitted').length,
-    under_review: applications.filter(a => a.status === 'under_review').length,
-    approved: applications.filter(a => a.status === 'approved').length,
-    rejected: applications.filter(a => a.status === 'rejected').length,
-  };
-
   if (loading) {
     return (
       <AdminLayout>
@@ -101,7 +118,7 @@ const Applications = () => {
               statusFilter === 'all' ? 'border-teal-500 bg-teal-50' : 'border-gray-200 hover:border-gray-300'
             }`}
           >
-            <p className="text-2xl font-bold text-gray-900">{stats.total}</p>
+            <p className="text-2xl font-bold text-gray-900">{stats.all ?? 0}</p>
             <p className="text-sm text-gray-600">Total</p>
           </button>
           <button
@@ -110,7 +127,7 @@ const Applications = () => {
               statusFilter === 'submitted' ? 'border-yellow-500 bg-yellow-50' : 'border-gray-200 hover:border-gray-300'
             }`}
           >
-            <p className="text-2xl font-bold text-yellow-600">{stats.submitted}</p>
+            <p className="text-2xl font-bold text-yellow-600">{stats.submitted ?? 0}</p>
             <p className="text-sm text-gray-600">Submitted</p>
           </button>
           <button
@@ -119,7 +136,7 @@ const Applications = () => {
               statusFilter === 'under_review' ? 'border-blue-500 bg-blue-50' : 'border-gray-200 hover:border-gray-300'
             }`}
           >
-            <p className="text-2xl font-bold text-blue-600">{stats.under_review}</p>
+            <p className="text-2xl font-bold text-blue-600">{stats.under_review ?? 0}</p>
             <p className="text-sm text-gray-600">Under Review</p>
           </button>
           <button
@@ -128,7 +145,7 @@ const Applications = () => {
               statusFilter === 'approved' ? 'border-green-500 bg-green-50' : 'border-gray-200 hover:border-gray-300'
             }`}
           >
-            <p className="text-2xl font-bold text-green-600">{stats.approved}</p>
+            <p className="text-2xl font-bold text-green-600">{stats.approved ?? 0}</p>
             <p className="text-sm text-gray-600">Approved</p>
           </button>
           <button
@@ -137,7 +154,7 @@ const Applications = () => {
               statusFilter === 'rejected' ? 'border-red-500 bg-red-50' : 'border-gray-200 hover:border-gray-300'
             }`}
           >
-            <p className="text-2xl font-bold text-red-600">{stats.rejected}</p>
+            <p className="text-2xl font-bold text-red-600">{stats.rejected ?? 0}</p>
             <p className="text-sm text-gray-600">Rejected</p>
           </button>
         </div>
@@ -227,6 +244,19 @@ const Applications = () => {
             </div>
           )}
         </div>
+
+        {nextCursor && (
+          <div className="text-center">
+            <button
+              onClick={loadMore}
+              disabled={loadingMore}
+              className="bg-teal-600 hover:bg-teal-700 disabled:opacity-60 text-white px-8 py-3 rounded-lg font-medium transition"
+              data-testid="applications-load-more"
+            >
+              {loadingMore ? 'Loading...' : 'Load more applications'}
+            </button>
+          </div>
+        )}
       </div>
     </AdminLayout>
   );
@@ -22,7 +22,7 @@ const Dashboard = () => {
     try {
       const [statsRes, appsRes] = await Promise.all([
         adminAPI.getDashboardStats(),
-        adminAPI.getApplications({ status: 'submitted' })
+        adminAPI.getApplications({ status: 'submitted', limit: 10 })
       ]);
       setStats(statsRes.data);
       setApplications(appsRes.data.slice(0, 10));
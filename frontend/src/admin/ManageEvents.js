@@ -1,12 +1,15 @@
 import React, { useState, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
-import { adminAPI } from '../utils/api';
+import { adminAPI, readPage, countRows, ADMIN_PAGE_SIZE } from '../utils/api';
 import AdminLayout from './AdminLayout';
 
 const ManageEvents = () => {
   const navigate = useNavigate();
   const [events, setEvents] = useState([]);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [counts, setCounts] = useState({});
   const [showForm, setShowForm] = useState(false);
   const [editingEvent, setEditingEvent] = useState(null);
   const [filterStatus, setFilterStatus] = useState('all');
@@ -32,12 +35,22 @@ const ManageEvents = () => {
       return;
     }
     fetchEvents();
-  }, [navigate]);
+  }, [navigate, filterStatus]);
 
+  const statusParams = (status) => (status === 'all' ? {} : { status });
+
+  // The status filter runs on the server; the counts come from the first page of each status
   const fetchEvents = async () => {
     try {
-      const response = await adminAPI.getEvents();
-      setEvents(response.data);
+      const statuses = ['all', ...statusOptions];
+      const [response, ...totals] = await Promise.all([
+        adminAPI.getEvents({ ...statusParams(filterStatus), limit: ADMIN_PAGE_SIZE }),
+        ...statuses.map(status => countRows(adminAPI.getEvents, statusParams(status))),
+      ]);
+      const page = readPage(response);
+      setEvents(page.items);
+      setNextCursor(page.cursor);
+      setCounts(Object.fromEntries(statuses.map((status, i) => [status, totals[i]])));
     } catch (error) {
       console.error('Error fetching events:', error);
       if (error.response?.status === 401) {
@@ -49,6 +62,21 @@ const ManageEvents = () => {
     }
   };
 
+  const loadMore = async () => {
+    setLoadingMore(true);
+    try {
+      const page = readPage(await adminAPI.getEvents({
+        ...statusParams(filterStatus), limit: ADMIN_PAGE_SIZE, cursor: nextCursor
+      }));
+      setEvents([...events, ...page.items]);
+      setNextCursor(page.cursor);
+    } catch (error) {
+      console.error('Error fetching events:', error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleSubmit = async (e) => {
     e.preventDefault();
     try {
@@ -115,10 +143,6 @@ const ManageEvents = () => {
     });
   };
 
-  const filteredEvents = filterStatus === 'all' 
-    ? events 
-    : events.filter(e => e.status === filterStatus);
-
   const getStatusColor = (status) => {
     switch (status) {
       case 'upcoming': return 'bg-blue-100 text-blue-700';
@@ -171,13 +195,13 @@ const ManageEvents = () => {
               }`}
               data-testid={`filter-${status}`}
             >
-              {status === 'all' ? 'All Events' : status} ({status === 'all' ? events.length : events.filter(e => e.status === status).length})
+              {status === 'all' ? 'All Events' : status} ({counts[status] ?? 0})
             </button>
           ))}
         </div>
 
         {/* Events List */}
-        {filteredEvents.length === 0 ? (
+        {events.length === 0 ? (
           <div className="bg-white rounded-xl shadow-lg p-12 text-center">
             <svg className="w-16 h-16 mx-auto mb-4 text-gray-300" fill="none" stroke="currentColor" viewBox="0 0 24 24">
               <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M8 7V3m8 4V3m-9 8h10M5 21h14a2 2 0 002-2V7a2 2 0 00-2-2H5a2 2 0 00-2 2v12a2 2 0 002 2z" />
@@ -186,7 +210,7 @@ const ManageEvents = () => {
           </div>
         ) : (
           <div className="grid gap-4" data-testid="events-list">
-            {filteredEvents.map((event) => (
+            {events.map((event) => (
               <div key={event.id} className="bg-white rounded-xl shadow-lg p-6 hover:shadow-xl transition">
                 <div className="flex justify-between items-start">
                   <div className="flex-1">
@@ -244,6 +268,19 @@ const ManageEvents = () => {
           </div>
         )}
 
+        {nextCursor && (
+          <div className="text-center">
+            <button
+              onClick={loadMore}
+              disabled={loadingMore}
+              className="bg-teal-600 hover:bg-teal-700 disabled:opacity-60 text-white px-8 py-3 rounded-lg font-medium transition"
+              data-testid="events-load-more"
+            >
+              {loadingMore ? 'Loading...' : 'Load more events'}
+            </button>
+          </div>
+        )}
+
         {/* Add/Edit Form Modal */}
         {showForm && (
           <div className="fixed inset-0 bg-black/50 flex items-center justify-center z-50">
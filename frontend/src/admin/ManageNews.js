@@ -1,12 +1,16 @@
 import React, { useState, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
-import { adminAPI } from '../utils/api';
+import { adminAPI, readPage, countRows, ADMIN_PAGE_SIZE } from '../utils/api';
 import AdminLayout from './AdminLayout';
 
 const ManageNews = () => {
   const navigate = useNavigate();
   const [news, setNews] = useState([]);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [total, setTotal] = useState(0);
+  const [publishedTotal, setPublishedTotal] = useState(0);
   const [showForm, setShowForm] = useState(false);
   const [editingNews, setEditingNews] = useState(null);
   const [formData, setFormData] = useState({
@@ -31,8 +35,15 @@ const ManageNews = () => {
 
   const fetchNews = async () => {
     try {
-      const response = await adminAPI.getNews();
-      setNews(response.data);
+      const [response, published] = await Promise.all([
+        adminAPI.getNews({ limit: ADMIN_PAGE_SIZE }),
+        countRows(adminAPI.getNews, { is_published: true }),
+      ]);
+      const page = readPage(response);
+      setNews(page.items);
+      setNextCursor(page.cursor);
+      setTotal(page.total);
+      setPublishedTotal(published);
     } catch (error) {
       console.error('Error fetching news:', error);
       if (error.response?.status === 401) {
@@ -44,6 +55,19 @@ const ManageNews = () => {
     }
   };
 
+  const loadMore = async () => {
+    setLoadingMore(true);
+    try {
+      const page = readPage(await adminAPI.getNews({ limit: ADMIN_PAGE_SIZE, cursor: nextCursor }));
+      setNews([...news, ...page.items]);
+      setNextCursor(page.cursor);
+    } catch (error) {
+      console.error('Error fetching news:', error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleSubmit = async (e) => {
     e.preventDefault();
     try {
@@ -131,11 +155,11 @@ const ManageNews = () => {
         {/* Stats */}
         <div className="grid grid-cols-2 gap-6">
           <div className="bg-white rounded-xl shadow-lg p-6">
-            <p className="text-3xl font-bold text-teal-600">{news.length}</p>
+            <p className="text-3xl font-bold text-teal-600">{total}</p>
             <p className="text-sm text-gray-600 mt-1">Total Articles</p>
           </div>
           <div className="bg-white rounded-xl shadow-lg p-6">
-            <p className="text-3xl font-bold text-green-600">{news.filter(n => n.is_published).length}</p>
+            <p className="text-3xl font-bold text-green-600">{publishedTotal}</p>
             <p className="text-sm text-gray-600 mt-1">Published</p>
           </div>
         </div>
@@ -204,6 +228,19 @@ const ManageNews = () => {
           </div>
         )}
 
+        {nextCursor && (
+          <div className="text-center">
+            <button
+              onClick={loadMore}
+              disabled={loadingMore}
+              className="bg-teal-600 hover:bg-teal-700 disabled:opacity-60 text-white px-8 py-3 rounded-lg font-medium transition"
+              data-testid="news-load-more"
+            >
+              {loadingMore ? 'Loading...' : 'Load more articles'}
+            </button>
+          </div>
+        )}
+
         {/* Add/Edit Form Modal */}
         {showForm && (
           <div className="fixed inset-0 bg-black/50 flex items-center justify-center z-50">
@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
-import { adminAPI } from '../utils/api';
+import { adminAPI, readPage, ADMIN_PAGE_SIZE } from '../utils/api';
 import AdminLayout from './AdminLayout';
 
 const Members = () => {
@@ -8,6 +8,9 @@ const Members = () => {
   const [members, setMembers] = useState([]);
   const [filteredMembers, setFilteredMembers] = useState([]);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [total, setTotal] = useState(0);
   const [searchTerm, setSearchTerm] = useState('');
   const [expandedMember, setExpandedMember] = useState(null);
   const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
@@ -27,8 +30,10 @@ const Members = () => {
 
   const fetchMembers = async () => {
     try {
-      const response = await adminAPI.getMembers();
-      setMembers(response.data);
+      const page = readPage(await adminAPI.getMembers({ limit: ADMIN_PAGE_SIZE }));
+      setMembers(page.items);
+      setNextCursor(page.cursor);
+      setTotal(page.total);
     } catch (error) {
       console.error('Error fetching members:', error);
       if (error.response?.status === 401) {
@@ -40,6 +45,20 @@ const Members = () => {
     }
   };
 
+  const loadMore = async () => {
+    setLoadingMore(true);
+    try {
+      const page = readPage(await adminAPI.getMembers({ limit: ADMIN_PAGE_SIZE, cursor: nextCursor }));
+      setMembers([...members, ...page.items]);
+      setNextCursor(page.cursor);
+    } catch (error) {
+      console.error('Error fetching members:', error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  // Search runs over the members loaded so far
   const filterMembers = () => {
     let filtered = members;
 
@@ -82,7 +101,7 @@ const Members = () => {
         <div className="bg-gradient-to-r from-amber-600 to-orange-600 rounded-xl p-6 text-white">
           <div className="flex items-center justify-between">
             <div>
-              <p className="text-4xl font-bold">{members.length}</p>
+              <p className="text-4xl font-bold">{total}</p>
               <p className="text-white/80 mt-1">Total Life Members</p>
             </div>
             <div className="w-16 h-16 bg-white/20 rounded-full flex items-center justify-center">
@@ -252,6 +271,20 @@ const Members = () => {
             ))}
           </div>
         )}
+
+        {nextCursor && (
+          <div className="text-center">
+            <p className="text-sm text-gray-500 mb-3">Showing {members.length} of {total} members</p>
+            <button
+              onClick={loadMore}
+              disabled={loadingMore}
+              className="bg-amber-600 hover:bg-amber-700 disabled:opacity-60 text-white px-8 py-3 rounded-lg font-medium transition"
+              data-testid="members-load-more"
+            >
+              {loadingMore ? 'Loading...' : 'Load more members'}
+            </button>
+          </div>
+        )}
       </div>
     </AdminLayout>
   );
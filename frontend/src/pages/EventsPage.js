@@ -118,7 +118,7 @@ const EventsPage = () => {
                       </span>
                     </div>
                     <h2 className="text-2xl font-bold text-gray-900 mb-3">{event.title}</h2>
-                    <p className="text-gray-600 mb-4 line-clamp-2">{event.description}</p>
+                    <p className="text-gray-600 mb-4 line-clamp-2">{event.excerpt}</p>
                     
                     <div className="flex flex-wrap items-center gap-6 text-sm text-gray-500">
                       {event.venue && (
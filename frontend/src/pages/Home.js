@@ -58,16 +58,17 @@ const Home = () => {
   useEffect(() => {
     const fetchData = async () => {
       try {
-        const [committeeRes, newsRes, eventsRes, albumsRes] = await Promise.all([
-          publicAPI.getCommittee({ year: 2025 }),
-          publicAPI.getNews({ limit: 4 }),
-          publicAPI.getEvents({ status: 'upcoming', limit: 6 }),
-          publicAPI.getAlbums(),
-        ]);
-        setCommittee(committeeRes.data);
-        setNews(newsRes.data);
-        setEvents(eventsRes.data);
-        setAlbums(albumsRes.data?.slice(0, 4) || []);
+        const { data } = await publicAPI.getHome({
+          committee_year: 2025,
+          events_status: 'upcoming',
+          events_limit: 6,
+          news_limit: 4,
+          albums_limit: 4,
+        });
+        setCommittee(data.committee);
+        setNews(data.news);
+        setEvents(data.events);
+        setAlbums(data.albums || []);
       } catch (error) {
         console.error('Error fetching data:', error);
       } finally {
@@ -384,7 +385,7 @@ const Home = () => {
                         {item.category || 'News'}
                       </span>
                       <h3 className="font-bold text-gray-900 mt-3 mb-2">{item.title}</h3>
-                      <p className="text-gray-600 text-sm line-clamp-2">{item.excerpt || item.content.substring(0, 120)}...</p>
+                      <p className="text-gray-600 text-sm line-clamp-2">{item.excerpt}...</p>
                       <p className="text-xs text-gray-400 mt-3">
                         {new Date(item.published_date).toLocaleDateString('en-IN', { day: 'numeric', month: 'short', year: 'numeric' })}
                       </p>
@@ -3,42 +3,66 @@ import { publicAPI } from '../utils/api';
 
 const MembersDirectory = () => {
   const [members, setMembers] = useState([]);
+  const [total, setTotal] = useState(0);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [searchTerm, setSearchTerm] = useState('');
   const [expandedMember, setExpandedMember] = useState(null);
   const [filterState, setFilterState] = useState('');
-  const [states, setStates] = useState([]);
+  const [filterCity, setFilterCity] = useState('');
+  const [facets, setFacets] = useState({ states: [], cities: [] });
   const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
+  const PAGE_SIZE = 50;
 
+  // Filter options with member counts; cities are for the selected state
   useEffect(() => {
-    const fetchData = async () => {
+    publicAPI.getMemberFacets(filterState ? { state: filterState } : {})
+      .then(res => setFacets(res.data))
+      .catch(error => console.error('Error fetching filters:', error));
+  }, [filterState]);
+
+  const fetchMembers = async (offset) => {
+    const params = { limit: PAGE_SIZE, offset };
+    if (searchTerm.trim()) params.search = searchTerm.trim();
+    if (filterState) params.state = filterState;
+    if (filterCity) params.city = filterCity;
+    const res = await publicAPI.getMembers(params);
+    setTotal(parseInt(res.headers['x-total-count'], 10) || 0);
+    return res.data;
+  };
+
+  // Search and filtering run on the server; wait for the user to stop typing
+  useEffect(() => {
+    let cancelled = false;
+    const timer = setTimeout(async () => {
+      setLoading(true);
       try {
-        const [membersRes, statesRes] = await Promise.all([
-          publicAPI.getMembers(),
-          publicAPI.getStates()
-        ]);
-        setMembers(membersRes.data);
-        setStates(statesRes.data || []);
+        const page = await fetchMembers(0);
+        if (!cancelled) setMembers(page);
       } catch (error) {
         console.error('Error fetching members:', error);
       } finally {
-        setLoading(false);
+        if (!cancelled) setLoading(false);
       }
+    }, searchTerm ? 300 : 0);
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
     };
-    fetchData();
-  }, []);
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [searchTerm, filterState, filterCity]);
 
-  const filteredMembers = members.filter(member => {
-    const matchesSearch = !searchTerm || 
-      member.full_name?.toLowerCase().includes(searchTerm.toLowerCase()) ||
-      member.hospital?.toLowerCase().includes(searchTerm.toLowerCase()) ||
-      member.city?.toLowerCase().includes(searchTerm.toLowerCase()) ||
-      member.membership_number?.toLowerCase().includes(searchTerm.toLowerCase());
-    
-    const matchesState = !filterState || member.state === filterState;
-    
-    return matchesSearch && matchesState;
-  });
+  const loadMore = async () => {
+    setLoadingMore(true);
+    try {
+      const page = await fetchMembers(members.length);
+      setMembers([...members, ...page]);
+    } catch (error) {
+      console.error('Error fetching members:', error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
 
   const toggleExpand = (memberId) => {
     setExpandedMember(expandedMember === memberId ? null : memberId);
@@ -70,12 +94,12 @@ const MembersDirectory = () => {
                 </svg>
               </div>
               <div>
-                <p className="text-2xl font-bold text-gray-900">{members.length}</p>
+                <p className="text-2xl font-bold text-gray-900">{total}</p>
                 <p className="text-sm text-gray-500">Life Members</p>
               </div>
             </div>
             <p className="text-gray-500 text-sm">
-              Showing {filteredMembers.length} of {members.length} members
+              Showing {members.length} of {total} members
             </p>
           </div>
         </div>
@@ -100,15 +124,31 @@ const MembersDirectory = () => {
             </div>
             <select
               value={filterState}
-              onChange={(e) => setFilterState(e.target.value)}
+              onChange={(e) => {
+                setFilterState(e.target.value);
+                setFilterCity('');
+              }}
               className="px-4 py-3 border border-gray-300 rounded-xl focus:ring-2 focus:ring-amber-500 focus:border-transparent bg-white min-w-[200px]"
               data-testid="state-filter"
             >
               <option value="">All States</option>
-              {states.map(state => (
-                <option key={state.id} value={state.name}>{state.name}</option>
+              {facets.states.map(state => (
+                <option key={state.value} value={state.value}>{state.value} ({state.count})</option>
               ))}
             </select>
+            {filterState && (
+              <select
+                value={filterCity}
+                onChange={(e) => setFilterCity(e.target.value)}
+                className="px-4 py-3 border border-gray-300 rounded-xl focus:ring-2 focus:ring-amber-500 focus:border-transparent bg-white min-w-[200px]"
+                data-testid="city-filter"
+              >
+                <option value="">All Cities</option>
+                {facets.cities.map(city => (
+                  <option key={city.value} value={city.value}>{city.value} ({city.count})</option>
+                ))}
+              </select>
+            )}
           </div>
         </div>
       </section>
@@ -119,7 +159,7 @@ const MembersDirectory = () => {
           <div className="flex justify-center py-20">
             <div className="animate-spin rounded-full h-12 w-12 border-4 border-amber-700 border-t-transparent"></div>
           </div>
-        ) : filteredMembers.length === 0 ? (
+        ) : members.length === 0 ? (
           <div className="text-center py-20">
             <div className="w-24 h-24 mx-auto mb-6 bg-gray-100 rounded-full flex items-center justify-center">
               <svg className="w-12 h-12 text-gray-400" fill="none" stroke="currentColor" viewBox="0 0 24 24">
@@ -135,7 +175,7 @@ const MembersDirectory = () => {
           </div>
         ) : (
           <div className="space-y-4" data-testid="members-directory-list">
-            {filteredMembers.map((member) => (
+            {members.map((member) => (
               <div 
                 key={member.id} 
                 className="bg-white rounded-xl shadow-md overflow-hidden hover:shadow-lg transition"
@@ -316,6 +356,18 @@ const MembersDirectory = () => {
                 )}
               </div>
             ))}
+            {members.length < total && (
+              <div className="text-center pt-4">
+                <button
+                  onClick={loadMore}
+                  disabled={loadingMore}
+                  className="bg-amber-700 hover:bg-amber-800 disabled:opacity-60 text-white px-8 py-3 rounded-lg font-medium transition"
+                  data-testid="members-load-more"
+                >
+                  {loadingMore ? 'Loading...' : 'Load more members'}
+                </button>
+              </div>
+            )}
           </div>
         )}
       </section>
@@ -101,7 +101,7 @@ const NewsHighlights = () => {
                     {item.title}
                   </h2>
                   <p className="text-gray-600 text-sm line-clamp-3 mb-4">
-                    {item.summary || item.content?.substring(0, 150)}...
+                    {item.excerpt}...
                   </p>
                   <Link
                     to={item.link_url || `/news/${item.id}`}
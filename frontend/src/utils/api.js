@@ -17,6 +17,23 @@ api.interceptors.request.use((config) => {
   return config;
 });
 
+// Pre-built JSON files published by the backend when SNAPSHOTS_ENABLED=true
+const SNAPSHOTS_ENABLED = process.env.REACT_APP_SNAPSHOTS_ENABLED === 'true';
+const SNAPSHOT_LIMIT = parseInt(process.env.REACT_APP_SNAPSHOT_LIMIT || '100', 10);
+
+// Serve an unfiltered list read from /api/snapshots/<name>.json, falling back to the route
+const snapshotOr = (name, path, params = {}, filters = {}) => {
+  const { limit, ...rest } = params;
+  const unfiltered = Object.keys(rest).every((key) => rest[key] === filters[key])
+    && Object.keys(filters).every((key) => rest[key] === filters[key]);
+  if (!SNAPSHOTS_ENABLED || !unfiltered || (limit && limit > SNAPSHOT_LIMIT)) {
+    return api.get(path, { params });
+  }
+  return api.get(`/snapshots/${name}.json`)
+    .then((response) => ({ ...response, data: limit ? response.data.slice(0, limit) : response.data }))
+    .catch(() => api.get(path, { params }));
+};
+
 // Public APIs
 export const publicAPI = {
   // States and Districts
@@ -24,28 +41,34 @@ export const publicAPI = {
   getDistricts: (stateId) => api.get(`/public/districts/${stateId}`),
   
   // Committee
-  getCommittee: (params) => api.get('/public/committee', { params }),
+  getCommittee: (params) => snapshotOr('committee', '/public/committee', params),
   
   // Events
-  getEvents: (params) => api.get('/public/events', { params }),
+  getEvents: (params = {}) => (params.status === 'upcoming'
+    ? snapshotOr('events-upcoming', '/public/events', params, { status: 'upcoming' })
+    : snapshotOr('events', '/public/events', params)),
   getEvent: (id) => api.get(`/public/events/${id}`),
   
   // News
-  getNews: (params) => api.get('/public/news', { params }),
+  getNews: (params) => snapshotOr('news', '/public/news', params),
   getNewsItem: (id) => api.get(`/public/news/${id}`),
   
   // Gallery
   getGallery: (params) => api.get('/public/gallery', { params }),
   
   // Publications
-  getPublications: (params) => api.get('/public/publications', { params }),
+  getPublications: (params) => snapshotOr('publications', '/public/publications', params),
   
   // Members
   getMembers: (params) => api.get('/public/members', { params }),
+  getMemberFacets: (params) => api.get('/public/members/facets', { params }),
   
   // Statistics
   getStatistics: () => api.get('/public/statistics'),
   
+  // Homepage bundle (statistics, events, news, committee, albums)
+  getHome: (params) => api.get('/public/home', { params }),
+  
   // SEO
   getPageSEO: (pageName) => api.get(`/public/seo/${pageName}`),
   
@@ -53,7 +76,7 @@ export const publicAPI = {
   submitContactForm: (data) => api.post('/public/contact', data),
   
   // Gallery Albums
-  getAlbums: (params) => api.get('/public/gallery/albums', { params }),
+  getAlbums: (params) => snapshotOr('gallery-albums', '/public/gallery/albums', params),
   getAlbum: (albumId) => api.get(`/public/gallery/albums/${albumId}`),
 };
 
@@ -71,13 +94,27 @@ export const authAPI = {
   verify: () => api.get('/auth/verify'),
 };
 
+// Admin list endpoints return one page at a time: X-Next-Cursor points at the next
+// page and the first page carries the number of matching rows in X-Total-Count
+export const ADMIN_PAGE_SIZE = 50;
+
+export const readPage = (response) => ({
+  items: response.data,
+  cursor: response.headers['x-next-cursor'] || null,
+  total: parseInt(response.headers['x-total-count'], 10) || 0,
+});
+
+// Number of rows an admin list holds for params, without loading them
+export const countRows = async (getPage, params = {}) =>
+  readPage(await getPage({ ...params, limit: 1 })).total;
+
 // Admin APIs
 export const adminAPI = {
   // Dashboard
   getDashboardStats: () => api.get('/admin/dashboard/stats'),
   
   // Members
-  getMembers: () => api.get('/admin/members'),
+  getMembers: (params) => api.get('/admin/members', { params }),
   createMember: (data) => api.post('/admin/members', data),
   updateMember: (id, data) => api.put(`/admin/members/${id}`, data),
   deleteMember: (id) => api.delete(`/admin/members/${id}`),
@@ -89,19 +126,19 @@ export const adminAPI = {
   deleteCommitteeMember: (id) => api.delete(`/admin/committee/${id}`),
   
   // Events
-  getEvents: () => api.get('/admin/events'),
+  getEvents: (params) => api.get('/admin/events', { params }),
   createEvent: (data) => api.post('/admin/events', data),
   updateEvent: (id, data) => api.put(`/admin/events/${id}`, data),
   deleteEvent: (id) => api.delete(`/admin/events/${id}`),
   
   // News
-  getNews: () => api.get('/admin/news'),
+  getNews: (params) => api.get('/admin/news', { params }),
   createNews: (data) => api.post('/admin/news', data),
   updateNews: (id, data) => api.put(`/admin/news/${id}`, data),
   deleteNews: (id) => api.delete(`/admin/news/${id}`),
   
   // Gallery
-  getGallery: () => api.get('/admin/gallery'),
+  getGallery: (params) => api.get('/admin/gallery', { params }),
   uploadImage: (formData) => api.post('/admin/gallery/upload', formData, {
     headers: { 'Content-Type': 'multipart/form-data' }
   }),
@@ -121,7 +158,7 @@ export const adminAPI = {
   }),
   
   // Publications
-  getPublications: () => api.get('/admin/publications'),
+  getPublications: (params) => api.get('/admin/publications', { params }),
   createPublication: (data) => api.post('/admin/publications', data),
   deletePublication: (id) => api.delete(`/admin/publications/${id}`),
   
@@ -5,6 +5,7 @@ Tests: Authentication, Members, Committee, Events, News, Gallery, Dashboard
 import pytest
 import requests
 import os
+import uuid
 from datetime import datetime, timedelta
 
 BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', 'https://sesi-staging.preview.emergentagent.com').rstrip('/')
@@ -79,6 +80,17 @@ class TestDashboard:
         assert isinstance(data["total_members"], int)
         assert isinstance(data["total_events"], int)
 
+    def test_db_query_stats_attributes_queries_to_routes(self, auth_headers):
+        """Test per-route MongoDB query statistics"""
+        requests.get(f"{BASE_URL}/api/admin/members", params={"limit": 1}, headers=auth_headers)
+        response = requests.get(f"{BASE_URL}/api/admin/db/queries", headers=auth_headers)
+        assert response.status_code == 200
+        rows = {row["route"]: row for row in response.json()}
+        members = rows.get("GET /api/admin/members")
+        assert members is not None
+        assert members["requests"] >= 1
+        assert members["queries"] >= 1
+
 
 class TestMembersAPI:
     """Members CRUD tests - P0 Bug Fix Verification"""
@@ -118,6 +130,67 @@ class TestMembersAPI:
             for field in required_fields:
                 assert field in member, f"Missing field: {field}"
 
+    def test_members_cursor_pagination(self, auth_headers):
+        """Verify limit and X-Next-Cursor page through members without repeats"""
+        first = requests.get(f"{BASE_URL}/api/admin/members", params={"limit": 1}, headers=auth_headers)
+        assert first.status_code == 200
+        first_page = first.json()
+        assert len(first_page) <= 1
+
+        cursor = first.headers.get("X-Next-Cursor")
+        if cursor:
+            second = requests.get(
+                f"{BASE_URL}/api/admin/members",
+                params={"limit": 1, "cursor": cursor},
+                headers=auth_headers
+            )
+            assert second.status_code == 200
+            second_page = second.json()
+            assert len(second_page) == 1
+            assert second_page[0]["id"] != first_page[0]["id"]
+            assert "X-Total-Count" not in second.headers
+
+    def test_members_first_page_total_count(self, auth_headers):
+        """Verify the first page reports the size of the whole listing in X-Total-Count"""
+        response = requests.get(f"{BASE_URL}/api/admin/members", params={"limit": 1}, headers=auth_headers)
+        assert response.status_code == 200
+        total = int(response.headers["X-Total-Count"])
+        assert total >= len(response.json())
+        assert ("X-Next-Cursor" in response.headers) == (total > 1)
+
+    def test_public_search_finds_member_by_name_prefix(self, auth_headers):
+        """Verify directory search matches word prefixes case-insensitively and ranks an exact name first"""
+        token = f"Zqx{uuid.uuid4().hex[:8]}"
+        payload = {
+            "full_name": f"TEST_Dr. Search {token}",
+            "email": f"{token.lower()}@example.com",
+            "mobile": "9876543210",
+            "qualification": "MS Ortho",
+            "membership_type": "Life Member"
+        }
+        response = requests.post(f"{BASE_URL}/api/admin/members", json=payload, headers=auth_headers)
+        assert response.status_code == 200
+        member_id = response.json()["id"]
+        try:
+            response = requests.get(f"{BASE_URL}/api/public/members", params={"search": payload["full_name"]})
+            assert response.status_code == 200
+            assert response.json()[0]["id"] == member_id
+
+            response = requests.get(f"{BASE_URL}/api/public/members", params={"search": token[:7].upper()})
+            assert response.status_code == 200
+            assert [m["id"] for m in response.json()] == [member_id]
+        finally:
+            requests.delete(f"{BASE_URL}/api/admin/members/{member_id}", headers=auth_headers)
+
+    def test_members_invalid_cursor(self, auth_headers):
+        """Verify a malformed cursor is rejected"""
+        response = requests.get(
+            f"{BASE_URL}/api/admin/members",
+            params={"cursor": "not-a-cursor"},
+            headers=auth_headers
+        )
+        assert response.status_code == 400
+
 
 class TestCommitteeAPI:
     """Committee CRUD tests"""
@@ -206,6 +279,14 @@ class TestEventsAPI:
         assert response.status_code == 200
         data = response.json()
         assert isinstance(data, list)
+
+    def test_get_events_by_status(self, auth_headers):
+        """Test GET /api/admin/events?status= filters on the server and counts the filtered listing"""
+        response = requests.get(f"{BASE_URL}/api/admin/events", params={"status": "upcoming"}, headers=auth_headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert all(event["status"] == "upcoming" for event in data)
+        assert int(response.headers["X-Total-Count"]) >= len(data)
     
     def test_create_event(self, auth_headers):
         """Test POST /api/admin/events"""
@@ -282,6 +363,14 @@ class TestNewsAPI:
         assert response.status_code == 200
         data = response.json()
         assert isinstance(data, list)
+
+    def test_get_published_news(self, auth_headers):
+        """Test GET /api/admin/news?is_published=true leaves out drafts"""
+        response = requests.get(f"{BASE_URL}/api/admin/news", params={"is_published": "true"}, headers=auth_headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert all(item["is_published"] for item in data)
+        assert int(response.headers["X-Total-Count"]) >= len(data)
     
     def test_create_news(self, auth_headers):
         """Test POST /api/admin/news"""
@@ -346,6 +435,40 @@ class TestGalleryAPI:
         data = response.json()
         assert isinstance(data, list)
 
+    def test_album_display_orders_survive_photo_delete(self, auth_headers):
+        """Verify a photo uploaded after a delete gets a new display order and an album gets a cover"""
+        response = requests.post(
+            f"{BASE_URL}/api/admin/gallery/albums",
+            json={"title": f"TEST_Album {uuid.uuid4().hex[:8]}"},
+            headers=auth_headers
+        )
+        assert response.status_code == 200
+        album_id = response.json()["id"]
+        photos_url = f"{BASE_URL}/api/admin/gallery/albums/{album_id}/photos"
+        try:
+            files = [("images", (f"photo{i}.png", b"test", "image/png")) for i in range(3)]
+            response = requests.post(f"{photos_url}/bulk", files=files, headers=auth_headers)
+            assert response.status_code == 200
+            assert response.json()["uploaded_count"] == 3
+
+            photos = requests.get(photos_url, headers=auth_headers).json()
+            assert [p["display_order"] for p in photos] == [0, 1, 2]
+            response = requests.delete(f"{BASE_URL}/api/admin/gallery/{photos[1]['id']}", headers=auth_headers)
+            assert response.status_code == 200
+
+            response = requests.post(
+                photos_url, files={"image": ("photo3.png", b"test", "image/png")}, headers=auth_headers
+            )
+            assert response.status_code == 200
+            assert response.json()["display_order"] == 3
+
+            albums = requests.get(f"{BASE_URL}/api/admin/gallery/albums", headers=auth_headers).json()
+            album = next(a for a in albums if a["id"] == album_id)
+            assert album["cover_image"] == photos[0]["image_url"]
+            assert album["photo_count"] == 3
+        finally:
+            requests.delete(f"{BASE_URL}/api/admin/gallery/albums/{album_id}", headers=auth_headers)
+
 
 class TestApplicationsAPI:
     """Applications API tests"""
@@ -366,6 +489,14 @@ class TestApplicationsAPI:
         assert response.status_code == 200
         data = response.json()
         assert isinstance(data, list)
+    
+    def test_approve_unknown_application(self, auth_headers):
+        """Test approving an application that does not exist returns 404"""
+        response = requests.put(
+            f"{BASE_URL}/api/admin/applications/{uuid.uuid4()}/status?status=approved",
+            headers=auth_headers
+        )
+        assert response.status_code == 404
 
 
 class TestUnauthorizedAccess:
@@ -0,0 +1,142 @@
+"""
+Test suite for membership number allocation (backend/utils/membership_numbers.py)
+Runs the allocator against a scratch database on a local mongod: seeding a
+year's counter from numbers already issued, reserving consecutive blocks and
+concurrent allocations never handing out the same number.
+
+Uses TEST_MONGO_URL (default mongodb://localhost:27017); skipped if no
+mongod answers there.
+"""
+import pytest
+import os
+import sys
+import asyncio
+from pathlib import Path
+
+TEST_MONGO_URL = os.environ.get('TEST_MONGO_URL', 'mongodb://localhost:27017')
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+DB_NAME = "sesi_membership_number_test"
+YEAR = 2031
+
+
+@pytest.fixture(scope="module")
+def loop():
+    from pymongo import MongoClient
+    from pymongo.errors import PyMongoError
+
+    client = MongoClient(TEST_MONGO_URL, serverSelectionTimeoutMS=2000)
+    try:
+        client.admin.command("ping")
+    except PyMongoError as e:
+        pytest.skip(f"No mongod at {TEST_MONGO_URL}: {e}")
+    finally:
+        client.close()
+
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="module")
+def membership_numbers():
+    """The allocator module; MONGO_URL is only needed to import it"""
+    os.environ.setdefault("MONGO_URL", TEST_MONGO_URL)
+    sys.path.insert(0, str(BACKEND_DIR))
+    from utils import membership_numbers
+
+    return membership_numbers
+
+
+@pytest.fixture
+def db(membership_numbers, loop, monkeypatch):
+    """
+    An empty scratch database in place of the backend's own
+
+    database.py may already have been imported by another test module with a
+    different MONGO_URL / DB_NAME, so the allocator's db is swapped out here.
+    """
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    client = AsyncIOMotorClient(TEST_MONGO_URL, io_loop=loop)
+    loop.run_until_complete(client.drop_database(DB_NAME))
+    database = client[DB_NAME]
+    monkeypatch.setattr(membership_numbers, "db", database)
+    monkeypatch.setattr(membership_numbers, "_seeded_years", set())
+
+    yield database
+    loop.run_until_complete(client.drop_database(DB_NAME))
+    client.close()
+
+
+class TestSeeding:
+    """The first allocation of a year continues after the highest number already issued"""
+
+    def test_starts_at_one_without_issued_numbers(self, membership_numbers, db, loop):
+        number = loop.run_until_complete(membership_numbers.next_membership_number(year=YEAR))
+        assert number == f"SESI-{YEAR}-0001"
+
+    def test_seeds_from_highest_issued_number(self, membership_numbers, db, loop):
+        async def scenario():
+            await db.members.insert_many([
+                {"id": "m1", "membership_number": f"SESI-{YEAR}-0041"},
+                {"id": "m2", "membership_number": f"SESI-{YEAR}-0007"},
+                {"id": "m3", "membership_number": f"SESI-{YEAR - 1}-0900"},
+                {"id": "m4"}
+            ])
+            await db.membership_applications.insert_one(
+                {"id": "a1", "membership_number": f"SESI-{YEAR}-0039"}
+            )
+            return await membership_numbers.next_membership_number(year=YEAR)
+
+        assert loop.run_until_complete(scenario()) == f"SESI-{YEAR}-0042"
+
+    def test_existing_counter_is_not_reseeded(self, membership_numbers, db, loop):
+        async def scenario():
+            await db.counters.insert_one({"_id": f"membership_number-{YEAR}", "year": YEAR, "last": 10})
+            await db.members.insert_one({"id": "m1", "membership_number": f"SESI-{YEAR}-0005"})
+            return await membership_numbers.next_membership_number(year=YEAR)
+
+        assert loop.run_until_complete(scenario()) == f"SESI-{YEAR}-0011"
+
+
+class TestBlockReservation:
+    """allocate_membership_numbers(n) reserves n consecutive numbers"""
+
+    def test_block_is_consecutive(self, membership_numbers, db, loop):
+        async def scenario():
+            block = await membership_numbers.allocate_membership_numbers(3, year=YEAR)
+            following = await membership_numbers.next_membership_number(year=YEAR)
+            return block, following
+
+        block, following = loop.run_until_complete(scenario())
+        assert block == [f"SESI-{YEAR}-0001", f"SESI-{YEAR}-0002", f"SESI-{YEAR}-0003"]
+        assert following == f"SESI-{YEAR}-0004"
+
+    def test_empty_block_reserves_nothing(self, membership_numbers, db, loop):
+        async def scenario():
+            assert await membership_numbers.allocate_membership_numbers(0, year=YEAR) == []
+            return await membership_numbers.next_membership_number(year=YEAR)
+
+        assert loop.run_until_complete(scenario()) == f"SESI-{YEAR}-0001"
+
+
+class TestConcurrentAllocation:
+    """Concurrent allocations never share a number"""
+
+    def test_concurrent_allocations_do_not_collide(self, membership_numbers, db, loop):
+        counts = [1, 2, 3] * 10
+
+        async def scenario():
+            await db.members.insert_one({"id": "m1", "membership_number": f"SESI-{YEAR}-0100"})
+            # Every call starts before the year is seeded, as on several fresh workers
+            return await asyncio.gather(*[
+                membership_numbers.allocate_membership_numbers(count, year=YEAR) for count in counts
+            ])
+
+        blocks = loop.run_until_complete(scenario())
+        numbers = [number for block in blocks for number in block]
+        assert len(numbers) == sum(counts)
+        assert sorted(numbers) == [f"SESI-{YEAR}-{seq:04d}" for seq in range(101, 101 + sum(counts))]
+        for block in blocks:
+            seqs = [int(number.rsplit("-", 1)[1]) for number in block]
+            assert seqs == list(range(seqs[0], seqs[0] + len(seqs)))
@@ -77,9 +77,11 @@ class TestPublicNewsAPI:
             news = data[0]
             assert "id" in news
             assert "title" in news
-            assert "content" in news
+            assert "excerpt" in news
             assert "published_date" in news
-            assert "is_published" in news
+            # List items are summaries; full bodies come from /news/{id}
+            assert "content" not in news
+            assert "seo_description" not in news
             
     def test_get_news_with_limit(self):
         """Test GET /api/public/news with limit parameter"""
@@ -133,7 +135,8 @@ class TestPublicEventsAPI:
             event = data[0]
             assert "id" in event
             assert "title" in event
-            assert "description" in event
+            assert "excerpt" in event
+            assert "description" not in event
             assert "event_type" in event
             assert "start_date" in event
             assert "status" in event
@@ -148,7 +151,18 @@ class TestPublicEventsAPI:
         # All events should have upcoming status
         for event in data:
             assert event.get("status") == "upcoming"
-            
+
+    def test_get_events_with_date_range(self):
+        """Test GET /api/public/events only returns events starting in [date_from, date_to)"""
+        params = {"date_from": "2025-01-01T00:00:00", "date_to": "2026-01-01T00:00:00"}
+        response = requests.get(f"{BASE_URL}/api/public/events", params=params)
+        assert response.status_code == 200
+
+        data = response.json()
+        assert isinstance(data, list)
+        for event in data:
+            assert params["date_from"] <= event["start_date"] < params["date_to"]
+
     def test_get_events_with_limit(self):
         """Test GET /api/public/events with limit parameter"""
         response = requests.get(f"{BASE_URL}/api/public/events", params={"limit": 2})
@@ -172,6 +186,7 @@ class TestPublicEventsAPI:
             event = response.json()
             assert event["id"] == event_id
             assert "title" in event
+            assert "description" in event
 
 
 class TestPublicStatisticsAPI:
@@ -195,6 +210,53 @@ class TestPublicStatisticsAPI:
         assert isinstance(data["upcoming_events"], int)
 
 
+class TestPublicHomeAPI:
+    """Tests for /api/public/home bundle endpoint"""
+
+    def test_get_home_bundle(self):
+        """Test GET /api/public/home returns every homepage section"""
+        response = requests.get(f"{BASE_URL}/api/public/home")
+        assert response.status_code == 200
+
+        data = response.json()
+        for section in ["events", "news", "committee", "albums"]:
+            assert isinstance(data[section], list)
+        assert "total_members" in data["statistics"]
+        assert "upcoming_events" in data["statistics"]
+
+    def test_home_bundle_limits(self):
+        """Test GET /api/public/home honours the per-section limits"""
+        response = requests.get(f"{BASE_URL}/api/public/home", params={"events_limit": 1, "news_limit": 1})
+        assert response.status_code == 200
+
+        data = response.json()
+        assert len(data["events"]) <= 1
+        assert len(data["news"]) <= 1
+
+
+class TestPublicConditionalGet:
+    """Tests for ETag / If-None-Match support on public list endpoints"""
+
+    @pytest.mark.parametrize("path", ["/api/public/events", "/api/public/news", "/api/public/committee"])
+    def test_etag_revalidation(self, path):
+        """Test a repeated request with the ETag returns 304 with no body"""
+        response = requests.get(f"{BASE_URL}{path}")
+        assert response.status_code == 200
+        etag = response.headers.get("ETag")
+        assert etag and etag.startswith('"')
+
+        response = requests.get(f"{BASE_URL}{path}", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.headers.get("ETag") == etag
+        assert response.content == b""
+
+    def test_etag_differs_per_query(self):
+        """Test different query params produce different ETags"""
+        first = requests.get(f"{BASE_URL}/api/public/events", params={"limit": 1})
+        second = requests.get(f"{BASE_URL}/api/public/events", params={"limit": 2})
+        assert first.headers.get("ETag") != second.headers.get("ETag")
+
+
 class TestPublicGalleryAPI:
     """Tests for /api/public/gallery endpoint"""
     
@@ -262,10 +324,40 @@ class TestPublicMembersAPI:
         """Test members search functionality"""
         response = requests.get(f"{BASE_URL}/api/public/members", params={"search": "Dr"})
         assert response.status_code == 200
-        
+
         data = response.json()
         assert isinstance(data, list)
 
+    def test_members_pagination(self):
+        """Test limit/offset paging and the X-Total-Count header"""
+        response = requests.get(f"{BASE_URL}/api/public/members", params={"limit": 2})
+        assert response.status_code == 200
+        total = int(response.headers["X-Total-Count"])
+        first_page = response.json()
+        assert len(first_page) == min(2, total)
+
+        response = requests.get(f"{BASE_URL}/api/public/members", params={"limit": 2, "offset": 2})
+        assert response.status_code == 200
+        second_page = response.json()
+        assert not {m["id"] for m in first_page} & {m["id"] for m in second_page}
+
+    def test_members_facets(self):
+        """Test /members/facets counts match the directory totals"""
+        response = requests.get(f"{BASE_URL}/api/public/members/facets")
+        assert response.status_code == 200
+        facets = response.json()
+        total = int(requests.get(f"{BASE_URL}/api/public/members", params={"limit": 1}).headers["X-Total-Count"])
+        assert facets["total"] == total
+        assert sum(f["count"] for f in facets["membership_types"]) <= total
+
+        for state in facets["states"][:3]:
+            response = requests.get(f"{BASE_URL}/api/public/members", params={"state": state["value"], "limit": 1})
+            assert int(response.headers["X-Total-Count"]) == state["count"]
+
+            response = requests.get(f"{BASE_URL}/api/public/members/facets", params={"state": state["value"]})
+            assert response.status_code == 200
+            assert all(city["state"] == state["value"] for city in response.json()["cities"])
+
 
 class TestPublicStatesAPI:
     """Tests for /api/public/states endpoint"""
@@ -0,0 +1,391 @@
+"""
+Query-plan regression suite for the queries issued by the routers
+Seeds a scratch database on a local mongod with realistic volumes, creates
+the indexes declared in utils/indexes.py and runs explain() on every
+filter/sort shape used by routers/public.py, routers/admin.py,
+routers/membership.py and the membership number / approval helpers (the
+number lookup that used to live in utils/certificate.py). Each plan must
+use an index (no COLLSCAN, no in-memory SORT) and examine no more
+documents than the query can return.
+
+Uses QUERY_PLAN_MONGO_URL (default mongodb://localhost:27017); skipped if
+no mongod answers there. QUERY_PLAN_SCALE multiplies the seeded volumes.
+"""
+import pytest
+import os
+import sys
+import uuid
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+
+QUERY_PLAN_MONGO_URL = os.environ.get('QUERY_PLAN_MONGO_URL', 'mongodb://localhost:27017')
+QUERY_PLAN_SCALE = float(os.environ.get('QUERY_PLAN_SCALE', '1'))
+DB_NAME = "sesi_query_plan_test"
+
+# Parts of an explain() result that are not the chosen plan
+_NOT_WINNING = {"rejectedPlans", "allPlansExecution"}
+
+STATES = {
+    "Maharashtra": ["Mumbai", "Pune", "Nagpur", "Nashik", "Thane"],
+    "Delhi": ["New Delhi", "Dwarka", "Rohini"],
+    "Karnataka": ["Bengaluru", "Mysuru", "Mangaluru", "Hubballi"],
+    "Tamil Nadu": ["Chennai", "Coimbatore", "Madurai", "Salem"],
+    "Gujarat": ["Ahmedabad", "Surat", "Vadodara", "Rajkot"],
+    "West Bengal": ["Kolkata", "Howrah", "Siliguri"],
+    "Uttar Pradesh": ["Lucknow", "Kanpur", "Noida", "Varanasi", "Agra"],
+    "Kerala": ["Kochi", "Thiruvananthapuram", "Kozhikode"],
+}
+FIRST_NAMES = ["Aarav", "Vikram", "Priya", "Anjali", "Rahul", "Sneha", "Arjun", "Kavya", "Rohan", "Meera",
+               "Sanjay", "Deepa", "Amit", "Neha", "Karthik", "Lakshmi", "Suresh", "Pooja", "Nikhil", "Divya"]
+LAST_NAMES = ["Sharma", "Patel", "Iyer", "Reddy", "Gupta", "Nair", "Singh", "Chauhan", "Menon", "Rao",
+              "Kulkarni", "Das", "Joshi", "Mehta", "Pillai", "Verma", "Bose", "Kapoor", "Shetty", "Agarwal"]
+MEMBERSHIP_TYPES = ["Life Member", "Associate Member", "Overseas Member"]
+EVENT_TYPES = ["conference", "workshop", "webinar", "cme"]
+EVENT_STATUSES = ["upcoming", "ongoing", "completed"]
+CATEGORIES = ["conference", "workshop", "award", "general"]
+PUBLICATION_TYPES = ["journal", "newsletter", "guideline"]
+APPLICATION_STATUSES = ["submitted", "under_review", "approved", "rejected"]
+
+
+def scaled(count: int) -> int:
+    return max(1, int(count * QUERY_PLAN_SCALE))
+
+
+@pytest.fixture(scope="module")
+def db():
+    from pymongo import MongoClient
+    from pymongo.errors import PyMongoError
+
+    client = MongoClient(QUERY_PLAN_MONGO_URL, serverSelectionTimeoutMS=2000)
+    try:
+        client.admin.command("ping")
+    except PyMongoError as e:
+        pytest.skip(f"No mongod at {QUERY_PLAN_MONGO_URL}: {e}")
+
+    os.environ.setdefault("MONGO_URL", QUERY_PLAN_MONGO_URL)
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+    from utils.indexes import INDEXES
+
+    client.drop_database(DB_NAME)
+    database = client[DB_NAME]
+    for collection_name, models in INDEXES.items():
+        database[collection_name].create_indexes(models)
+    seed(database)
+
+    yield database
+    client.drop_database(DB_NAME)
+    client.close()
+
+
+def seed(db):
+    """Insert a realistic spread of documents into every queried collection"""
+    from utils.member_search import with_search_fields
+
+    rng = random.Random(42)
+    now = datetime.utcnow().replace(microsecond=0)
+
+    def some_date(days: int) -> datetime:
+        return now - timedelta(days=rng.randint(-days // 10, days), minutes=rng.randint(0, 1440))
+
+    members = []
+    for seq in range(scaled(20000)):
+        state = rng.choice(list(STATES))
+        year = rng.randint(2010, now.year)
+        members.append(with_search_fields({
+            "id": str(uuid.uuid4()),
+            "full_name": f"Dr. {rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            "email": f"member{seq}@example.com",
+            "qualification": "MS Ortho",
+            "hospital": f"{rng.choice(LAST_NAMES)} Hospital",
+            "state": state,
+            "city": rng.choice(STATES[state]),
+            "membership_type": rng.choice(MEMBERSHIP_TYPES),
+            "membership_number": f"SESI-{year}-{seq:05d}",
+            "status": "active" if rng.random() < 0.9 else "inactive",
+            "application_id": str(uuid.uuid4()) if rng.random() < 0.5 else None,
+            "joined_date": some_date(5000),
+        }))
+    db.members.insert_many(members)
+
+    applications = []
+    for seq in range(scaled(10000)):
+        status = rng.choice(APPLICATION_STATUSES)
+        application = {
+            "id": str(uuid.uuid4()),
+            "full_name": f"Dr. {rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            "status": status,
+            "submitted_at": some_date(2000),
+        }
+        if status == "approved":
+            application["membership_number"] = f"SESI-{now.year - 1}-A{seq:05d}"
+            application["approval_pending"] = ["email"] if rng.random() < 0.01 else []
+        applications.append(application)
+    db.membership_applications.insert_many(applications)
+
+    db.events.insert_many([{
+        "id": str(uuid.uuid4()),
+        "title": f"Event {seq}",
+        "status": rng.choice(EVENT_STATUSES),
+        "event_type": rng.choice(EVENT_TYPES),
+        "start_date": some_date(3000),
+    } for seq in range(scaled(3000))])
+
+    db.news.insert_many([{
+        "id": str(uuid.uuid4()),
+        "title": f"News {seq}",
+        "category": rng.choice(CATEGORIES),
+        "is_published": rng.random() < 0.85,
+        "published_date": some_date(3000),
+    } for seq in range(scaled(3000))])
+
+    db.publications.insert_many([{
+        "id": str(uuid.uuid4()),
+        "title": f"Publication {seq}",
+        "publication_type": rng.choice(PUBLICATION_TYPES),
+        "published_date": some_date(4000),
+    } for seq in range(scaled(2000))])
+
+    albums = [{
+        "id": str(uuid.uuid4()),
+        "title": f"Album {seq}",
+        "category": rng.choice(CATEGORIES),
+        "is_published": rng.random() < 0.8,
+        "created_at": some_date(2000),
+    } for seq in range(scaled(200))]
+    db.gallery_albums.insert_many(albums)
+    db.gallery.insert_many([{
+        "id": str(uuid.uuid4()),
+        "album_id": album["id"],
+        "category": album["category"],
+        "display_order": order,
+        "upload_date": some_date(2000),
+    } for album in albums for order in range(50)])
+
+    db.committee_members.insert_many([{
+        "id": str(uuid.uuid4()),
+        "slug": f"committee-member-{year}-{order}",
+        "year": year,
+        "is_current": year == now.year,
+        "display_order": order,
+    } for year in range(2000, now.year + 1) for order in range(20)])
+
+
+def walk(node, skip=_NOT_WINNING):
+    """Every dict in an explain() result, leaving out rejected plans"""
+    if isinstance(node, dict):
+        yield node
+        for key, value in node.items():
+            if key not in skip:
+                yield from walk(value, skip)
+    elif isinstance(node, list):
+        for item in node:
+            yield from walk(item, skip)
+
+
+def plan_stages(explanation: dict) -> list:
+    """Stage names of the winning plan(s), leaving out the execution-engine details"""
+    skip = _NOT_WINNING | {"executionStats", "slotBasedPlan"}
+    return [node["stage"] for node in walk(explanation, skip) if isinstance(node.get("stage"), str)]
+
+
+def docs_examined(explanation: dict) -> int:
+    return sum(
+        node["executionStats"].get("totalDocsExamined", 0)
+        for node in walk(explanation)
+        if isinstance(node.get("executionStats"), dict)
+    )
+
+
+def assert_indexed(explanation: dict, budget: int, allow_sort: bool = False):
+    stages = plan_stages(explanation)
+    assert "COLLSCAN" not in stages, f"collection scan: {stages}"
+    if not allow_sort:
+        assert "SORT" not in stages, f"in-memory sort: {stages}"
+    examined = docs_examined(explanation)
+    assert examined <= budget, f"{examined} documents examined, budget {budget}: {stages}"
+
+
+def explain(db, command: dict) -> dict:
+    return db.command("explain", command, verbosity="executionStats")
+
+
+def check_find(db, collection: str, query: dict, sort=None, limit: int = 0, skip: int = 0, budget=None):
+    """explain() a find; the default budget is what the query can return"""
+    command = {"find": collection, "filter": query}
+    if sort:
+        command["sort"] = dict(sort)
+    if limit:
+        command["limit"] = limit
+    if skip:
+        command["skip"] = skip
+    if budget is None:
+        matches = db[collection].count_documents(query)
+        budget = min(matches, skip + limit) if limit else matches
+    assert_indexed(explain(db, command), max(budget, 1))
+
+
+def check_aggregate(db, collection: str, pipeline: list, budget: int, allow_sort: bool = False):
+    command = {"aggregate": collection, "pipeline": pipeline, "cursor": {}}
+    assert_indexed(explain(db, command), max(budget, 1), allow_sort=allow_sort)
+
+
+def check_count(db, collection: str, query: dict):
+    """explain() the aggregation count_documents() runs"""
+    pipeline = [{"$match": query}, {"$group": {"_id": 1, "n": {"$sum": 1}}}]
+    check_aggregate(db, collection, pipeline, db[collection].count_documents(query))
+
+
+def sample(db, collection: str, query: dict = None) -> dict:
+    return db[collection].find_one(query or {}, {"_id": 0})
+
+
+class TestPublicQueryPlans:
+    """routers/public.py"""
+
+    def test_committee(self, db):
+        check_find(db, "committee_members", {"is_current": True}, [("display_order", 1)], limit=100)
+        check_find(db, "committee_members", {"year": 2020}, [("display_order", 1)], limit=100)
+        check_find(db, "committee_members", {"slug": sample(db, "committee_members")["slug"]}, limit=1)
+
+    def test_events(self, db):
+        date_from = datetime.utcnow() - timedelta(days=365)
+        sort = [("start_date", -1)]
+        check_find(db, "events", {}, sort, limit=10)
+        check_find(db, "events", {"status": "upcoming"}, sort, limit=10)
+        check_find(db, "events", {"event_type": "workshop"}, sort, limit=10)
+        check_find(db, "events", {"status": "completed", "event_type": "conference"}, sort, limit=10)
+        check_find(db, "events", {"start_date": {"$gte": date_from, "$lt": datetime.utcnow()}}, sort, limit=10)
+        check_find(db, "events", {"status": "completed", "start_date": {"$gte": date_from}}, sort, limit=10)
+        check_find(db, "events", {"id": sample(db, "events")["id"]}, limit=1)
+
+    def test_news(self, db):
+        sort = [("published_date", -1)]
+        check_find(db, "news", {"is_published": True}, sort, limit=10)
+        check_find(db, "news", {"is_published": True, "category": "award"}, sort, limit=10)
+        check_find(db, "news", {"id": sample(db, "news", {"is_published": True})["id"], "is_published": True},
+                   limit=1)
+
+    def test_gallery(self, db):
+        album = sample(db, "gallery_albums", {"is_published": True})
+        check_find(db, "gallery", {}, [("upload_date", -1)], limit=50)
+        check_find(db, "gallery", {"category": "workshop"}, [("upload_date", -1)], limit=50)
+        check_find(db, "gallery_albums", {"is_published": True}, [("created_at", -1)], limit=100)
+        check_find(db, "gallery_albums", {"is_published": True, "category": "award"}, [("created_at", -1)],
+                   limit=100)
+        check_find(db, "gallery_albums", {"id": album["id"], "is_published": True}, limit=1)
+        check_find(db, "gallery", {"album_id": album["id"]}, [("display_order", 1)], limit=1000)
+
+    def test_publications(self, db):
+        sort = [("published_date", -1)]
+        check_find(db, "publications", {}, sort, limit=20)
+        check_find(db, "publications", {"publication_type": "journal"}, sort, limit=20)
+
+    def test_member_directory(self, db):
+        sort = [("full_name", 1), ("id", 1)]
+        for query in (
+            {"status": "active"},
+            {"status": "active", "state": "Kerala"},
+            {"status": "active", "state": "Karnataka", "city": "Mysuru"},
+        ):
+            check_find(db, "members", query, sort, limit=50)
+            check_find(db, "members", query, sort, limit=50, skip=100)
+            check_count(db, "members", query)
+
+    def test_member_directory_search(self, db):
+        from utils.member_search import search_match, relevance
+
+        for search in ("iyer", "dr vik", "mumbai"):
+            query = {"status": "active", **search_match(search)}
+            matches = db.members.count_documents(query)
+            check_aggregate(db, "members", [
+                {"$match": query},
+                {"$addFields": {"score": relevance(search)}},
+                {"$sort": {"score": -1, "full_name": 1, "id": 1}},
+                {"$skip": 0},
+                {"$limit": 50},
+            ], matches, allow_sort=True)
+            check_count(db, "members", query)
+
+    def test_member_facets(self, db):
+        from routers.public import member_facets_pipeline
+
+        active = db.members.count_documents({"status": "active"})
+        for state in (None, "Kerala"):
+            check_aggregate(db, "members", member_facets_pipeline(state), active)
+
+
+class TestAdminQueryPlans:
+    """routers/admin.py, including keyset pages from utils/pagination.py"""
+
+    PAGED = [
+        ("members", {}, "full_name", 1),
+        ("events", {}, "start_date", -1),
+        ("events", {"status": "upcoming"}, "start_date", -1),
+        ("news", {}, "published_date", -1),
+        ("news", {"is_published": False}, "published_date", -1),
+        ("gallery", {}, "upload_date", -1),
+        ("publications", {}, "published_date", -1),
+        ("membership_applications", {}, "submitted_at", -1),
+        ("membership_applications", {"status": "submitted"}, "submitted_at", -1),
+    ]
+
+    def test_first_pages(self, db):
+        for collection, query, field, direction in self.PAGED:
+            check_find(db, collection, query, [(field, direction), ("id", direction)], limit=501)
+            if query:
+                # X-Total-Count of a filtered listing
+                check_count(db, collection, query)
+
+    def test_keyset_pages(self, db):
+        from utils.pagination import keyset_query
+
+        for collection, query, field, direction in self.PAGED:
+            middle = db[collection].find(query, {"_id": 0}).sort([(field, direction), ("id", direction)]) \
+                .skip(db[collection].count_documents(query) // 2).limit(1).next()
+            check_find(
+                db, collection,
+                keyset_query(query, field, direction, middle[field], middle["id"]),
+                [(field, direction), ("id", direction)],
+                limit=501, budget=501
+            )
+
+    def test_unpaged_lists(self, db):
+        check_find(db, "committee_members", {}, [("display_order", 1)], limit=100)
+        check_find(db, "gallery_albums", {}, [("created_at", -1)], limit=1000)
+
+    def test_lookups_by_id(self, db):
+        for collection in ("members", "committee_members", "events", "news", "gallery",
+                           "gallery_albums", "publications", "membership_applications"):
+            check_find(db, collection, {"id": sample(db, collection)["id"]}, limit=1)
+        check_find(db, "page_seo", {"page_name": "home"}, limit=1)
+
+    def test_album_photos(self, db):
+        album_id = sample(db, "gallery_albums")["id"]
+        check_find(db, "gallery", {"album_id": album_id}, [("display_order", 1)], limit=1000)
+        # Seeding next_display_order from the album's last photo
+        check_find(db, "gallery", {"album_id": album_id}, [("display_order", -1)], limit=1)
+        check_find(db, "gallery", {"album_id": album_id})
+
+
+class TestMembershipQueryPlans:
+    """routers/membership.py and the approval pipeline in utils/approvals.py"""
+
+    def test_application_by_id(self, db):
+        check_find(db, "membership_applications", {"id": sample(db, "membership_applications")["id"]}, limit=1)
+
+    def test_approval(self, db):
+        from utils.approvals import PENDING_STEPS_QUERY, member_query
+
+        application = sample(db, "membership_applications", {"status": "submitted"})
+        member = sample(db, "members", {"application_id": {"$type": "string"}})
+        check_find(db, "membership_applications", {"id": application["id"], "status": {"$ne": "approved"}}, limit=1)
+        check_find(db, "members", member_query(member["application_id"]), limit=1)
+        check_find(db, "membership_applications", PENDING_STEPS_QUERY)
+
+    def test_issued_membership_numbers(self, db):
+        from utils.membership_numbers import issued_numbers_query
+
+        for year in (2015, datetime.utcnow().year - 1):
+            for collection in ("members", "membership_applications"):
+                check_find(db, collection, issued_numbers_query(year))
@@ -0,0 +1,134 @@
+"""
+Test suite for public read-preference routing on a replica set
+Start a local three-node replica set with backend/start_replica_set.sh and
+set REPLICA_SET_URL to the MONGO_URL it prints; skipped otherwise.
+
+database.py builds its client from the environment at import time and
+another test module may already have imported it with a different
+MONGO_URL, so the app's own routing is exercised in a fresh interpreter
+with MONGO_URL pointed at the replica set.
+"""
+import pytest
+import os
+import sys
+import json
+import subprocess
+from pathlib import Path
+
+REPLICA_SET_URL = os.environ.get('REPLICA_SET_URL')
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+DB_NAME = "sesi_read_preference_test"
+
+pytestmark = pytest.mark.skipif(not REPLICA_SET_URL, reason="REPLICA_SET_URL not set")
+
+# Runs in BACKEND_DIR: reads probe documents through the app's database
+# module and utils.cache.reads_for(), and prints which member served each read
+PROBE_SCRIPT = '''
+import json
+import uuid
+import asyncio
+from pymongo import monitoring
+from pymongo.write_concern import WriteConcern
+
+
+class FindAddresses(monitoring.CommandListener):
+    def __init__(self):
+        self.by_filter_id = {}
+
+    def started(self, event):
+        if event.command_name == "find":
+            self.by_filter_id[event.command.get("filter", {}).get("id")] = event.connection_id
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+servers = FindAddresses()
+# Registered before database.py creates its client; this interpreter runs nothing else
+monitoring.register(servers)
+
+import database
+from utils.cache import reads_for, invalidate_local
+
+
+async def served_by(read) -> str:
+    probe_id = str(uuid.uuid4())
+    probes = database.db.get_collection("probes", write_concern=WriteConcern(w=3))
+    await probes.insert_one({"id": probe_id})
+    assert await read(probe_id) is not None
+    address = servers.by_filter_id[probe_id]
+    if address == database.client.primary:
+        return "primary"
+    return "secondary" if address in database.client.secondaries else str(address)
+
+
+async def main():
+    served = {
+        "public_db": await served_by(lambda i: database.public_db.probes.find_one({"id": i})),
+        "db": await served_by(lambda i: database.db.probes.find_one({"id": i})),
+        "reads_for": await served_by(lambda i: reads_for("events").probes.find_one({"id": i})),
+    }
+    invalidate_local("events")
+    served["reads_for_changed"] = await served_by(lambda i: reads_for("events").probes.find_one({"id": i}))
+    served["reads_for_unchanged"] = await served_by(lambda i: reads_for("committee").probes.find_one({"id": i}))
+    print(json.dumps(served))
+
+
+asyncio.run(main())
+'''
+
+
+def backend_env(**settings) -> dict:
+    return {**os.environ, "MONGO_URL": REPLICA_SET_URL, "DB_NAME": DB_NAME, **settings}
+
+
+def run_in_backend(script: str, **settings) -> str:
+    result = subprocess.run(
+        [sys.executable, "-c", script], cwd=BACKEND_DIR, env=backend_env(**settings),
+        capture_output=True, text=True, check=True
+    )
+    return result.stdout
+
+
+@pytest.fixture(scope="module")
+def served():
+    """Which replica set member served each probe read: "primary" or "secondary" per read path"""
+    from pymongo import MongoClient
+
+    output = run_in_backend(
+        PROBE_SCRIPT, PUBLIC_READ_PREFERENCE="secondaryPreferred", PUBLIC_MAX_STALENESS_SECONDS="90"
+    )
+    yield json.loads(output.strip().splitlines()[-1])
+
+    client = MongoClient(REPLICA_SET_URL)
+    client.drop_database(DB_NAME)
+    client.close()
+
+
+class TestPublicReadPreference:
+    """public_db reads go to secondaries; db stays on the primary"""
+
+    def test_public_db_read_preference_from_env(self):
+        script = (
+            "import database; "
+            "print(database.public_db.read_preference.name, database.public_db.read_preference.max_staleness, "
+            "database.db.read_preference.name)"
+        )
+        output = run_in_backend(script, PUBLIC_READ_PREFERENCE="secondaryPreferred", PUBLIC_MAX_STALENESS_SECONDS="90")
+        assert output.split() == ["secondaryPreferred", "90", "primary"]
+
+    def test_public_reads_use_a_secondary(self, served):
+        assert served["public_db"] == "secondary"
+
+    def test_primary_reads_use_the_primary(self, served):
+        assert served["db"] == "primary"
+
+    def test_reads_for_uses_a_secondary(self, served):
+        assert served["reads_for"] == "secondary"
+
+    def test_reads_stay_on_primary_right_after_a_change(self, served):
+        assert served["reads_for_changed"] == "primary"
+        assert served["reads_for_unchanged"] == "secondary"
@@ -0,0 +1,278 @@
+"""
+Unit tests for the in-process response cache (backend/utils/cache.py)
+TTL / stale expiry, LRU eviction, tag invalidation, the @cached decorator
+and @conditional validators run without a server or database; the clock
+and the collection version stamps are replaced by fake ones.
+"""
+import pytest
+import os
+import sys
+import asyncio
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+# database.py only needs a URL to import; no connection is made by these tests
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+from utils import cache  # noqa: E402
+from utils.cache import ResponseCache, cached, _MISSING  # noqa: E402
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cache, "time", SimpleNamespace(monotonic=clock.monotonic))
+    return clock
+
+
+@pytest.fixture
+def versions(monkeypatch):
+    """Collection version stamps, tag -> (version, updated_at), in place of the cache_versions collection"""
+    stamps = {}
+
+    async def get_versions(tags):
+        return {tag: stamps.get(tag, (0, None)) for tag in tags}
+
+    monkeypatch.setattr(cache, "get_versions", get_versions)
+    return stamps
+
+
+@pytest.fixture
+def response_cache(monkeypatch, versions):
+    """A fresh cache in place of the module-wide one used by @cached"""
+    fresh = ResponseCache(max_entries=16, default_ttl=60)
+    monkeypatch.setattr(cache, "response_cache", fresh)
+    return fresh
+
+
+class TestResponseCache:
+    """ResponseCache expiry, eviction and invalidation"""
+
+    def test_fresh_then_stale_then_expired(self, clock):
+        store = ResponseCache()
+        store.set("k", "v", ttl=10, stale_ttl=5)
+
+        assert store.lookup("k") == ("v", False)
+        clock.now += 11
+        assert store.lookup("k") == ("v", True)
+        clock.now += 5
+        assert store.lookup("k") == (_MISSING, False)
+        assert store.stats()["entries"] == 0
+
+    def test_default_ttl(self, clock):
+        store = ResponseCache(default_ttl=30)
+        store.set("k", "v")
+        clock.now += 29
+        assert store.get("k") == "v"
+        clock.now += 2
+        assert store.get("k", "gone") == "gone"
+
+    def test_lru_eviction(self, clock):
+        store = ResponseCache(max_entries=2)
+        store.set("a", 1)
+        store.set("b", 2)
+        store.lookup("a")  # a is now the most recently used
+        store.set("c", 3)
+
+        assert store.get("b") is None
+        assert store.get("a") == 1
+        assert store.get("c") == 3
+        assert store.stats()["evictions"] == 1
+
+    def test_invalidate_tags(self, clock):
+        store = ResponseCache()
+        store.set("events", 1, tags=["events"])
+        store.set("news", 2, tags=["news"])
+        store.set("home", 3, tags=["events", "news"])
+
+        assert store.invalidate_tags("events") == 2
+        assert store.get("events") is None
+        assert store.get("home") is None
+        assert store.get("news") == 2
+        assert store.tags() == ("news",)
+
+    def test_generation_changes_on_invalidation(self, clock):
+        store = ResponseCache()
+        before = store.generation(["events", "news"])
+        store.invalidate_tags("events")
+        assert store.generation(["events", "news"]) != before
+        assert store.generation(["news"]) == before[1:]
+
+    def test_overwrite_replaces_tags(self, clock):
+        store = ResponseCache()
+        store.set("k", 1, tags=["events"])
+        store.set("k", 2, tags=["news"])
+        assert store.invalidate_tags("events") == 0
+        assert store.get("k") == 2
+
+
+class TestCachedDecorator:
+    """@cached coalescing, stale serving and the mid-flight invalidation guard"""
+
+    def test_second_call_is_served_from_cache(self, clock, response_cache):
+        calls = []
+
+        @cached("events", ttl=10)
+        async def load(limit: int = 10):
+            calls.append(limit)
+            return list(range(limit))
+
+        async def scenario():
+            assert await load(limit=3) == [0, 1, 2]
+            assert await load(limit=3) == [0, 1, 2]
+            assert await load(limit=2) == [0, 1]
+
+        asyncio.run(scenario())
+        assert calls == [3, 2]
+
+    def test_concurrent_misses_share_one_call(self, clock, response_cache):
+        calls = []
+
+        @cached("events", ttl=10)
+        async def load():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "value"
+
+        async def scenario():
+            return await asyncio.gather(*[load() for _ in range(5)])
+
+        assert asyncio.run(scenario()) == ["value"] * 5
+        assert len(calls) == 1
+
+    def test_invalidation_evicts(self, clock, response_cache):
+        calls = []
+
+        @cached("events", ttl=10)
+        async def load():
+            calls.append(1)
+            return len(calls)
+
+        async def scenario():
+            assert await load() == 1
+            response_cache.invalidate_tags("events")
+            assert await load() == 2
+
+        asyncio.run(scenario())
+
+    def test_result_invalidated_mid_flight_is_not_stored(self, clock, response_cache):
+        calls = []
+
+        @cached("events", ttl=10)
+        async def load(release: asyncio.Event = None):
+            calls.append(1)
+            if release is not None:
+                await release.wait()
+            return len(calls)
+
+        async def scenario():
+            release = asyncio.Event()
+            pending = asyncio.ensure_future(load(release=release))
+            await asyncio.sleep(0)
+            # An admin write lands before the scheduled load has started
+            response_cache.invalidate_tags("events")
+            release.set()
+            assert await pending == 1
+            assert response_cache.stats()["entries"] == 0
+
+        asyncio.run(scenario())
+        assert len(calls) == 1
+
+    def test_result_invalidated_while_loading_is_not_stored(self, clock, response_cache):
+        @cached("events", ttl=10)
+        async def load(started: asyncio.Event = None, release: asyncio.Event = None):
+            started.set()
+            await release.wait()
+            return "old"
+
+        async def scenario():
+            started, release = asyncio.Event(), asyncio.Event()
+            pending = asyncio.ensure_future(load(started=started, release=release))
+            await started.wait()
+            response_cache.invalidate_tags("events")
+            release.set()
+            assert await pending == "old"
+            assert response_cache.stats()["entries"] == 0
+
+        asyncio.run(scenario())
+
+    def test_stale_value_served_while_refreshing(self, clock, response_cache):
+        calls = []
+
+        @cached("events", ttl=10, stale_ttl=100)
+        async def load():
+            calls.append(1)
+            return len(calls)
+
+        async def scenario():
+            assert await load() == 1
+            clock.now += 20
+            # Stale: the old value comes back at once and a refresh starts in the background
+            assert await load() == 1
+            for _ in range(5):
+                await asyncio.sleep(0)
+            assert await load() == 2
+
+        asyncio.run(scenario())
+        assert len(calls) == 2
+        assert response_cache.stats()["stale_serves"] == 1
+        assert response_cache.stats()["refreshes"] == 1
+
+
+class TestConditional:
+    """@conditional validators describe the body actually served"""
+
+    @pytest.fixture
+    def client(self, response_cache):
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+
+        app = FastAPI()
+        app.state.body = "v1"
+
+        @app.get("/events")
+        @cache.conditional("events")
+        @cached("events", ttl=10)
+        async def get_events():
+            return app.state.body
+
+        with TestClient(app) as client:
+            yield client
+
+    def test_matching_etag_gets_304(self, client):
+        first = client.get("/events")
+        assert first.json() == "v1"
+
+        again = client.get("/events", headers={"If-None-Match": first.headers["etag"]})
+        assert again.status_code == 304
+
+    def test_cached_body_keeps_the_etag_it_was_filled_under(self, client, versions):
+        first = client.get("/events")
+
+        # Another worker's write this worker has not heard of yet: the cached body is still served
+        client.app.state.body = "v2"
+        versions["events"] = (1, datetime(2030, 1, 2, 3, 4, 5))
+        stale = client.get("/events")
+        assert stale.json() == "v1"
+        assert stale.headers["etag"] == first.headers["etag"]
+        assert "last-modified" not in stale.headers
+
+        cache.response_cache.invalidate_tags("events")
+        fresh = client.get("/events", headers={"If-None-Match": first.headers["etag"]})
+        assert fresh.status_code == 200
+        assert fresh.json() == "v2"
+        assert fresh.headers["etag"] != first.headers["etag"]
+        assert fresh.headers["last-modified"] == "Wed, 02 Jan 2030 03:04:05 GMT"
+
+        cached_again = client.get("/events", headers={"If-None-Match": fresh.headers["etag"]})
+        assert cached_again.status_code == 304